@@ -0,0 +1,250 @@
+import json
+import sys
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class AgentRecord(Mapping):
+    """Compact, read-only agent record.
+
+    Fields used for scoring and responses live in slots, list fields are
+    stored as tuples and categorical strings are interned so they are shared
+    across the catalog. Large, rarely read fields such as ``system_prompt``
+    (and any keys this class does not know about) are kept zlib-compressed
+    and only decoded when accessed. Records still behave like the original
+    agent dicts for reading: ``record['strengths']``, ``dict(record)``.
+    """
+
+    __slots__ = ('id', 'name', 'description', 'capabilities', 'strengths', 'supported_languages',
+                 'use_cases', 'ideal_for', 'collaboration', 'deployment', 'learning_curve',
+                 'price_tier', '_detail_keys', '_details')
+
+    id: str
+    name: str
+    description: str
+    capabilities: Tuple[str, ...]
+    strengths: Tuple[str, ...]
+    supported_languages: Tuple[str, ...]
+    use_cases: Tuple[str, ...]
+    ideal_for: Tuple[str, ...]
+    collaboration: bool
+    deployment: bool
+    learning_curve: str
+    price_tier: str
+    _detail_keys: Tuple[str, ...]
+    _details: bytes
+
+    @classmethod
+    def from_dict(cls, agent: Dict[str, Any]) -> 'AgentRecord':
+        values = {}
+        for field in _RECORD_FIELDS:
+            value = agent[field]
+            if isinstance(value, list):
+                value = tuple(sys.intern(v) if field in _INTERNED_FIELDS else v for v in value)
+            elif field in _INTERNED_FIELDS:
+                value = sys.intern(value)
+            values[field] = value
+        details = {key: value for key, value in agent.items() if key not in values}
+        return cls(
+            _detail_keys=tuple(details),
+            _details=zlib.compress(json.dumps(details).encode('utf-8'), 1) if details else b'',
+            **values
+        )
+
+    def with_details(self, detail_keys: Tuple[str, ...], details: bytes) -> 'AgentRecord':
+        """Copy of this record carrying already-compressed lazy fields"""
+        return replace(self, _detail_keys=detail_keys, _details=details)
+
+    def details(self) -> Dict[str, Any]:
+        """Decode the lazily stored fields (system_prompt and extras)"""
+        return json.loads(zlib.decompress(self._details)) if self._details else {}
+
+    @property
+    def system_prompt(self) -> str:
+        return self.details().get('system_prompt', '')
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _RECORD_FIELDS:
+            return getattr(self, key)
+        if key in self._detail_keys:
+            return self.details()[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _RECORD_FIELDS
+        yield from self._detail_keys
+
+    def __len__(self) -> int:
+        return len(_RECORD_FIELDS) + len(self._detail_keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with every field, including the lazily stored ones"""
+        agent = {}
+        for field in _RECORD_FIELDS:
+            value = getattr(self, field)
+            agent[field] = list(value) if isinstance(value, tuple) else value
+        agent.update(self.details())
+        return agent
+
+    def __reduce__(self):
+        return (_restore_record, tuple(getattr(self, f.name) for f in fields(self)))
+
+
+def _restore_record(*values) -> AgentRecord:
+    return AgentRecord(*values)
+
+
+_RECORD_FIELDS = tuple(f.name for f in fields(AgentRecord) if not f.name.startswith('_'))
+_INTERNED_FIELDS = {'supported_languages', 'ideal_for', 'learning_curve', 'price_tier'}
+
+
+def _top_strength(agent) -> str:
+    return agent['strengths'][0].lower() if agent['strengths'] else ''
+
+
+# Boolean attributes derived from free-text agent fields
+DERIVED_FLAGS = {
+    'educational': lambda agent: 'educational' in [uc.lower() for uc in agent['use_cases']],
+    'security_focused': lambda agent: 'security' in _top_strength(agent),
+    'zero_setup': lambda agent: 'zero setup' in _top_strength(agent)
+}
+
+
+def agent_flag(agent, field: str) -> bool:
+    """Value of one of AgentCatalog.FLAG_FIELDS for a single agent record or dict"""
+    if field in DERIVED_FLAGS:
+        return DERIVED_FLAGS[field](agent)
+    return bool(agent[field])
+
+
+class AgentCatalog:
+    """Column-oriented view of the agent list, built once at load time.
+
+    Every attribute the scorer looks at is turned into a NumPy array with one
+    row per agent, so a task can be scored against every agent at once
+    instead of re-reading each agent dict in a Python loop. Multi-valued and
+    categorical attributes are stored as boolean one-hot matrices over the
+    values seen in the catalog.
+    """
+
+    # Categorical fields stored as one-hot matrices (one column per value)
+    ONE_HOT_FIELDS = ['supported_languages', 'ideal_for', 'price_tier', 'learning_curve']
+    # Per-agent boolean flags
+    FLAG_FIELDS = ['collaboration', 'deployment', 'educational', 'security_focused', 'zero_setup']
+
+    def __init__(self, agents: List[Dict]):
+        self.size = len(agents)
+        self.ids = [agent['id'] for agent in agents]
+        self._rows = {agent_id: row for row, agent_id in enumerate(self.ids)}
+
+        self._vocabularies: Dict[str, Dict[str, int]] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+        for field in self.ONE_HOT_FIELDS:
+            self._add_one_hot(field, [self._as_list(agent[field]) for agent in agents])
+        self._add_one_hot('languages_lower', [
+            [lang.lower() for lang in agent['supported_languages']] for agent in agents
+        ])
+
+        for field in self.FLAG_FIELDS:
+            setattr(self, field, np.array([agent_flag(agent, field) for agent in agents], dtype=bool))
+
+    def to_arrays(self) -> Tuple[Dict[str, List[str]], Dict[str, np.ndarray]]:
+        """Vocabularies (in column order) and arrays, e.g. for writing a binary snapshot"""
+        vocabularies = {field: list(vocabulary) for field, vocabulary in self._vocabularies.items()}
+        arrays = {f'one_hot:{field}': matrix for field, matrix in self._matrices.items()}
+        arrays.update({f'flag:{field}': getattr(self, field) for field in self.FLAG_FIELDS})
+        return vocabularies, arrays
+
+    @classmethod
+    def from_arrays(cls, ids: List[str], vocabularies: Dict[str, List[str]],
+                    arrays: Dict[str, np.ndarray]) -> 'AgentCatalog':
+        """Rebuild a catalog from to_arrays() output without touching agent records.
+
+        The arrays are used as-is, so read-only views over a memory-mapped
+        file stay shared between processes.
+        """
+        catalog = cls.__new__(cls)
+        catalog.size = len(ids)
+        catalog.ids = ids
+        catalog._rows = {agent_id: row for row, agent_id in enumerate(ids)}
+        catalog._vocabularies = {
+            field: {value: column for column, value in enumerate(values)}
+            for field, values in vocabularies.items()
+        }
+        catalog._matrices = {field: arrays[f'one_hot:{field}'] for field in vocabularies}
+        for field in cls.FLAG_FIELDS:
+            setattr(catalog, field, arrays[f'flag:{field}'])
+        return catalog
+
+    @staticmethod
+    def _as_list(value) -> List[str]:
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+
+    def _add_one_hot(self, field: str, values: List[List[str]]):
+        vocabulary: Dict[str, int] = {}
+        for row in values:
+            for value in row:
+                vocabulary.setdefault(value, len(vocabulary))
+        matrix = np.zeros((self.size, len(vocabulary)), dtype=bool)
+        for i, row in enumerate(values):
+            for value in row:
+                matrix[i, vocabulary[value]] = True
+        self._vocabularies[field] = vocabulary
+        self._matrices[field] = matrix
+
+    def has(self, field: str, value: str) -> np.ndarray:
+        """Boolean mask of agents whose ``field`` is or contains ``value``"""
+        column = self._vocabularies[field].get(value)
+        if column is None:
+            return np.zeros(self.size, dtype=bool)
+        return self._matrices[field][:, column]
+
+    def id_mask(self, agent_id: str) -> np.ndarray:
+        """Boolean mask selecting the agent with ``agent_id``"""
+        mask = np.zeros(self.size, dtype=bool)
+        if agent_id in self._rows:
+            mask[self._rows[agent_id]] = True
+        return mask
+
+    def vocabulary_size(self, field: str) -> int:
+        return len(self._vocabularies[field])
+
+    def values(self, field: str) -> List[str]:
+        """Distinct values of ``field``, in column order"""
+        return list(self._vocabularies[field])
+
+    def matrix(self, field: str) -> np.ndarray:
+        """One-hot (agents, values) matrix for ``field``"""
+        return self._matrices[field]
+
+    def encode(self, field: str, values) -> np.ndarray:
+        """One-hot row for ``values``; values missing from the catalog are dropped"""
+        vocabulary = self._vocabularies[field]
+        row = np.zeros(len(vocabulary), dtype=bool)
+        for value in values:
+            if value in vocabulary:
+                row[vocabulary[value]] = True
+        return row
+
+
+def top_n_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """Indices of the ``top_n`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected rows get sorted; ties keep
+    catalog order, matching a stable descending sort over the full list.
+    """
+    size = len(scores)
+    if top_n >= size:
+        candidates = np.arange(size)
+    else:
+        threshold = scores[np.argpartition(scores, size - top_n)[size - top_n]]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:top_n - len(above)]
+        candidates = np.concatenate([above, tied])
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
@@ -1,26 +1,260 @@
-from flask import Flask, request, jsonify
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask import Blueprint, Flask, current_app, g, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
+from engine_loader import EngineLoader
+from metrics import Metrics, SamplingProfiler
+from micro_batcher import MicroBatcher
+from payloads import CachedBody, dumps
 from recommendation_engine import RecommendationEngine
-import json
+from scoring_pool import PoolBusy, ScoringPool
+from settings import Settings
+from task_stream import InputTooLarge, TaskStreamAnalyzer
+from werkzeug.exceptions import RequestEntityTooLarge
 import logging
-
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+import os
+import threading
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize recommendation engine
-try:
-    engine = RecommendationEngine()
-    logger.info("Recommendation engine initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize recommendation engine: {e}")
-    engine = None
+api = Blueprint('api', __name__)
+
+def build_engine(settings: Settings, metrics: Metrics = None) -> RecommendationEngine:
+    """Build the recommendation engine; raises if the catalog cannot be loaded"""
+    # Semantic mode only serves /api/recommend, so scoring pool workers never build embeddings
+    engine = RecommendationEngine(**settings.engine_kwargs(), metrics=metrics,
+                                  semantic=settings.semantic_enabled,
+                                  semantic_weight=settings.semantic_weight,
+                                  semantic_budget=settings.semantic_budget_ms / 1000)
+    logger.info(f"Recommendation engine initialized from {engine.snapshot.store}")
+    
+    # Poll the catalog file and hot-swap it when it changes (0 disables)
+    if settings.catalog_reload_interval > 0:
+        engine.start_auto_reload(settings.catalog_reload_interval)
+    return engine
+
+def create_app(settings: Settings = None, engine: RecommendationEngine = None) -> Flask:
+    """Application factory; WSGI/ASGI servers call it once per worker process.
+    
+    The engine is built according to ``settings.engine_init`` (see
+    engine_loader.EngineLoader) unless one is passed in.
+    """
+    settings = settings or Settings.from_env()
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for all routes
+    
+    metrics = engine.metrics if engine is not None else Metrics(enabled=settings.metrics_enabled)
+    app.config['SETTINGS'] = settings
+    app.config['MAX_CONTENT_LENGTH'] = settings.max_body_bytes or None
+    app.extensions['scoring_pool'] = None
+    app.extensions['micro_batcher'] = None
+    app.extensions['metrics'] = metrics
+    app.extensions['profiler'] = (SamplingProfiler(settings.profile_every, settings.profile_dir)
+                                  if settings.profile_every > 0 else None)
+    
+    def install(engine: RecommendationEngine):
+        """Start the scoring pool and micro-batcher once the engine is ready"""
+        pool = None
+        if settings.scoring_pool_size > 0:
+            pool = ScoringPool(engine, settings.scoring_pool_size, settings.scoring_queue_size,
+                               settings.scoring_pool_kind, settings.engine_kwargs())
+        batcher = None
+        if settings.micro_batching:
+            batcher = MicroBatcher(engine, settings.micro_batch_window_ms / 1000, settings.micro_batch_max_size,
+                                   settings.micro_batch_workers)
+        app.extensions['scoring_pool'] = pool
+        app.extensions['micro_batcher'] = batcher
+        metrics.add_collector('engine', lambda: collect_engine_metrics(engine, pool, batcher))
+    
+    if engine is not None:
+        install(engine)
+        loader = EngineLoader(None, settings.engine_init, engine=engine)
+    else:
+        loader = EngineLoader(lambda: build_engine(settings, metrics), settings.engine_init, on_ready=install)
+    app.extensions['engine_loader'] = loader
+    metrics.add_collector('engine_loader', lambda: collect_loader_metrics(loader))
+    loader.start()
+    app.before_request(start_request)
+    app.after_request(record_response)
+    app.teardown_request(finish_request)
+    app.register_blueprint(api)
+    return app
+
+def collect_engine_metrics(engine: RecommendationEngine, pool: ScoringPool = None, batcher: MicroBatcher = None):
+    """Cache, catalog, scoring pool and micro-batching values for /metrics, read at scrape time"""
+    cache = engine.cache.stats()
+    for name in ('hits', 'misses', 'evictions', 'expirations'):
+        yield (f'recommendation_cache_{name}_total', 'counter', f'Result cache {name}', [({}, cache[name])])
+    yield ('recommendation_cache_entries', 'gauge', 'Entries in the result cache', [({}, cache['entries'])])
+    yield ('recommendation_cache_bytes', 'gauge', 'Pickled bytes held by the result cache', [({}, cache['bytes'])])
+    snapshot = engine.snapshot
+    yield ('catalog_version', 'gauge', 'Version of the live agent catalog', [({}, snapshot.version)])
+    yield ('catalog_agents', 'gauge', 'Agents in the live catalog', [({}, len(snapshot.agents))])
+    if pool is not None:
+        status = pool.status()
+        yield ('scoring_pool_in_flight', 'gauge', 'Batch scoring calls running or queued', [({}, status['in_flight'])])
+        yield ('scoring_pool_completed_total', 'counter', 'Batch scoring calls finished', [({}, status['completed'])])
+        yield ('scoring_pool_rejected_total', 'counter', 'Batch scoring calls turned away', [({}, status['rejected'])])
+    if batcher is not None:
+        status = batcher.status()
+        yield ('micro_batch_requests_total', 'counter', 'Requests through the micro-batcher', [({}, status['requests'])])
+        yield ('micro_batch_coalesced_total', 'counter', 'Requests answered by an identical in-flight request',
+               [({}, status['coalesced'])])
+        yield ('micro_batch_batches_total', 'counter', 'Engine batches run by the micro-batcher', [({}, status['batches'])])
+        yield ('micro_batch_batched_requests_total', 'counter', 'Distinct requests answered in engine batches',
+               [({}, status['batched_requests'])])
+        yield ('micro_batch_in_flight', 'gauge', 'Distinct requests waiting for a batch', [({}, status['in_flight'])])
+
+def collect_loader_metrics(loader: EngineLoader):
+    yield ('engine_ready', 'gauge', 'Whether the recommendation engine is ready (1) or not (0)',
+           [({}, int(loader.state == 'ready'))])
+    if loader.load_seconds is not None:
+        yield ('engine_load_seconds', 'gauge', 'Seconds the recommendation engine took to initialize',
+               [({}, loader.load_seconds)])
+
+def start_request():
+    g.request_started = time.perf_counter()
+    profiler = current_app.extensions['profiler']
+    g.profile = profiler.start() if profiler is not None else None
+
+def record_response(response):
+    g.response_status = response.status_code
+    return response
+
+def finish_request(error=None):
+    """Record request latency (including streamed bodies) and dump a sampled profile"""
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    profile = g.pop('profile', None)
+    if profile is not None:
+        path = current_app.extensions['profiler'].stop(profile, endpoint)
+        logger.info(f"Wrote request profile to {path}")
+    status = g.pop('response_status', 500)
+    current_app.extensions['metrics'].observe_request(endpoint, request.method, status,
+                                                      time.perf_counter() - started)
+
+def get_engine():
+    """Recommendation engine of the current app (None while loading or if it failed to initialize)"""
+    return current_app.extensions['engine_loader'].get()
+
+def engine_unavailable():
+    """Response for requests that need the engine when there is none"""
+    loader = current_app.extensions['engine_loader']
+    if loader.state == 'failed':
+        return jsonify({'error': 'Recommendation engine failed to initialize'}), 500
+    return jsonify({'error': 'Recommendation engine is starting, try again later'}), 503, {'Retry-After': '1'}
+
+def get_metrics() -> Metrics:
+    return current_app.extensions['metrics']
+
+def read_json():
+    """Parse the JSON request body, timed as the parse_json stage"""
+    with get_metrics().time('parse_json'):
+        return request.get_json()
+
+# Read size for streamed text/plain task descriptions
+BODY_CHUNK_SIZE = 64 * 1024
+
+def is_text_body() -> bool:
+    return request.mimetype == 'text/plain'
+
+def wants_early_exit(data=None) -> bool:
+    value = (data or {}).get('early_exit', request.args.get('early_exit', ''))
+    return value is True or str(value).lower() in ('1', 'true', 'yes')
+
+def request_body_chunks():
+    while True:
+        chunk = request.stream.read(BODY_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+def analyze_chunks(engine, chunks, early_exit=False):
+    """Analyze a description chunk by chunk in constant memory; returns (task_analysis, analyzer)"""
+    analyzer = TaskStreamAnalyzer(engine, max_bytes=current_app.config['MAX_CONTENT_LENGTH'], early_exit=early_exit)
+    with get_metrics().time('analyze_stream'):
+        return analyzer.consume(chunks), analyzer
+
+def text_chunks(text):
+    return (text[start:start + BODY_CHUNK_SIZE] for start in range(0, len(text), BODY_CHUNK_SIZE))
+
+def stream_info(analyzer):
+    return {'bytes_read': analyzer.bytes_read, 'stopped_early': analyzer.stopped_early}
+
+def body_too_large():
+    limit = current_app.config['MAX_CONTENT_LENGTH']
+    return jsonify({'error': f'Request body is larger than {limit} bytes'}), 413
+
+def json_response(payload):
+    """Serialize a response body, timed as the serialize stage"""
+    with get_metrics().time('serialize'):
+        return Response(dumps(payload), mimetype='application/json')
+
+def cached_response(cached: CachedBody):
+    """Serve a pre-serialized body, answering If-None-Match with 304 and gzipping when accepted"""
+    body, etag = cached.body, cached.etag
+    if request.accept_encodings['gzip'] and cached.gzipped is not None:
+        body, etag = cached.gzipped, f'{etag}-gzip'
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if body is not cached.body:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Optional fields returned by /api/compare when the request has no `include`
+COMPARE_DEFAULT_INCLUDE = ['explanation', 'score_breakdown', 'strengths', 'capabilities']
 
-@app.route('/', methods=['GET'])
+def parse_include(data, default=None):
+    """Read the optional `include` field list from the JSON body or query string"""
+    engine = get_engine()
+    include = data.get('include', request.args.get('include'))
+    if include is None:
+        return engine.resolve_include(default)
+    if isinstance(include, str):
+        include = [field.strip() for field in include.split(',') if field.strip()]
+    if not isinstance(include, list):
+        raise ValueError('include must be a list or a comma-separated string')
+    return engine.resolve_include(include)
+
+def parse_rule_set(data):
+    """Rule set named by `rule_set` in the JSON body or query string, else the experiment's pick.
+    
+    Without an explicit rule set, the X-Experiment-Key header (e.g. a user
+    id) keeps a caller in the same arm of the A/B split across requests.
+    """
+    engine = get_engine()
+    rule_set = data.get('rule_set', request.args.get('rule_set'))
+    if rule_set is None:
+        rule_set = engine.scoring_rules.assign(request.headers.get('X-Experiment-Key'))
+    elif not isinstance(rule_set, str) or rule_set not in engine.snapshot.plans:
+        raise ValueError(f"Unknown rule set: {rule_set}")
+    engine.metrics.count_rule_set(rule_set)
+    return rule_set
+
+def parse_semantic(data):
+    """Whether to rank in semantic mode: `mode` ('semantic' or 'rule') in the JSON body or query string.
+    
+    Defaults to semantic when the engine was built with it.
+    """
+    enabled = get_engine().snapshot.semantic is not None
+    mode = data.get('mode', request.args.get('mode'))
+    if mode is None:
+        return enabled
+    if mode not in ('semantic', 'rule'):
+        raise ValueError("mode must be 'semantic' or 'rule'")
+    if mode == 'semantic' and not enabled:
+        raise ValueError('Semantic mode is not enabled')
+    return mode == 'semantic'
+
+@api.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
@@ -29,61 +263,81 @@ def health_check():
         'version': '1.0.0'
     })
 
-@app.route('/api/agents', methods=['GET'])
+@api.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: fails only once the engine has failed to initialize, so the process gets restarted"""
+    loader = current_app.extensions['engine_loader']
+    healthy = loader.state != 'failed'
+    return jsonify({'status': 'alive' if healthy else 'failed', 'engine': loader.status()}), 200 if healthy else 503
+
+@api.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: succeeds once the engine can serve (or, with lazy init, will build on first use)"""
+    loader = current_app.extensions['engine_loader']
+    ready = loader.serving
+    return jsonify({'status': 'ready' if ready else 'not_ready', 'engine': loader.status()}), 200 if ready else 503
+
+@api.route('/api/agents', methods=['GET'])
 def get_all_agents():
     """Get all available agents"""
     try:
+        engine = get_engine()
         if engine is None:
-            return jsonify({'error': 'Recommendation engine not initialized'}), 500
+            return engine_unavailable()
         
-        agents = engine.agents
-        return jsonify({
-            'success': True,
-            'agents': agents,
-            'total_count': len(agents)
-        })
+        # Serialized once per catalog version
+        return cached_response(engine.snapshot.payloads.agents_body())
     except Exception as e:
         logger.error(f"Error getting agents: {e}")
         return jsonify({'error': 'Failed to retrieve agents'}), 500
 
-@app.route('/api/agents/<agent_id>', methods=['GET'])
+@api.route('/api/agents/<agent_id>', methods=['GET'])
 def get_agent_details(agent_id):
     """Get details for a specific agent"""
     try:
+        engine = get_engine()
         if engine is None:
-            return jsonify({'error': 'Recommendation engine not initialized'}), 500
+            return engine_unavailable()
         
-        agent = next((a for a in engine.agents if a['id'] == agent_id), None)
-        if not agent:
+        cached = engine.snapshot.payloads.agent_body(agent_id)
+        if cached is None:
             return jsonify({'error': 'Agent not found'}), 404
         
-        return jsonify({
-            'success': True,
-            'agent': agent
-        })
+        return cached_response(cached)
     except Exception as e:
         logger.error(f"Error getting agent details: {e}")
         return jsonify({'error': 'Failed to retrieve agent details'}), 500
 
-@app.route('/api/analyze', methods=['POST'])
+@api.route('/api/analyze', methods=['POST'])
 def analyze_task():
     """Analyze a task description without providing recommendations"""
     try:
+        engine = get_engine()
         if engine is None:
-            return jsonify({'error': 'Recommendation engine not initialized'}), 500
-        
-        data = request.get_json()
-        if not data or 'task_description' not in data:
-            return jsonify({'error': 'Task description is required'}), 400
+            return engine_unavailable()
         
-        task_description = data['task_description'].strip()
-        if not task_description:
-            return jsonify({'error': 'Task description cannot be empty'}), 400
-        
-        # Analyze the task
-        task_analysis = engine.analyze_task(task_description)
+        analyzer = None
+        if is_text_body():
+            # Plain-text bodies are analyzed while they are read, never buffered whole
+            task_analysis, analyzer = analyze_chunks(engine, request_body_chunks(), wants_early_exit())
+            if not analyzer.has_content:
+                return jsonify({'error': 'Task description cannot be empty'}), 400
+        else:
+            data = read_json()
+            if not data or 'task_description' not in data:
+                return jsonify({'error': 'Task description is required'}), 400
+            
+            task_description = data['task_description'].strip()
+            if not task_description:
+                return jsonify({'error': 'Task description cannot be empty'}), 400
+            
+            # Analyze the task
+            if wants_early_exit(data):
+                task_analysis, analyzer = analyze_chunks(engine, text_chunks(task_description), True)
+            else:
+                task_analysis = engine.analyze_task(task_description)
         
-        return jsonify({
+        response = {
             'success': True,
             'task_analysis': {
                 'task_type': task_analysis.task_type,
@@ -95,51 +349,182 @@ def analyze_task():
                 'deployment_needed': task_analysis.deployment_needed,
                 'learning_focused': task_analysis.learning_focused
             }
-        })
+        }
+        if analyzer is not None:
+            response['input'] = stream_info(analyzer)
+        return json_response(response)
+    except (RequestEntityTooLarge, InputTooLarge):
+        return body_too_large()
     except Exception as e:
         logger.error(f"Error analyzing task: {e}")
         return jsonify({'error': 'Failed to analyze task'}), 500
 
-@app.route('/api/recommend', methods=['POST'])
+@api.route('/api/recommend', methods=['POST'])
 def get_recommendations():
     """Get agent recommendations for a task"""
     try:
+        engine = get_engine()
         if engine is None:
-            return jsonify({'error': 'Recommendation engine not initialized'}), 500
+            return engine_unavailable()
         
-        data = request.get_json()
-        if not data or 'task_description' not in data:
-            return jsonify({'error': 'Task description is required'}), 400
+        task_description = task_analysis = analyzer = None
+        if is_text_body():
+            # Plain-text bodies are analyzed while they are read, never buffered whole;
+            # options come from the query string
+            data = {'top_n': request.args.get('top_n', 3, type=int)}
+            task_analysis, analyzer = analyze_chunks(engine, request_body_chunks(), wants_early_exit())
+            if not analyzer.has_content:
+                return jsonify({'error': 'Task description cannot be empty'}), 400
+        else:
+            data = read_json()
+            if not data or 'task_description' not in data:
+                return jsonify({'error': 'Task description is required'}), 400
+            
+            task_description = data['task_description'].strip()
+            if not task_description:
+                return jsonify({'error': 'Task description cannot be empty'}), 400
+            if wants_early_exit(data):
+                task_analysis, analyzer = analyze_chunks(engine, text_chunks(task_description), True)
         
-        task_description = data['task_description'].strip()
-        if not task_description:
-            return jsonify({'error': 'Task description cannot be empty'}), 400
+        # Get optional parameters
+        top_n = data.get('top_n', 3)
+        if not isinstance(top_n, int) or top_n < 1:
+            top_n = 3
+        try:
+            include = parse_include(data)
+            rule_set = parse_rule_set(data)
+            semantic = parse_semantic(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Get recommendations; streamed and early-exit analyses are rule-scored since the text is not kept
+        batcher = current_app.extensions['micro_batcher']
+        if task_analysis is None and not semantic and batcher is not None:
+            recommendations = batcher.recommend(task_description, top_n, include, rule_set,
+                                                timeout=current_app.config['SETTINGS'].recommend_timeout)
+        elif task_analysis is None:
+            recommendations = engine.get_recommendations(task_description, top_n, include, rule_set, semantic)
+        else:
+            recommendations = engine.recommend_for_analysis(task_analysis, top_n, include, rule_set)
+        
+        response = {'success': True}
+        if task_description is not None:
+            response['task_description'] = task_description
+        response.update(recommendations)
+        response['rule_set'] = rule_set
+        if analyzer is not None:
+            response['input'] = stream_info(analyzer)
+        return json_response(response)
+    except (RequestEntityTooLarge, InputTooLarge):
+        return body_too_large()
+    except FutureTimeoutError:
+        return jsonify({'error': 'Recommendation timed out'}), 504
+    except Exception as e:
+        logger.error(f"Error getting recommendations: {e}")
+        return jsonify({'error': 'Failed to get recommendations'}), 500
+
+@api.route('/api/recommend/batch', methods=['POST'])
+def get_recommendations_batch():
+    """Get agent recommendations for many tasks in one request"""
+    try:
+        engine = get_engine()
+        if engine is None:
+            return engine_unavailable()
+        
+        data = read_json()
+        if not data or 'task_descriptions' not in data:
+            return jsonify({'error': 'Task descriptions are required'}), 400
+        
+        task_descriptions = data['task_descriptions']
+        if not isinstance(task_descriptions, list) or len(task_descriptions) == 0:
+            return jsonify({'error': 'At least one task description is required'}), 400
         
         # Get optional parameters
         top_n = data.get('top_n', 3)
         if not isinstance(top_n, int) or top_n < 1:
             top_n = 3
+        try:
+            include = parse_include(data)
+            rule_set = parse_rule_set(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Get recommendations
-        recommendations = engine.get_recommendations(task_description, top_n)
+        settings = current_app.config['SETTINGS']
+        pool = current_app.extensions['scoring_pool']
         
-        return jsonify({
+        chunk_size = settings.batch_chunk_size
+        # Score chunk by chunk on the bounded pool so a large batch cannot occupy every request thread;
+        # only the first chunk can be turned away, and it is admitted before any response is started
+        # so a saturated pool answers 503 whether or not the results are streamed
+        first_chunk = (pool.submit('get_recommendations_batch', task_descriptions[:chunk_size], top_n, include,
+                                   rule_set) if pool is not None else None)
+        
+        def recommendations():
+            if pool is None:
+                yield from engine.iter_recommendations_batch(task_descriptions, top_n, include,
+                                                             chunk_size, rule_set)
+                return
+            yield from first_chunk.result(settings.scoring_timeout)
+            # Later chunks wait for a free slot
+            for start in range(chunk_size, len(task_descriptions), chunk_size):
+                chunk = task_descriptions[start:start + chunk_size]
+                yield from pool.call('get_recommendations_batch', chunk, top_n, include, rule_set,
+                                     timeout=settings.scoring_timeout, block=True)
+        
+        def results():
+            for index, result in enumerate(recommendations()):
+                if 'error' in result:
+                    yield {'index': index, 'success': False, 'error': result['error']}
+                else:
+                    yield {
+                        'index': index,
+                        'success': True,
+                        'task_description': task_descriptions[index].strip(),
+                        **result,
+                        'rule_set': rule_set
+                    }
+        
+        # Stream one JSON object per line so large batches are never held as one response
+        if data.get('stream') or request.accept_mimetypes.best == 'application/x-ndjson':
+            def generate():
+                try:
+                    for item in results():
+                        yield dumps(item) + b'\n'
+                except PoolBusy:
+                    yield dumps({'success': False, 'error': 'Server is busy, try again later'}) + b'\n'
+                except FutureTimeoutError:
+                    yield dumps({'success': False, 'error': 'Batch scoring timed out'}) + b'\n'
+                except Exception as e:
+                    logger.error(f"Error streaming batch recommendations: {e}")
+                    yield dumps({'success': False, 'error': 'Failed to get recommendations'}) + b'\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        items = list(results())
+        return json_response({
             'success': True,
-            'task_description': task_description,
-            **recommendations
+            'results': items,
+            'total_count': len(items)
         })
+    except RequestEntityTooLarge:
+        return body_too_large()
+    except PoolBusy:
+        return jsonify({'error': 'Server is busy, try again later'}), 503, {'Retry-After': '1'}
+    except FutureTimeoutError:
+        return jsonify({'error': 'Batch scoring timed out'}), 504
     except Exception as e:
-        logger.error(f"Error getting recommendations: {e}")
+        logger.error(f"Error getting batch recommendations: {e}")
         return jsonify({'error': 'Failed to get recommendations'}), 500
 
-@app.route('/api/compare', methods=['POST'])
+@api.route('/api/compare', methods=['POST'])
 def compare_agents():
     """Compare specific agents for a task"""
     try:
+        engine = get_engine()
         if engine is None:
-            return jsonify({'error': 'Recommendation engine not initialized'}), 500
+            return engine_unavailable()
         
-        data = request.get_json()
+        data = read_json()
         if not data or 'task_description' not in data or 'agent_ids' not in data:
             return jsonify({'error': 'Task description and agent IDs are required'}), 400
         
@@ -150,37 +535,37 @@ def compare_agents():
             return jsonify({'error': 'Task description cannot be empty'}), 400
         if not isinstance(agent_ids, list) or len(agent_ids) == 0:
             return jsonify({'error': 'At least one agent ID is required'}), 400
+        if not all(isinstance(agent_id, str) for agent_id in agent_ids):
+            return jsonify({'error': 'Agent IDs must be strings'}), 400
+        try:
+            include = parse_include(data, default=COMPARE_DEFAULT_INCLUDE)
+            rule_set = parse_rule_set(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Find the specified agents
-        selected_agents = [a for a in engine.agents if a['id'] in agent_ids]
-        if len(selected_agents) != len(agent_ids):
+        # Find the specified agents, ignoring repeated IDs
+        selected_agents = engine.get_agents(list(dict.fromkeys(agent_ids)))
+        if not all(selected_agents):
             return jsonify({'error': 'One or more agent IDs not found'}), 404
         
         # Analyze the task
         task_analysis = engine.analyze_task(task_description)
         
-        # Score the selected agents
-        comparisons = []
-        for agent in selected_agents:
-            total_score, score_breakdown = engine.calculate_agent_score(agent, task_analysis)
-            explanation = engine.generate_explanation(agent, task_analysis, score_breakdown)
-            
-            comparisons.append({
-                'agent_id': agent['id'],
-                'agent_name': agent['name'],
-                'description': agent['description'],
-                'score': round(total_score, 3),
-                'confidence': round(min(total_score * 100, 95), 1),
-                'explanation': explanation,
-                'score_breakdown': {k: round(v, 3) for k, v in score_breakdown.items()},
-                'strengths': agent['strengths'],
-                'capabilities': agent['capabilities']
-            })
-        
-        # Sort by score
-        comparisons.sort(key=lambda x: x['score'], reverse=True)
+        # Score the selected agents, then present them in score order
+        scored = []
+        with engine.metrics.time('score'):
+            for agent in selected_agents:
+                total_score, score_breakdown = engine.calculate_agent_score(agent, task_analysis, rule_set)
+                scored.append((agent, total_score, score_breakdown))
+        engine.metrics.count_scored(len(scored))
+        scored.sort(key=lambda x: round(x[1], 3), reverse=True)
         
-        return jsonify({
+        comparisons = [
+            engine.present_agent(agent, task_analysis, total_score, score_breakdown, include)
+            for agent, total_score, score_breakdown in scored
+        ]
+        
+        return json_response({
             'success': True,
             'task_description': task_description,
             'task_analysis': {
@@ -190,29 +575,126 @@ def compare_agents():
                 'requirements': task_analysis.requirements,
                 'context': task_analysis.context
             },
-            'comparisons': comparisons
+            'comparisons': comparisons,
+            'rule_set': rule_set
         })
+    except RequestEntityTooLarge:
+        return body_too_large()
     except Exception as e:
         logger.error(f"Error comparing agents: {e}")
         return jsonify({'error': 'Failed to compare agents'}), 500
 
-@app.errorhandler(404)
+@api.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get recommendation cache statistics"""
+    try:
+        engine = get_engine()
+        if engine is None:
+            return engine_unavailable()
+        
+        return jsonify({
+            'success': True,
+            'cache': engine.cache.stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting cache stats: {e}")
+        return jsonify({'error': 'Failed to retrieve cache stats'}), 500
+
+@api.route('/api/admin/catalog', methods=['GET'])
+def get_catalog_status():
+    """Get the live catalog version and reload status"""
+    try:
+        engine = get_engine()
+        if engine is None:
+            return engine_unavailable()
+        
+        return jsonify({
+            'success': True,
+            'catalog': engine.snapshot.info(),
+            'scoring_rules': engine.scoring_rules.info(),
+            'reload': engine.reloader.status()
+        })
+    except Exception as e:
+        logger.error(f"Error getting catalog status: {e}")
+        return jsonify({'error': 'Failed to retrieve catalog status'}), 500
+
+@api.route('/api/admin/catalog/reload', methods=['POST'])
+def reload_catalog():
+    """Reload the catalog or scoring rules now if agents_db.json or the rules file changed"""
+    try:
+        engine = get_engine()
+        if engine is None:
+            return engine_unavailable()
+        
+        reloaded = engine.reloader.check()
+        return jsonify({
+            'success': engine.reloader.last_error is None,
+            'reloaded': reloaded,
+            'catalog': engine.snapshot.info(),
+            'scoring_rules': engine.scoring_rules.info(),
+            'reload': engine.reloader.status()
+        })
+    except Exception as e:
+        logger.error(f"Error reloading catalog: {e}")
+        return jsonify({'error': 'Failed to reload catalog'}), 500
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics_text():
+    """Request, stage and cache metrics in the Prometheus text format"""
+    try:
+        return Response(get_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    except Exception as e:
+        logger.error(f"Error rendering metrics: {e}")
+        return jsonify({'error': 'Failed to render metrics'}), 500
+
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(413)
+def request_too_large(error):
+    return body_too_large()
+
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+_module_app_lock = threading.Lock()
+
+def __getattr__(name):
+    """Module-level ``app`` for ``gunicorn app:app``, ``flask --app app run`` and ``from app import app``.
+    
+    It is built from the environment on first access rather than at import
+    time, so importing the module (or running workers through
+    ``create_app()``) does not load an extra engine.
+    """
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _module_app_lock:
+        if 'app' not in globals():
+            globals()['app'] = create_app()
+        return globals()['app']
+
 if __name__ == '__main__':
+    # Development server only; see gunicorn.conf.py and asgi.py for production
+    settings = Settings.from_env({'FLASK_DEBUG': '1', **os.environ})
+    app = create_app(settings)
+    
     print("🚀 Starting AI Coding Agent Recommendation System API")
     print("📋 Available endpoints:")
     print("   GET  /                    - Health check")
+    print("   GET  /api/health/live     - Liveness probe")
+    print("   GET  /api/health/ready    - Readiness probe (engine loaded)")
     print("   GET  /api/agents          - Get all agents")
     print("   GET  /api/agents/<id>     - Get agent details")
     print("   POST /api/analyze         - Analyze task")
     print("   POST /api/recommend       - Get recommendations")
+    print("   POST /api/recommend/batch - Get recommendations for many tasks")
     print("   POST /api/compare         - Compare specific agents")
-    print("\n🌐 API will be available at: http://localhost:5001")
+    print("   GET  /api/cache/stats     - Cache statistics")
+    print("   GET  /api/admin/catalog   - Catalog version and reload status")
+    print("   POST /api/admin/catalog/reload - Reload the agent catalog")
+    print("   GET  /metrics             - Prometheus metrics")
+    print(f"\n🌐 API will be available at: http://localhost:{settings.port}")
     
-    app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
+    app.run(debug=settings.debug, host=settings.host, port=settings.port)
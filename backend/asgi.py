@@ -0,0 +1,14 @@
+"""ASGI entry point, e.g. ``uvicorn asgi:app --workers 4 --port 5001``.
+
+The Flask app runs behind a2wsgi's WSGI adapter, which executes requests
+on a bounded thread pool (WEB_THREADS) so the event loop stays free to
+accept connections and answer health checks while scoring is in progress.
+"""
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from settings import Settings
+
+settings = Settings.from_env()
+
+app = WSGIMiddleware(create_app(settings), workers=settings.threads)
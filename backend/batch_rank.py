@@ -0,0 +1,324 @@
+"""Offline batch recommendations over JSONL or CSV task corpora.
+
+Reads task descriptions from a JSONL file (one object per line, or a bare
+JSON string) or a CSV file, scores them on a pool of worker processes that
+each load the catalog once, and writes one JSON result per input record to
+a JSONL file in input order. Each result carries the record's ``index``
+(its position in the input, not counting blank JSONL lines) and has the
+same shape as an item of /api/recommend/batch:
+
+    python batch_rank.py tickets.jsonl results.jsonl --workers 8 --top-n 3
+    python batch_rank.py tickets.csv results.jsonl --field summary --id-field ticket_id
+    python batch_rank.py tickets.jsonl results.jsonl --resume
+
+Records are sent to the workers in chunks, and at most ``--window`` chunks
+are read but not yet written at any time, so memory stays bounded however
+large the input is. Progress is checkpointed next to the output file;
+``--resume`` continues an interrupted run from the last checkpoint.
+"""
+import argparse
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from payloads import dumps
+from settings import Settings
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('jsonl', 'csv')
+
+# Engine and options owned by a worker process, set once by _init_worker
+_worker_engine = None
+_worker_options = None
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    """What a run computes; a checkpoint can only be resumed with the same options"""
+    input_format: str
+    field: str = 'task_description'
+    id_field: Optional[str] = None
+    top_n: int = 3
+    include: Optional[tuple] = None
+    rule_set: Optional[str] = None
+
+
+class CheckpointMismatch(Exception):
+    """Raised when --resume finds a checkpoint written for a different run"""
+
+
+def detect_format(path: str) -> str:
+    return 'csv' if os.path.splitext(path)[1].lower() in ('.csv', '.tsv') else 'jsonl'
+
+
+def read_records(path: str, input_format: str) -> Iterator[Any]:
+    """Yield raw records: JSONL lines are parsed by the workers, CSV rows as dicts"""
+    if input_format == 'csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            dialect = 'excel-tab' if path.lower().endswith('.tsv') else 'excel'
+            yield from csv.DictReader(f, dialect=dialect)
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _parse_record(record: Any, options: BatchOptions):
+    """(id, task description) of one raw record, or raise ValueError"""
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError('Invalid JSON')
+        if isinstance(record, str):
+            return None, record
+    if not isinstance(record, dict):
+        raise ValueError('Record must be a JSON object or string')
+    description = record.get(options.field)
+    if not isinstance(description, str):
+        raise ValueError(f"Field {options.field!r} must be a string")
+    return (record.get(options.id_field) if options.id_field else None), description
+
+
+def rank_chunk(engine, options: BatchOptions, start: int, records: List[Any]) -> bytes:
+    """Score one chunk of raw records; returns their JSONL output lines"""
+    parsed, errors = [], {}
+    for offset, record in enumerate(records):
+        try:
+            parsed.append(_parse_record(record, options))
+        except ValueError as e:
+            parsed.append((None, None))
+            errors[offset] = str(e)
+    descriptions = [description if offset not in errors else None
+                    for offset, (_, description) in enumerate(parsed)]
+    results = engine.get_recommendations_batch(descriptions, options.top_n, options.include,
+                                              options.rule_set)
+
+    lines = []
+    for offset, ((record_id, description), result) in enumerate(zip(parsed, results)):
+        item = {'index': start + offset}
+        if options.id_field:
+            item['id'] = record_id
+        error = errors.get(offset, result.get('error'))
+        if error is not None:
+            item.update(success=False, error=error)
+        else:
+            item.update(success=True, task_description=description.strip(), **result)
+        lines.append(dumps(item))
+    lines.append(b'')
+    return b'\n'.join(lines)
+
+
+def _init_worker(engine_kwargs: Dict[str, Any], options: BatchOptions):
+    global _worker_engine, _worker_options
+    from recommendation_engine import RecommendationEngine
+    _worker_engine = RecommendationEngine(**engine_kwargs)
+    _worker_options = options
+
+
+def _rank_chunk_worker(start: int, records: List[Any]) -> bytes:
+    return rank_chunk(_worker_engine, _worker_options, start, records)
+
+
+class Checkpoint:
+    """Records how many input records are safely in the output file.
+
+    Written atomically (temp file + rename) after the output has been
+    flushed and fsynced, so on resume the output can be cut back to
+    ``output_bytes`` and the first ``records_done`` records skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, input_path: str, options: BatchOptions, records_done: int, output_bytes: int):
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'input': os.path.abspath(input_path),
+                'options': asdict(options),
+                'records_done': records_done,
+                'output_bytes': output_bytes,
+                'saved_at': time.time()
+            }, f)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _chunks(records: Iterator[Any], chunk_size: int, skip: int):
+    """Yield (index of first record, records) after skipping ``skip`` records"""
+    index = skip
+    records = itertools.islice(records, skip, None)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield index, chunk
+        index += len(chunk)
+
+
+def run(input_path: str, output_path: str, options: BatchOptions, engine_kwargs: Dict[str, Any],
+        workers: int = None, chunk_size: int = 256, window: int = None, resume: bool = False,
+        checkpoint_interval: float = 5.0, progress_interval: float = 10.0) -> int:
+    """Rank every record of ``input_path`` into ``output_path``; returns the number of records written.
+
+    ``workers=0`` scores in this process. Chunks are submitted in input
+    order and written in the same order as they complete, with at most
+    ``window`` chunks (default 4 per worker) outstanding.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    window = window or max(workers, 1) * 4
+    checkpoint = Checkpoint(f'{output_path}.checkpoint')
+
+    skip, output_bytes = 0, 0
+    state = checkpoint.load() if resume else None
+    if state is not None:
+        expected_options = json.loads(json.dumps(asdict(options)))  # as stored: tuples become lists
+        if state['input'] != os.path.abspath(input_path) or state['options'] != expected_options:
+            raise CheckpointMismatch(f"{checkpoint.path} was written for a different input or options")
+        if not os.path.exists(output_path):
+            raise CheckpointMismatch(f"{output_path} is missing; cannot resume")
+        skip, output_bytes = state['records_done'], state['output_bytes']
+        logger.info(f"Resuming after {skip} records")
+
+    executor = engine = None
+    if workers > 0:
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker, initargs=(engine_kwargs, options))
+    else:
+        from recommendation_engine import RecommendationEngine
+        engine = RecommendationEngine(**engine_kwargs)
+
+    started = last_checkpoint = last_progress = time.monotonic()
+    done = skip
+    pending = deque()
+    try:
+        with open(output_path, 'r+b' if state is not None else 'wb') as output:
+            output.truncate(output_bytes)
+            output.seek(output_bytes)
+
+            def write_oldest():
+                nonlocal done
+                count, future = pending.popleft()
+                output.write(future.result())
+                done += count
+
+            def save_checkpoint():
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.save(input_path, options, done, output.tell())
+
+            try:
+                for start, chunk in _chunks(read_records(input_path, options.input_format), chunk_size, skip):
+                    if executor is not None:
+                        pending.append((len(chunk), executor.submit(_rank_chunk_worker, start, chunk)))
+                        # Write finished chunks in input order; block on the oldest once the window is full
+                        while pending and (len(pending) >= window or pending[0][1].done()):
+                            write_oldest()
+                    else:
+                        output.write(rank_chunk(engine, options, start, chunk))
+                        done += len(chunk)
+
+                    now = time.monotonic()
+                    if now - last_checkpoint >= checkpoint_interval:
+                        save_checkpoint()
+                        last_checkpoint = now
+                    if now - last_progress >= progress_interval:
+                        rate = (done - skip) / (now - started)
+                        logger.info(f"{done} records written ({rate:.0f} records/s)")
+                        last_progress = now
+
+                while pending:
+                    write_oldest()
+            except BaseException:
+                # Keep whatever was written resumable, e.g. after Ctrl-C or a failed chunk
+                save_checkpoint()
+                raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    checkpoint.remove()
+    elapsed = time.monotonic() - started
+    logger.info(f"Wrote {done} records to {output_path} in {elapsed:.1f}s "
+                f"({(done - skip) / elapsed if elapsed else 0:.0f} records/s)")
+    return done
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='JSONL or CSV file of task descriptions')
+    parser.add_argument('output', help='JSONL file to write results to')
+    parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+    parser.add_argument('--field', default='task_description', help='Field or column holding the description')
+    parser.add_argument('--id-field', help='Field or column copied to each result as "id"')
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--include', help='Comma-separated optional fields to include in each recommendation')
+    parser.add_argument('--rule-set', help='Scoring rule set to rank with (default: the configured default)')
+    parser.add_argument('--rules', help='Scoring rules file (default: SCORING_RULES_PATH or scoring_rules.json)')
+    parser.add_argument('--catalog', help='Agent catalog file (default: AGENTS_DB_PATH or agents_db.json)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (0 scores in this process)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='Records per unit of work')
+    parser.add_argument('--window', type=int, help='Chunks in flight at most (default: 4 per worker)')
+    parser.add_argument('--resume', action='store_true', help='Continue from the checkpoint of an earlier run')
+    parser.add_argument('--checkpoint-interval', type=float, default=5.0, help='Seconds between checkpoints')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+
+    from recommendation_engine import RecommendationEngine
+    include = None
+    if args.include is not None:
+        try:
+            include = tuple(sorted(RecommendationEngine.resolve_include(
+                [field.strip() for field in args.include.split(',') if field.strip()])))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.top_n < 1 or args.chunk_size < 1:
+        parser.error('--top-n and --chunk-size must be at least 1')
+
+    engine_kwargs = Settings.from_env().engine_kwargs()
+    if args.catalog:
+        engine_kwargs['agents_db_path'] = args.catalog
+    if args.rules:
+        engine_kwargs['scoring_rules_path'] = args.rules
+    if args.rule_set is not None:
+        from scoring_rules import DEFAULT_RULES_PATH, ScoringRules
+        try:
+            rule_sets = ScoringRules.load(engine_kwargs['scoring_rules_path'] or DEFAULT_RULES_PATH).rule_sets
+        except (OSError, ValueError) as e:
+            parser.error(f"Cannot load scoring rules: {e}")
+        if args.rule_set not in rule_sets:
+            parser.error(f"Unknown rule set {args.rule_set!r}; choose from {', '.join(rule_sets)}")
+    options = BatchOptions(args.format or detect_format(args.input), args.field, args.id_field,
+                           args.top_n, include, args.rule_set)
+    try:
+        run(args.input, args.output, options, engine_kwargs, args.workers, args.chunk_size, args.window,
+            args.resume, args.checkpoint_interval)
+    except CheckpointMismatch as e:
+        sys.exit(f"error: {e}")
+
+
+if __name__ == '__main__':
+    main()
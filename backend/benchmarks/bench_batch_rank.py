@@ -0,0 +1,73 @@
+"""Throughput scaling of batch_rank.py with the number of worker processes.
+
+Writes a JSONL corpus of --lines synthetic task descriptions (drawn from a
+pool of --distinct ones, like a ticket export with repeated wording), ranks
+it with 1, 2, 4, ... workers up to the CPU count and reports records/sec,
+speedup and parallel efficiency against one worker, plus the peak RSS of the
+coordinating process, which stays flat because of the in-flight window.
+
+    python benchmarks/bench_batch_rank.py --lines 1000000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_rank import BatchOptions, run  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+
+def write_corpus(path, lines, distinct, size, seed=0):
+    rng = random.Random(seed)
+    descriptions = generate_corpus(size, distinct, seed=seed)
+    with open(path, 'w') as f:
+        for i in range(lines):
+            f.write(json.dumps({'id': i, 'task_description': rng.choice(descriptions)}) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, default=50000, help='Distinct descriptions in the corpus')
+    parser.add_argument('--text-size', type=int, default=300, help='Bytes per description')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[n for n in (1, 2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)])
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--catalog', default=os.path.join(BACKEND_DIR, 'agents_db.json'))
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, 'tasks.jsonl')
+        write_corpus(corpus, args.lines, args.distinct, args.text_size)
+        for workers in args.workers:
+            started = time.perf_counter()
+            run(corpus, os.path.join(tmp, 'results.jsonl'), BatchOptions('jsonl', id_field='id'),
+                {'agents_db_path': args.catalog}, workers, args.chunk_size)
+            elapsed = time.perf_counter() - started
+            row = {'workers': workers, 'seconds': round(elapsed, 2), 'records_per_sec': round(args.lines / elapsed, 1),
+                   'coordinator_max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+            row['speedup'] = round(row['records_per_sec'] / results[0]['records_per_sec'], 2) if results else 1.0
+            row['efficiency'] = round(row['speedup'] * results[0]['workers'] / workers, 2) if results else 1.0
+            results.append(row)
+            print(f"{workers:>3} workers: {row['records_per_sec']:>10.1f} records/s  speedup {row['speedup']:>5.2f}x  "
+                  f"efficiency {row['efficiency']:>4.0%}  coordinator RSS {row['coordinator_max_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'lines': args.lines, 'cpu_count': os.cpu_count(), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
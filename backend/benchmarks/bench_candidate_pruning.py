@@ -0,0 +1,101 @@
+"""Agents scored per request with inverted-index candidate pruning.
+
+For each synthetic catalog size, ranks a set of task descriptions with
+pruning forced on and with exhaustive scoring, checks that both return the
+same agents and scores, and reports how many agents pruning had to score
+and the latency of both paths.
+
+    python benchmarks/bench_candidate_pruning.py --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from synthetic_catalog import write_catalog  # noqa: E402
+
+TASKS = [
+    "I want to build my first React web application. I'm a complete beginner and need help with basic syntax.",
+    "Large-scale Java enterprise application with Spring Boot and microservices, complex business logic.",
+    "Machine learning pipeline in Python using pandas; data preprocessing and model selection.",
+    "Cross-platform mobile app using React Native with navigation and API integration.",
+    "Rust command line tool, free, for a personal side project",
+    "Deploy a serverless API on AWS for my team, needs to be secure and production ready",
+    "Quick prototype of a Go microservice",
+    "Help me refactor some code",
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(size, top_n, repeat, tmp):
+    path = write_catalog(size, os.path.join(tmp, f'agents_{size}.json'), seed=size)
+    engine = RecommendationEngine(path, cache_size=0)
+    engine.PRUNING_MIN_AGENTS = 0
+    analyses = [engine.analyze_task(task) for task in TASKS]
+
+    scored, pruned_times, exhaustive_times = [], [], []
+    for _ in range(repeat):
+        for analysis in analyses:
+            engine.pruning = True
+            started = time.perf_counter()
+            pruned = engine.rank_agents(analysis, top_n)
+            pruned_times.append(time.perf_counter() - started)
+
+            engine.pruning = False
+            started = time.perf_counter()
+            exhaustive = engine.rank_agents(analysis, top_n)
+            exhaustive_times.append(time.perf_counter() - started)
+
+            if not (np.array_equal(pruned.rows, exhaustive.rows) and np.array_equal(pruned.scores, exhaustive.scores)):
+                raise AssertionError(f"Pruned ranking differs from exhaustive scoring for {analysis}")
+            scored.append(pruned.scored)
+
+    return {
+        'agents': size,
+        'scored_mean': round(statistics.mean(scored), 1),
+        'scored_p50': percentile(scored, 0.5),
+        'scored_max': max(scored),
+        'scored_fraction': round(statistics.mean(scored) / size, 4),
+        'pruned_ms': round(statistics.mean(pruned_times) * 1000, 3),
+        'exhaustive_ms': round(statistics.mean(exhaustive_times) * 1000, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            row = run(size, args.top_n, args.repeat, tmp)
+            rows.append(row)
+            print(f"{row['agents']:>7} agents  scored mean {row['scored_mean']:>9} "
+                  f"(p50 {row['scored_p50']}, max {row['scored_max']}, {row['scored_fraction']:.2%})  "
+                  f"pruned {row['pruned_ms']:>8} ms  exhaustive {row['exhaustive_ms']:>8} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Startup time and per-worker memory of each catalog storage backend.
+
+Generates synthetic catalogs, converts them to every format, then starts
+several fresh worker processes per format (like gunicorn workers without
+preload). Each worker builds a RecommendationEngine, serves one
+recommendation and, once all workers are up, reports its RSS and its
+private / proportional (PSS) memory from /proc/self/smaps_rollup. Pages
+shared through the page cache show up as RSS but not as private memory.
+
+    python benchmarks/bench_catalog_store.py --sizes 7 10000 100000 --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_catalog import write_catalog  # noqa: E402
+
+FORMATS = ['.json', '.db', '.bin']
+
+
+def _memory_kb():
+    memory = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        import resource
+        memory['Rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memory['Private'] = memory.pop('Private_Clean', 0) + memory.pop('Private_Dirty', 0)
+    return memory
+
+
+def _worker(path, barrier, results):
+    started = time.perf_counter()
+    from recommendation_engine import RecommendationEngine
+    engine = RecommendationEngine(path, cache_size=0)
+    engine.get_recommendations('Build a Python web app with React and deploy it for my team')
+    startup = time.perf_counter() - started
+    barrier.wait()  # measure while every worker is alive
+    results.put({'startup_seconds': startup, **_memory_kb()})
+    barrier.wait()
+
+
+def measure(path, workers):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(path, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    mean = lambda key: sum(s.get(key, 0) for s in samples) / len(samples)
+    return {
+        'startup_seconds': round(mean('startup_seconds'), 4),
+        'rss_mb': round(mean('Rss') / 1024, 1),
+        'pss_mb': round(mean('Pss') / 1024, 1),
+        'private_mb': round(mean('Private') / 1024, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[7, 10000, 100000])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    from catalog_store import convert
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            source = write_catalog(size, os.path.join(tmp, f'agents_{size}.json'))
+            for extension in FORMATS:
+                path = source if extension == '.json' else os.path.join(tmp, f'agents_{size}{extension}')
+                if extension != '.json':
+                    convert(source, path)
+                row = {'agents': size, 'format': extension, 'file_mb': round(os.path.getsize(path) / 2**20, 2),
+                       **measure(path, args.workers)}
+                rows.append(row)
+                print(f"{size:>7} agents {extension:<6} file {row['file_mb']:>7} MB  "
+                      f"startup {row['startup_seconds']:>8.4f}s  rss {row['rss_mb']:>7} MB  "
+                      f"pss {row['pss_mb']:>7} MB  private {row['private_mb']:>7} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
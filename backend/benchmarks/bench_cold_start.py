@@ -0,0 +1,188 @@
+"""Cold start: time from process launch to the first served recommendation.
+
+For each synthetic catalog size, a fresh Python process is started per
+variant and measured until it answers its first liveness check and its
+first /api/recommend request through the Flask test client (interpreter
+startup and imports included):
+
+    json         agents_db.json is parsed and every index is built at startup
+    mmap         the catalog is a memory-mapped .bin snapshot; rules are compiled at startup
+    precompiled  the .bin catalog plus compiled rules from precompiled_snapshot.py
+
+The engine is initialized with ENGINE_INIT=background (see --init), so the
+liveness time shows how soon an instance can answer health checks. The
+time to build each snapshot is reported too. Results are written as JSON;
+pass a previous run as --baseline to fail when a cold start gets slower
+than the threshold.
+
+    python benchmarks/bench_cold_start.py --sizes 1000 10000 100000 --output cold_start.json
+    python benchmarks/bench_cold_start.py --baseline cold_start.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = ('json', 'mmap', 'precompiled')
+TASK = "Deploy a serverless API on AWS for my team, needs to be secure and production ready"
+
+
+def child(config):
+    """Runs in the measured process: start the app and serve one recommendation"""
+    import logging
+    logging.disable(logging.INFO)
+
+    from app import create_app
+    from settings import Settings
+
+    imported = time.time()
+    settings = Settings(agents_db_path=config['catalog'], precompiled_snapshot_path=config['snapshot'],
+                        engine_init=config['init'], catalog_reload_interval=0)
+    client = create_app(settings).test_client()
+    created = time.time()
+    live = client.get('/api/health/live')
+    live_at = time.time()
+    while True:
+        response = client.post('/api/recommend', json={'task_description': TASK})
+        if response.status_code != 503:
+            break
+        time.sleep(0.005)
+    served = time.time()
+    engine = client.get('/api/health/ready').get_json()['engine']
+    print(json.dumps({'imported': imported, 'created': created, 'live': live_at, 'served': served,
+                      'live_status': live.status_code, 'status': response.status_code, 'store': engine['store'],
+                      'engine_load_s': engine['load_seconds']}))
+
+
+def launch(config):
+    launched = time.time()
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', json.dumps(config)],
+                            check=True, capture_output=True, text=True, cwd=BACKEND_DIR).stdout
+    times = json.loads(output.strip().splitlines()[-1])
+    if times['status'] != 200:
+        raise RuntimeError(f"First recommendation failed with status {times['status']}")
+    return {
+        'imports_s': times['imported'] - launched,
+        'app_created_s': times['created'] - launched,
+        'live_s': times['live'] - launched,
+        'first_recommendation_s': times['served'] - launched,
+        'engine_load_s': times['engine_load_s'],
+        'store': times['store']
+    }
+
+
+def run(size, variants, init, repeat, tmp):
+    from catalog_store import convert
+    from precompiled_snapshot import build
+    from synthetic_catalog import write_catalog
+
+    catalog = write_catalog(size, os.path.join(tmp, f'agents_{size}.json'))
+    builds = {}
+    paths = {'json': (catalog, None)}
+    if 'mmap' in variants:
+        started = time.perf_counter()
+        binary = os.path.join(tmp, f'agents_{size}.bin')
+        convert(catalog, binary)
+        builds['mmap'] = time.perf_counter() - started
+        paths['mmap'] = (binary, None)
+    if 'precompiled' in variants:
+        started = time.perf_counter()
+        snapshot = os.path.join(tmp, f'agents_{size}.snapshot')
+        build(catalog, snapshot)
+        builds['precompiled'] = time.perf_counter() - started
+        paths['precompiled'] = (catalog, snapshot)
+
+    results = {}
+    for variant in variants:
+        path, snapshot = paths[variant]
+        # Best of ``repeat`` launches; the first one also pays for a cold page cache
+        runs = [launch({'catalog': path, 'snapshot': snapshot, 'init': init}) for _ in range(repeat)]
+        best = min(runs, key=lambda times: times['first_recommendation_s'])
+        results[f'{variant}/{size}'] = {
+            **{key: round(value, 4) if isinstance(value, float) else value for key, value in best.items()},
+            'build_s': round(builds[variant], 3) if variant in builds else None,
+            'file_bytes': os.path.getsize(snapshot or path)
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print changes against ``baseline``; returns the names of regressed cases"""
+    regressions = []
+    print(f"\n{'case':<24} {'first recommendation':>21} {'live':>9}")
+    for name, row in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        first = row['first_recommendation_s'] / base['first_recommendation_s'] - 1
+        live = row['live_s'] / base['live_s'] - 1
+        regressed = first > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<24} {first:>+21.1%} {live:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        child(json.loads(sys.argv[2]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[7, 1000, 10000, 100000])
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--init', choices=['eager', 'background', 'lazy'], default='background')
+    parser.add_argument('--repeat', type=int, default=3, help='Launches per case; the fastest one is reported')
+    parser.add_argument('--baseline', help='Compare against the JSON output of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Fail when the time to the first recommendation grows by more than this fraction')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            rows = run(size, args.variants, args.init, args.repeat, tmp)
+            results.update(rows)
+            for name, row in rows.items():
+                print(f"{name:<24} first recommendation {row['first_recommendation_s']:>7.3f}s  "
+                      f"live {row['live_s']:.3f}s  imports {row['imports_s']:.3f}s  "
+                      f"engine {row['engine_load_s']:.3f}s ({row['store']})"
+                      + (f"  build {row['build_s']}s" if row['build_s'] is not None else ''))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'init': args.init,
+            'sizes': args.sizes
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('platform') != report['meta']['platform']:
+            print(f"note: baseline was recorded on {baseline['meta'].get('platform')}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
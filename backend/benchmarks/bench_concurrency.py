@@ -0,0 +1,140 @@
+"""Closed-loop concurrency benchmark: direct engine calls against the micro-batcher.
+
+Each of ``--clients`` threads sends /api/recommend's engine call back to
+back for ``--duration`` seconds, either straight to
+``RecommendationEngine.get_recommendations`` or through a MicroBatcher.
+The result cache is disabled so every request that is not shared with
+an in-flight one is analyzed and scored.
+
+Workloads:
+
+    readme   clients pick from the README example prompts, so many
+             concurrent requests are identical (a burst of users trying
+             the examples, or clients retrying)
+    unique   every request has its own description
+
+    python benchmarks/bench_concurrency.py --clients 50 100 200 500 --catalog-size 1000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import TASKS  # noqa: E402
+from micro_batcher import MicroBatcher  # noqa: E402
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from synthetic_catalog import write_catalog  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+CORPUS_SIZE = 200
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_clients(recommend, descriptions, clients, duration, top_n):
+    """Throughput and latency of ``clients`` threads calling ``recommend`` until the deadline"""
+    counter = itertools.count()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(clients + 1)
+
+    def client(seed):
+        rng = random.Random(seed)
+        own = []
+        start.wait()
+        while time.perf_counter() < deadline:
+            description = descriptions(rng, counter)
+            started = time.perf_counter()
+            try:
+                recommend(description, top_n)
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client, args=(seed,), daemon=True) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    deadline = time.perf_counter() + duration
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None
+    }
+
+
+def workloads(corpus):
+    return {
+        'readme': lambda rng, counter: rng.choice(TASKS),
+        'unique': lambda rng, counter: f'{rng.choice(corpus)} #{next(counter)}'
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 100, 200, 500])
+    parser.add_argument('--catalog-size', type=int, default=1000)
+    parser.add_argument('--workloads', nargs='+', default=['readme', 'unique'], choices=['readme', 'unique'])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--window-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    corpus = generate_corpus(CORPUS_SIZE, 300, seed=5)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_catalog(args.catalog_size, os.path.join(tmp, 'agents.json'))
+        engine = RecommendationEngine(path, cache_size=0)
+        for workload, clients in itertools.product(args.workloads, args.clients):
+            descriptions = workloads(corpus)[workload]
+            direct = run_clients(engine.get_recommendations, descriptions, clients, args.duration, args.top_n)
+
+            batcher = MicroBatcher(engine, args.window_ms / 1000, args.max_batch_size, args.workers)
+            batched = run_clients(lambda description, top_n: batcher.recommend(description, top_n, timeout=60),
+                                  descriptions, clients, args.duration, args.top_n)
+            batcher.shutdown()
+            status = batcher.status()
+            batched['coalesced'] = status['coalesced']
+            batched['mean_batch_size'] = round(status['batched_requests'] / max(status['batches'], 1), 1)
+
+            row = {'workload': workload, 'clients': clients, 'agents': args.catalog_size,
+                   'direct': direct, 'batched': batched,
+                   'speedup': round(batched['rps'] / direct['rps'], 2) if direct['rps'] else None}
+            rows.append(row)
+            print(f"{workload:<7} {clients:>4} clients  direct {direct['rps']:>8} req/s "
+                  f"(p50 {direct['p50_ms']} ms, p99 {direct['p99_ms']} ms)  batched {batched['rps']:>8} req/s "
+                  f"(p50 {batched['p50_ms']} ms, p99 {batched['p99_ms']} ms, coalesced {batched['coalesced']}, "
+                  f"mean batch {batched['mean_batch_size']})  x{row['speedup']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Catalog hot reload under load: no failed or stalled requests while agents_db.json changes.
+
+Starts the app on a synthetic catalog with a fast reload interval and runs
+``--clients`` threads that call /api/recommend and /api/agents back to back
+through the Flask test client. Meanwhile the catalog file is atomically
+replaced (write to a temporary file, then os.replace) ``--rewrites`` times
+with catalogs of different sizes, and once with malformed JSON.
+
+The run fails (exit status 1) unless:
+
+    every response was 200
+    the p99 request latency stayed under --max-p99-ms
+    every valid rewrite was installed as a new catalog version
+    the malformed file was rejected and the previous version kept serving
+
+    python benchmarks/bench_hot_reload.py --catalog-size 2000 --clients 8 --rewrites 6
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app  # noqa: E402
+from settings import Settings  # noqa: E402
+from synthetic_catalog import generate_agents  # noqa: E402
+
+TASKS = [
+    "I want to build my first React web application. I'm a complete beginner.",
+    "Deploy a serverless API on AWS for my team, needs to be secure and production ready",
+    "Machine learning pipeline in Python using pandas",
+    "Rust command line tool, free, for a personal side project"
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def replace_file(path, text):
+    """Atomically swap in new file contents, as a deploy would"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def wait_for(condition, timeout):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def client(app, stop, latencies, failures, lock, seed):
+    test_client = app.test_client()
+    own, bad = [], []
+    position = seed
+    while not stop.is_set():
+        position += 1
+        started = time.perf_counter()
+        if position % 4:
+            response = test_client.post('/api/recommend', json={'task_description': TASKS[position % len(TASKS)]})
+        else:
+            response = test_client.get('/api/agents')
+        own.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            bad.append((response.request.path, response.status_code))
+    with lock:
+        latencies.extend(own)
+        failures.extend(bad)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--catalog-size', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--rewrites', type=int, default=6)
+    parser.add_argument('--interval', type=float, default=0.05, help='Catalog reload interval in seconds')
+    parser.add_argument('--max-p99-ms', type=float, default=500.0)
+    parser.add_argument('--reload-timeout', type=float, default=30.0,
+                        help='Seconds to wait for a rewrite to be installed or rejected')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agents_db.json')
+        replace_file(path, json.dumps({'agents': generate_agents(args.catalog_size, 0)}))
+        app = create_app(Settings(agents_db_path=path, catalog_reload_interval=args.interval,
+                                  scoring_pool_size=0, metrics_enabled=False))
+        engine = app.extensions['engine_loader'].engine
+
+        stop = threading.Event()
+        latencies, failures, problems = [], [], []
+        lock = threading.Lock()
+        threads = [threading.Thread(target=client, args=(app, stop, latencies, failures, lock, seed))
+                   for seed in range(args.clients)]
+        for thread in threads:
+            thread.start()
+
+        reload_seconds = []
+        malformed_at = args.rewrites // 2
+        try:
+            for rewrite in range(args.rewrites):
+                if rewrite == malformed_at:
+                    before = engine.snapshot
+                    replace_file(path, '{"agents": [')
+                    if not wait_for(lambda: engine.reloader.last_error is not None, args.reload_timeout):
+                        problems.append('malformed catalog was never checked')
+                    if engine.snapshot is not before:
+                        problems.append('malformed catalog replaced the live snapshot')
+                    served = app.test_client().get('/api/agents').get_json()
+                    if served['total_count'] != len(before.agents):
+                        problems.append(f"served {served['total_count']} agents after the malformed write, "
+                                        f"expected {len(before.agents)}")
+                    print(f"malformed write rejected: {engine.reloader.last_error}")
+
+                size = args.catalog_size + 100 * (rewrite + 1)
+                version = engine.snapshot.version
+                started = time.perf_counter()
+                replace_file(path, json.dumps({'agents': generate_agents(size, rewrite + 1)}))
+                if not wait_for(lambda: engine.snapshot.version > version, args.reload_timeout):
+                    problems.append(f'rewrite {rewrite} was not installed within {args.reload_timeout}s')
+                    continue
+                reload_seconds.append(time.perf_counter() - started)
+                if len(engine.snapshot.agents) != size:
+                    problems.append(f'rewrite {rewrite} installed {len(engine.snapshot.agents)} agents, expected {size}')
+                if engine.reloader.last_error is not None:
+                    problems.append(f'reload error after valid rewrite {rewrite}: {engine.reloader.last_error}')
+                time.sleep(args.interval * 2)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            engine.stop_auto_reload()
+
+        p99_ms = percentile(latencies, 0.99) * 1000
+        print(f"{len(latencies)} requests, {len(failures)} non-200, p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+              f"p99 {p99_ms:.2f} ms, max {max(latencies) * 1000:.2f} ms")
+        print(f"{len(reload_seconds)} reloads to catalog version {engine.snapshot.version}, "
+              f"time to install p50 {percentile(reload_seconds, 0.5):.3f}s, max {max(reload_seconds):.3f}s"
+              if reload_seconds else 'no reloads installed')
+
+        if failures:
+            problems.append(f'{len(failures)} non-200 responses, e.g. {failures[:3]}')
+        if p99_ms > args.max_p99_ms:
+            problems.append(f'p99 latency {p99_ms:.1f} ms is over {args.max_p99_ms} ms')
+        if engine.snapshot.version != 1 + args.rewrites:
+            problems.append(f'catalog version is {engine.snapshot.version}, expected {1 + args.rewrites}')
+        for problem in problems:
+            print(f'FAIL: {problem}')
+        if problems:
+            sys.exit(1)
+        print('OK')
+
+
+if __name__ == '__main__':
+    main()
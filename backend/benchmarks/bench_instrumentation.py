@@ -0,0 +1,108 @@
+"""Overhead of the metrics hooks on the recommendation hot path.
+
+Measures the per-call cost of a stage timer with metrics disabled and
+enabled, counts how many hooks one /api/recommend request goes through, and
+compares end-to-end request latency (cache disabled, Flask test client)
+with metrics off and on. Exits non-zero if the disabled hooks add more than
+--max-overhead of the request time.
+
+    python benchmarks/bench_instrumentation.py --requests 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app import create_app  # noqa: E402
+from metrics import Metrics  # noqa: E402
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from settings import Settings  # noqa: E402
+
+TASKS = [
+    "I want to build my first React web application. I'm a complete beginner and need help with basic syntax.",
+    "Large-scale Java enterprise application with Spring Boot and microservices, complex business logic.",
+    "Machine learning pipeline in Python using pandas; data preprocessing and model selection.",
+    "Cross-platform mobile app using React Native with navigation and API integration.",
+    "Rust command line tool, free, for a personal side project",
+    "Deploy a serverless API on AWS for my team, needs to be secure and production ready",
+]
+
+
+def hook_cost(metrics, calls):
+    """Seconds per `with metrics.time(...)` block, minus the cost of the loop itself"""
+    started = time.perf_counter()
+    for _ in range(calls):
+        pass
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        with metrics.time('bench'):
+            pass
+    return max(time.perf_counter() - started - loop, 0.0) / calls
+
+
+def request_latency(metrics_enabled, requests, rounds):
+    engine = RecommendationEngine(os.path.join(BACKEND_DIR, 'agents_db.json'), cache_size=0,
+                                  metrics=Metrics(enabled=metrics_enabled))
+    client = create_app(Settings(catalog_reload_interval=0), engine=engine).test_client()
+    round_means = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for i in range(requests):
+            response = client.post('/api/recommend', json={'task_description': f"{TASKS[i % len(TASKS)]} #{i}"})
+            assert response.status_code == 200, response.data
+        round_means.append((time.perf_counter() - started) / requests)
+    return min(round_means), engine.metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--hook-calls', type=int, default=1_000_000)
+    parser.add_argument('--max-overhead', type=float, default=0.01,
+                        help='Largest allowed share of request time spent in disabled hooks')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    disabled_hook = hook_cost(Metrics(enabled=False), args.hook_calls)
+    enabled_hook = hook_cost(Metrics(enabled=True), args.hook_calls)
+    disabled_latency, _ = request_latency(False, args.requests, args.rounds)
+    enabled_latency, metrics = request_latency(True, args.requests, args.rounds)
+
+    # Stage timers, agent counter and the request histogram hit per request
+    stage_count = sum(metrics.stage_seconds.count((stage,)) for stage in
+                      ('parse_json', 'analyze', 'rank', 'present', 'explain', 'serialize'))
+    hooks_per_request = stage_count / (args.requests * args.rounds) + 2
+    disabled_overhead = hooks_per_request * disabled_hook / disabled_latency
+
+    result = {
+        'hook_ns_disabled': round(disabled_hook * 1e9, 1),
+        'hook_ns_enabled': round(enabled_hook * 1e9, 1),
+        'hooks_per_request': round(hooks_per_request, 1),
+        'request_us_metrics_off': round(disabled_latency * 1e6, 1),
+        'request_us_metrics_on': round(enabled_latency * 1e6, 1),
+        'metrics_on_overhead': round(enabled_latency / disabled_latency - 1, 4),
+        'disabled_hook_overhead': round(disabled_overhead, 6)
+    }
+    print(f"stage timer: {result['hook_ns_disabled']} ns disabled, {result['hook_ns_enabled']} ns enabled "
+          f"({result['hooks_per_request']} hooks per request)")
+    print(f"/api/recommend: {result['request_us_metrics_off']} us metrics off, "
+          f"{result['request_us_metrics_on']} us metrics on ({result['metrics_on_overhead']:+.2%})")
+    print(f"disabled hooks: {result['disabled_hook_overhead']:.4%} of request time "
+          f"(limit {args.max_overhead:.2%})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if disabled_overhead > args.max_overhead:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Semantic mode: index build cost, ANN recall and per-request latency.
+
+For each synthetic catalog size (with agent texts reshuffled so they are
+not all copies of the 7 originals), reports how long embedding the catalog
+takes and how much memory the float32 matrix uses, the recall of the ANN
+index against exact cosine search, how often semantic rankings through the
+ANN index match exact blending, and the latency of /api/recommend's engine
+call in rule mode, semantic mode with exact search and semantic mode with
+the ANN index, plus how often the default latency budget fell back to rule
+scoring.
+
+    python benchmarks/bench_semantic.py --sizes 1000 20000 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from synthetic_catalog import generate_agents  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+
+def write_varied_catalog(size, path, seed):
+    """A synthetic catalog whose description, capabilities and use cases differ between agents"""
+    rng = random.Random(seed)
+    agents = generate_agents(size, seed)
+    capabilities = sorted({c for agent in agents[:7] for c in agent['capabilities']})
+    use_cases = sorted({u for agent in agents[:7] for u in agent['use_cases']})
+    descriptions = [agent['description'] for agent in agents[:7]]
+    for agent in agents[7:]:
+        agent['description'] = rng.choice(descriptions)
+        agent['capabilities'] = rng.sample(capabilities, rng.randint(3, 7))
+        agent['use_cases'] = rng.sample(use_cases, rng.randint(2, 5))
+    with open(path, 'w') as f:
+        json.dump({'agents': agents}, f)
+    return path
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timed(fn, tasks):
+    times = []
+    for task in tasks:
+        started = time.perf_counter()
+        fn(task)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def run(size, tasks, top_n, recall_k, tmp):
+    path = write_varied_catalog(size, os.path.join(tmp, f'agents_{size}.json'), seed=size)
+    rule_engine = RecommendationEngine(path, cache_size=0)
+    started = time.perf_counter()
+    engine = RecommendationEngine(path, cache_size=0, semantic=True)
+    load_seconds = time.perf_counter() - started
+    index = engine.snapshot.semantic
+
+    # A rules reload keeps the catalog checksum, so the embeddings come from the cache
+    started = time.perf_counter()
+    engine.load_scoring_rules()
+    reload_seconds = time.perf_counter() - started
+
+    recall = []
+    if index.ann is not None:
+        for task in tasks:
+            query = index.embed(task)
+            similarity = index.similarity(query)
+            threshold = np.sort(similarity)[-recall_k]
+            recall.append(float(np.mean(similarity[index.nearest(query, recall_k)] >= threshold)))
+
+    def scores(task):
+        result = engine.get_recommendations(task, top_n, semantic=True, budget=60)
+        return [recommendation['score'] for recommendation in result['recommendations']]
+
+    rule = timed(lambda task: rule_engine.get_recommendations(task, top_n), tasks)
+    fallbacks = sum(engine.get_recommendations(task, top_n, semantic=True)['mode'] != 'semantic' for task in tasks)
+    ann = timed(scores, tasks) if index.ann is not None else None
+    ann_scores = [scores(task) for task in tasks]
+    ann_index, index.ann = index.ann, None
+    exact = timed(scores, tasks)
+    agreement = sum(scores(task) == expected for task, expected in zip(tasks, ann_scores)) / len(tasks)
+    index.ann = ann_index
+
+    return {
+        'agents': size,
+        'index_build_s': round(index.build_seconds, 3),
+        'engine_load_s': round(load_seconds, 3),
+        'rules_reload_s': round(reload_seconds, 3),
+        'matrix_mb': round(index.vectors.nbytes / 2 ** 20, 1),
+        'ann_components': index.ann.components if index.ann is not None else None,
+        f'ann_recall_at_{recall_k}': round(statistics.mean(recall), 3) if recall else None,
+        'ann_top_n_agreement': round(agreement, 3),
+        'rule_p50_ms': round(percentile(rule, 0.5) * 1000, 3),
+        'semantic_exact_p50_ms': round(percentile(exact, 0.5) * 1000, 3),
+        'semantic_exact_p99_ms': round(percentile(exact, 0.99) * 1000, 3),
+        'semantic_ann_p50_ms': round(percentile(ann, 0.5) * 1000, 3) if ann else None,
+        'semantic_ann_p99_ms': round(percentile(ann, 0.99) * 1000, 3) if ann else None,
+        'budget_fallback_rate': round(fallbacks / len(tasks), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 20000, 100000])
+    parser.add_argument('--tasks', type=int, default=100)
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--recall-k', type=int, default=1000)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    tasks = generate_corpus(200, args.tasks, seed=3)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            row = run(size, tasks, args.top_n, args.recall_k, tmp)
+            rows.append(row)
+            print(f"{row['agents']:>7} agents  build {row['index_build_s']}s ({row['matrix_mb']} MB)  "
+                  f"rules reload {row['rules_reload_s']}s  ANN recall@{args.recall_k} "
+                  f"{row[f'ann_recall_at_{args.recall_k}']}, top-{args.top_n} agreement "
+                  f"{row['ann_top_n_agreement']:.0%}  p50 rule {row['rule_p50_ms']} ms, semantic exact "
+                  f"{row['semantic_exact_p50_ms']} ms, ANN {row['semantic_ann_p50_ms']} ms  "
+                  f"fallbacks {row['budget_fallback_rate']:.0%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
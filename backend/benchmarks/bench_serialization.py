@@ -0,0 +1,100 @@
+"""Response serialization cost: Flask's jsonify against payloads.dumps.
+
+Times serializing /api/recommend payloads (the serialize stage) and the
+/api/agents body, which is now built once per catalog version, on the
+shipped catalog and larger synthetic ones. Runs with orjson when it is
+installed; pass --stdlib to measure the fallback encoder.
+
+    python benchmarks/bench_serialization.py --catalog-sizes 7 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+if '--stdlib' in sys.argv:
+    sys.modules['orjson'] = None  # make the optional import fail
+
+from flask import Flask, jsonify  # noqa: E402
+
+import payloads  # noqa: E402
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from synthetic_catalog import write_catalog  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+
+def best_time(fn, items, rounds):
+    """Fastest mean seconds per item over ``rounds`` passes"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter() - started) / len(items))
+    return best
+
+
+def measure(engine, tasks, rounds):
+    payloads_ = [{'success': True, 'task_description': task, **engine.get_recommendations(task, 3)}
+                 for task in tasks]
+    app = Flask(__name__)
+    with app.app_context():
+        jsonify_recommend = best_time(lambda p: jsonify(p).get_data(), payloads_, rounds)
+        agents = lambda _: jsonify({'success': True, 'agents': [a.to_dict() for a in engine.agents],
+                                    'total_count': len(engine.agents)}).get_data()
+        jsonify_agents = best_time(agents, [None], max(rounds // 10, 1))
+    dumps_recommend = best_time(payloads.dumps, payloads_, rounds)
+    cold = engine.snapshot.payloads
+    started = time.perf_counter()
+    cold.agents_body()
+    dumps_agents_cold = time.perf_counter() - started
+    cached_agents = best_time(lambda _: cold.agents_body().body, [None] * 1000, rounds)
+    return {
+        'recommend_us_jsonify': round(jsonify_recommend * 1e6, 2),
+        'recommend_us_dumps': round(dumps_recommend * 1e6, 2),
+        'recommend_speedup': round(jsonify_recommend / dumps_recommend, 2),
+        'agents_us_jsonify': round(jsonify_agents * 1e6, 1),
+        'agents_us_first_build': round(dumps_agents_cold * 1e6, 1),
+        'agents_us_cached': round(cached_agents * 1e6, 3),
+        'agents_body_bytes': len(cold.agents_body().body),
+        'agents_gzip_bytes': len(cold.agents_body().gzipped or b'')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--catalog-sizes', type=int, nargs='*', default=[7, 1000, 10000])
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--stdlib', action='store_true', help='Measure without orjson even if it is installed')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    encoder = 'orjson' if payloads.orjson is not None else 'stdlib'
+    tasks = generate_corpus(500, args.tasks, seed=1)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.catalog_sizes:
+            path = (os.path.join(BACKEND_DIR, 'agents_db.json') if size == 7
+                    else write_catalog(size, os.path.join(tmp, f'agents_{size}.json'), seed=size))
+            engine = RecommendationEngine(path, cache_size=0)
+            row = results[size] = measure(engine, tasks, args.rounds)
+            print(f"{size:>7} agents ({encoder}): recommend {row['recommend_us_jsonify']} -> "
+                  f"{row['recommend_us_dumps']} us ({row['recommend_speedup']}x); /api/agents "
+                  f"{row['agents_us_jsonify']} us jsonify, {row['agents_us_first_build']} us first build, "
+                  f"{row['agents_us_cached']} us cached; {row['agents_body_bytes']} bytes, "
+                  f"{row['agents_gzip_bytes']} gzipped")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'encoder': encoder, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Task analysis cost: the keyword matcher against the per-keyword scan it replaced.
+
+For each description size, analyzes task_corpus descriptions with the
+shipped keyword vocabulary twice: with RecommendationEngine._analyze_task
+(uncached) and with the original analyze_task, which lowercased the text
+and tested every keyword of every table with ``in``. Both must return the
+same TaskAnalysis. Word-boundary matching (WORD_BOUNDARIES=1), which the
+old scan had no equivalent for, is timed alongside for reference.
+
+The run fails (exit status 1) if any analysis differs or if the matcher is
+slower than the old scan by more than --threshold at any size.
+
+    python benchmarks/bench_task_analysis.py --sizes 300 5000 50000 500000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from recommendation_engine import RecommendationEngine, TaskAnalysis  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+
+def scan_analysis(engine, task_description: str) -> TaskAnalysis:
+    """analyze_task before the keyword matcher: ``in`` tests over the lowercased text, table by table"""
+    task_lower = task_description.lower()
+
+    def present(keywords):
+        return any(keyword in task_lower for keyword in keywords)
+
+    task_type = 'general_programming'
+    max_matches = 0
+    for task_cat, keywords in engine.task_keywords.items():
+        matches = sum(1 for keyword in keywords if keyword in task_lower)
+        if matches > max_matches:
+            max_matches = matches
+            task_type = task_cat
+    complexity = next((level for level, indicators in engine.complexity_indicators.items() if present(indicators)),
+                      'intermediate')
+    languages = [lang for lang, keywords in engine.language_keywords.items() if present(keywords)]
+    requirements = [req for req, keywords in engine.requirement_keywords.items() if present(keywords)]
+    context = next((name for name, keywords in engine.context_keywords.items() if present(keywords)),
+                   'professional')
+    return TaskAnalysis(
+        task_type=task_type,
+        complexity=complexity,
+        languages=languages,
+        requirements=requirements,
+        context=context,
+        collaboration_needed='collaboration' in requirements,
+        deployment_needed='deployment' in requirements,
+        learning_focused=context == 'learning'
+    )
+
+
+def best_time(fn, items, rounds):
+    """Fastest mean seconds per item over ``rounds`` passes"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter() - started) / len(items))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 2000, 5000, 50000, 500000])
+    parser.add_argument('--count', type=int, default=20, help='Descriptions per size')
+    parser.add_argument('--rounds', type=int, default=5, help='Passes per size; the fastest one is reported')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Fail when the matcher is slower than the old scan by more than this fraction')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    agents_db = os.path.join(BACKEND_DIR, 'agents_db.json')
+    engine = RecommendationEngine(agents_db, cache_size=0)
+    bounded = RecommendationEngine(agents_db, cache_size=0, word_boundaries=True)
+    print(f"{len(engine.keyword_matcher.keywords)} keywords")
+
+    rows, problems = [], []
+    for size in args.sizes:
+        corpus = generate_corpus(size, args.count, seed=size)
+        mismatches = sum(engine._analyze_task(text) != scan_analysis(engine, text) for text in corpus)
+        if mismatches:
+            problems.append(f'{mismatches} of {len(corpus)} analyses differ from the old scan at {size} bytes')
+
+        rounds = max(1, args.rounds if size < 100000 else args.rounds // 2)
+        scan = best_time(lambda text: scan_analysis(engine, text), corpus, rounds)
+        matcher = best_time(engine._analyze_task, corpus, rounds)
+        word_boundaries = best_time(bounded._analyze_task, corpus, rounds)
+        row = {'size': size, 'scan_us': round(scan * 1e6, 1), 'matcher_us': round(matcher * 1e6, 1),
+               'word_boundaries_us': round(word_boundaries * 1e6, 1), 'ratio': round(matcher / scan, 3)}
+        rows.append(row)
+        print(f"{size:>8} bytes  scan {row['scan_us']:>10} us  matcher {row['matcher_us']:>10} us "
+              f"(x{row['ratio']})  word boundaries {row['word_boundaries_us']:>10} us")
+        if matcher > scan * (1 + args.threshold):
+            problems.append(f"matcher is {row['ratio']}x the old scan at {size} bytes")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    if problems:
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Closed-loop load test for POST /api/recommend against a running server.
+
+Each client thread keeps one HTTP connection open and sends requests back
+to back for the given duration; the script reports throughput and latency
+percentiles over every completed request. Start the server first, e.g.
+
+    gunicorn                                # from backend/, see gunicorn.conf.py
+    python benchmarks/load_test.py --url http://localhost:5001 --concurrency 16 --duration 30
+
+Use --unique to append a counter to each description so requests miss the
+result cache and exercise analysis and scoring every time.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+TASKS = [
+    "I want to build my first React web application. I'm a complete beginner and need help with basic syntax.",
+    "Large-scale Java enterprise application with Spring Boot and microservices, complex business logic.",
+    "Machine learning pipeline in Python using pandas; data preprocessing and model selection.",
+    "Cross-platform mobile app using React Native with navigation and API integration.",
+    "Rust command line tool, free, for a personal side project",
+    "Deploy a serverless API on AWS for my team, needs to be secure and production ready",
+    "Quick prototype of a Go microservice",
+    "Help me refactor some code",
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def client(url, deadline, top_n, unique, counter, latencies, errors, lock):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    path = parts.path.rstrip('/') + '/api/recommend'
+    local_latencies, local_errors = [], 0
+
+    while time.perf_counter() < deadline:
+        n = next(counter)
+        description = TASKS[n % len(TASKS)]
+        if unique:
+            description = f"{description} (request {n})"
+        body = json.dumps({'task_description': description, 'top_n': top_n})
+
+        started = time.perf_counter()
+        try:
+            connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            ok = False
+        elapsed = time.perf_counter() - started
+
+        if ok:
+            local_latencies.append(elapsed)
+        else:
+            local_errors += 1
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run(url, concurrency, duration, top_n, unique):
+    counter = itertools.count()
+    latencies, errors, lock = [], [], threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    threads = [
+        threading.Thread(target=client, args=(url, deadline, top_n, unique, counter, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        raise SystemExit(f"No successful requests against {url} ({sum(errors)} errors)")
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 3),
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p90_ms': round(percentile(latencies, 0.90) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5001')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--unique', action='store_true', help='Make every description unique to bypass the cache')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    rows = []
+    for concurrency in args.concurrency:
+        row = run(args.url, concurrency, args.duration, args.top_n, args.unique)
+        rows.append(row)
+        print(f"{row['concurrency']:>4} clients  {row['throughput_rps']:>8} req/s  "
+              f"p50 {row['p50_ms']:>8} ms  p99 {row['p99_ms']:>8} ms  "
+              f"max {row['max_ms']:>8} ms  errors {row['errors']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""Benchmark suite for the recommendation engine and the Flask API.
+
+Cases (n = catalog size, s = task description size in bytes):
+
+    analyze_task/s              uncached analysis of one description
+    analyze_stream/s            the same description fed as 4 KB byte chunks
+    calculate_agent_score/n     per-agent scorer; one op scores one agent
+    get_recommendations/n       uncached recommendations for a 500-byte task
+    api/<endpoint>/n            endpoint through the Flask test client
+    api/recommend_text/s        /api/recommend with an s-byte description (7 agents)
+
+Every case reports ops/sec, latency percentiles and the peak traced memory
+of one op. Results are written as JSON; pass a previous run as --baseline to
+fail on throughput or memory regressions beyond the thresholds.
+
+    python benchmarks/run_suite.py --output baseline.json
+    python benchmarks/run_suite.py --baseline baseline.json --threshold 0.15
+    python benchmarks/run_suite.py --catalog-sizes 7 1000 --cases 'api/*'
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from app import create_app  # noqa: E402
+from recommendation_engine import RecommendationEngine  # noqa: E402
+from settings import Settings  # noqa: E402
+from synthetic_catalog import write_catalog  # noqa: E402
+from task_corpus import generate_corpus  # noqa: E402
+
+CORPUS_SIZE = 20
+RECOMMEND_TEXT_SIZE = 500
+BATCH_SIZE = 32
+CATALOG_CASES = ['calculate_agent_score', 'get_recommendations', 'api/health', 'api/agents', 'api/agent_details',
+                 'api/analyze', 'api/recommend', 'api/recommend_batch', 'api/compare']
+# Memory changes smaller than this are noise, whatever the relative change
+MEMORY_SLACK_BYTES = 64 * 1024
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(fn, inputs, min_time, min_ops, max_ops, rounds):
+    """Run ``fn`` over ``inputs`` (cycling) and summarize its latency and peak memory.
+
+    The time budget is split into ``rounds``; ops/sec is taken from the
+    fastest round, as timeit does, so background noise on a shared machine
+    does not read as a regression. Percentiles cover every op.
+    """
+    fn(inputs[0])  # warm up
+
+    latencies, round_rates = [], []
+    for _ in range(rounds):
+        gc.collect()
+        round_latencies = []
+        started = time.perf_counter()
+        while len(round_latencies) < max(max_ops // rounds, 1) and (
+                len(round_latencies) < min_ops or time.perf_counter() - started < min_time / rounds):
+            item = inputs[(len(latencies) + len(round_latencies)) % len(inputs)]
+            op_started = time.perf_counter()
+            fn(item)
+            round_latencies.append(time.perf_counter() - op_started)
+        latencies.extend(round_latencies)
+        round_rates.append(len(round_latencies) / sum(round_latencies))
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    fn(inputs[0])
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        'ops': len(latencies),
+        'ops_per_sec': round(max(round_rates), 3),
+        'mean_us': round(sum(latencies) / len(latencies) * 1e6, 3),
+        'p50_us': round(percentile(latencies, 0.50) * 1e6, 3),
+        'p90_us': round(percentile(latencies, 0.90) * 1e6, 3),
+        'p99_us': round(percentile(latencies, 0.99) * 1e6, 3),
+        'max_us': round(max(latencies) * 1e6, 3),
+        'peak_memory_bytes': peak
+    }
+
+
+def post(client, path, body):
+    response = client.post(path, json=body)
+    if response.status_code != 200:
+        raise AssertionError(f"{path} returned {response.status_code}: {response.data[:200]!r}")
+    return response
+
+
+def get(client, path):
+    response = client.get(path)
+    if response.status_code != 200:
+        raise AssertionError(f"{path} returned {response.status_code}: {response.data[:200]!r}")
+    return response
+
+
+def text_cases(text_sizes):
+    """Cases that depend on the description size, run against the 7-agent catalog"""
+    engine = RecommendationEngine(os.path.join(BACKEND_DIR, 'agents_db.json'), cache_size=0)
+    client = create_app(Settings(catalog_reload_interval=0, scoring_pool_size=0), engine=engine).test_client()
+    for size in text_sizes:
+        corpus = generate_corpus(size, CORPUS_SIZE, seed=size)
+        yield f'analyze_task/{size}', engine.analyze_task, corpus
+        yield f'analyze_stream/{size}', lambda text: engine.analyze_stream(
+            text[start:start + 4096].encode() for start in range(0, len(text), 4096)), corpus
+        yield f'api/recommend_text/{size}', lambda text: post(
+            client, '/api/recommend', {'task_description': text}), corpus
+
+
+def catalog_cases(engine, size):
+    """Cases that depend on the catalog size"""
+    client = create_app(Settings(catalog_reload_interval=0, scoring_pool_size=0), engine=engine).test_client()
+    corpus = generate_corpus(RECOMMEND_TEXT_SIZE, CORPUS_SIZE, seed=1)
+    analyses = [engine.analyze_task(text) for text in corpus]
+    rng = np.random.default_rng(size)
+    sample_rows = rng.choice(len(engine.agents), min(len(engine.agents), 1000), replace=False)
+    pairs = [(engine.agents[int(row)], analyses[i % len(analyses)]) for i, row in enumerate(sample_rows)]
+    agent_ids = [engine.agents[int(row)]['id'] for row in sample_rows]
+    batches = [corpus[i:] + corpus[:i] for i in range(len(corpus))]
+    batches = [(batch * (BATCH_SIZE // len(batch) + 1))[:BATCH_SIZE] for batch in batches]
+
+    yield f'calculate_agent_score/{size}', lambda pair: engine.calculate_agent_score(*pair), pairs
+    yield f'get_recommendations/{size}', engine.get_recommendations, corpus
+    yield f'api/health/{size}', lambda _: get(client, '/'), [None]
+    yield f'api/agents/{size}', lambda _: get(client, '/api/agents'), [None]
+    yield f'api/agent_details/{size}', lambda agent_id: get(client, f'/api/agents/{agent_id}'), agent_ids
+    yield f'api/analyze/{size}', lambda text: post(client, '/api/analyze', {'task_description': text}), corpus
+    yield f'api/recommend/{size}', lambda text: post(client, '/api/recommend', {'task_description': text}), corpus
+    yield f'api/recommend_batch/{size}', lambda batch: post(
+        client, '/api/recommend/batch', {'task_descriptions': batch}), batches
+    yield f'api/compare/{size}', lambda text: post(
+        client, '/api/compare', {'task_description': text, 'agent_ids': agent_ids[:3]}), corpus
+
+
+def selected(name, patterns):
+    return not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def run_suite(args):
+    results = {}
+
+    def run_cases(cases):
+        for name, fn, inputs in cases:
+            if not selected(name, args.cases):
+                continue
+            results[name] = measure(fn, inputs, args.min_time, args.min_ops, args.max_ops, args.rounds)
+            row = results[name]
+            print(f"{name:<34} {row['ops_per_sec']:>12.1f} ops/s  p50 {row['p50_us']:>11.1f} us  "
+                  f"p99 {row['p99_us']:>11.1f} us  peak {row['peak_memory_bytes'] / 1024:>10.1f} KiB")
+
+    run_cases(text_cases(args.text_sizes))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.catalog_sizes:
+            if not any(selected(f'{case}/{size}', args.cases) for case in CATALOG_CASES):
+                continue
+            path = write_catalog(size, os.path.join(tmp, f'agents_{size}.json'), seed=size)
+            engine = RecommendationEngine(path, cache_size=0)
+            run_cases(catalog_cases(engine, size))
+            del engine
+            os.remove(path)
+    return results
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Print changes against ``baseline``; returns the names of regressed cases"""
+    regressions = []
+    print(f"\n{'case':<34} {'ops/s':>9} {'p99':>9} {'memory':>9}")
+    for name, row in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        speed = row['ops_per_sec'] / base['ops_per_sec'] - 1
+        p99 = row['p99_us'] / base['p99_us'] - 1
+        memory_delta = row['peak_memory_bytes'] - base['peak_memory_bytes']
+        memory = memory_delta / base['peak_memory_bytes'] if base['peak_memory_bytes'] else 0.0
+        regressed = speed < -threshold or (memory > memory_threshold and memory_delta > MEMORY_SLACK_BYTES)
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<34} {speed:>+9.1%} {p99:>+9.1%} {memory:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--catalog-sizes', type=int, nargs='*', default=[7, 1000, 10000, 100000])
+    parser.add_argument('--text-sizes', type=int, nargs='*', default=[50, 500, 5000, 50000])
+    parser.add_argument('--cases', nargs='+', help='Only run cases matching these glob patterns')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to run each case for')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per case; ops/sec is the best round')
+    parser.add_argument('--min-ops', type=int, default=3, help='Minimum ops per round')
+    parser.add_argument('--max-ops', type=int, default=100000)
+    parser.add_argument('--baseline', help='Compare against the JSON output of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Fail when ops/sec drops by more than this fraction')
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help='Fail when peak memory grows by more than this fraction')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            'catalog_sizes': args.catalog_sizes,
+            'text_sizes': args.text_sizes
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('platform') != report['meta']['platform']:
+            print(f"note: baseline was recorded on {baseline['meta'].get('platform')}")
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
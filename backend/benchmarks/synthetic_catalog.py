@@ -0,0 +1,64 @@
+"""Synthetic agent catalogs for benchmarks.
+
+Scales agents_db.json to any size by cloning its agents with randomized
+languages, audiences, pricing and flags, so catalog-size dependent code paths
+can be measured on realistic shapes.
+
+    python benchmarks/synthetic_catalog.py 10000 /tmp/agents_10k.json
+"""
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_CATALOG = os.path.join(BACKEND_DIR, 'agents_db.json')
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
+             'Kotlin', 'Swift', 'Scala', 'HTML', 'CSS', 'React', 'Vue', 'Node.js']
+IDEAL_FOR = ['beginners', 'students', 'experienced_developers', 'enterprise', 'prototyping', 'collaboration',
+             'productivity', 'large_projects', 'refactoring', 'cloud_developers', 'privacy_focused',
+             'budget_conscious', 'open_source', 'team_development', 'large_codebases']
+PRICE_TIERS = ['free', 'freemium', 'paid']
+LEARNING_CURVES = ['low', 'medium', 'high']
+
+
+def generate_agents(count: int, seed: int = 0) -> List[Dict]:
+    """Return ``count`` agents derived from agents_db.json; the first 7 are the originals"""
+    with open(BASE_CATALOG) as f:
+        base_agents = json.load(f)['agents']
+    rng = random.Random(seed)
+
+    agents = []
+    for i in range(count):
+        template = base_agents[i % len(base_agents)]
+        if i < len(base_agents):
+            agents.append(dict(template))
+            continue
+        agents.append(dict(
+            template,
+            id=f"{template['id']}_{i}",
+            name=f"{template['name']} #{i}",
+            supported_languages=rng.sample(LANGUAGES, rng.randint(2, 12)),
+            ideal_for=rng.sample(IDEAL_FOR, rng.randint(1, 4)),
+            price_tier=rng.choice(PRICE_TIERS),
+            learning_curve=rng.choice(LEARNING_CURVES),
+            collaboration=rng.random() < 0.4,
+            deployment=rng.random() < 0.3,
+            strengths=rng.sample(template['strengths'], len(template['strengths'])),
+            system_prompt=f"{template['system_prompt']} (variant {i})"
+        ))
+    return agents
+
+
+def write_catalog(count: int, path: str, seed: int = 0) -> str:
+    with open(path, 'w') as f:
+        json.dump({'agents': generate_agents(count, seed)}, f)
+    return path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit(f"usage: {sys.argv[0]} COUNT OUTPUT.json")
+    write_catalog(int(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,66 @@
+"""Synthetic task descriptions for benchmarks.
+
+Builds descriptions of a target size in bytes by chaining sentences that
+mix the vocabulary the analyzer looks for (languages, frameworks, task and
+requirement keywords) with neutral filler, so short prompts and
+design-doc sized inputs exercise the same matching paths.
+
+    python benchmarks/task_corpus.py 5000 20 /tmp/tasks_5k.jsonl
+"""
+import json
+import random
+import sys
+from typing import List
+
+SUBJECTS = ['a web application', 'a mobile app', 'a data pipeline', 'a REST API', 'a game prototype',
+            'an internal dashboard', 'a command line tool', 'a machine learning service',
+            'a serverless backend', 'an automation script', 'a microservices platform']
+STACKS = ['React and Node', 'Django and PostgreSQL', 'Flask', 'Spring Boot', 'React Native', 'Flutter',
+          'pandas and numpy', 'FastAPI', 'Unity', 'Go and Kubernetes', 'Rust', 'TypeScript and Vue',
+          'Swift for iOS', 'Kotlin for Android', 'Docker on AWS', 'GraphQL and Java']
+GOALS = ['needs real-time collaboration for my team', 'should be deployed to production',
+         'must be secure and handle authentication', 'is a learning project for a beginner',
+         'is an enterprise system with complex business logic', 'is a quick prototype for a startup',
+         'needs good test coverage and CI/CD', 'has to be free or low cost', 'needs code review support',
+         'is a personal side project', 'must scale to a large codebase', 'needs debugging help']
+FILLER = ['The current implementation', 'Our existing module', 'This part of the design', 'The next milestone',
+          'The migration plan', 'A follow-up change', 'The review feedback', 'The rollout']
+FILLER_ENDINGS = ['keeps the interfaces unchanged.', 'is described in the previous section.',
+                  'depends on the outcome of the spike.', 'was discussed with the owners last week.',
+                  'should not change any user-visible behaviour.', 'is tracked separately.']
+
+
+def _sentence(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        return f"I want to build {rng.choice(SUBJECTS)} with {rng.choice(STACKS)} that {rng.choice(GOALS)}."
+    return f"{rng.choice(FILLER)} {rng.choice(FILLER_ENDINGS)}"
+
+
+def generate_description(size: int, seed: int = 0) -> str:
+    """One description of exactly ``size`` bytes (ASCII), cut at a word boundary when possible"""
+    rng = random.Random(seed)
+    # Lead with a short task statement so even the smallest inputs carry keywords
+    sentences = [f"Build {rng.choice(SUBJECTS)} with {rng.choice(STACKS)}."]
+    length = len(sentences[0]) + 1
+    while length < size:
+        sentence = _sentence(rng)
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    text = ' '.join(sentences)[:size]
+    cut = text.rfind(' ')
+    if len(text) == size and cut > size // 2:
+        text = text[:cut]
+    return text.ljust(size, '.')
+
+
+def generate_corpus(size: int, count: int, seed: int = 0) -> List[str]:
+    """``count`` distinct descriptions of ``size`` bytes"""
+    return [generate_description(size, seed * 1_000_003 + i) for i in range(count)]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        sys.exit(f"usage: {sys.argv[0]} SIZE_BYTES COUNT OUTPUT.jsonl")
+    with open(sys.argv[3], 'w') as f:
+        for description in generate_corpus(int(sys.argv[1]), int(sys.argv[2])):
+            f.write(json.dumps({'task_description': description}) + '\n')
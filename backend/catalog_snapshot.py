@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from agent_catalog import AgentCatalog
+from payloads import CatalogPayloads
+from scoring_rules import ScoringPlan
+from semantic_index import SemanticIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable version of the agent catalog and everything derived from it.
+
+    The engine only ever holds a reference to the current snapshot; a reload
+    builds a complete new snapshot and swaps the reference, so a request that
+    grabbed the old one keeps a consistent view until it finishes.
+    """
+    agents: Sequence
+    index: Mapping
+    catalog: AgentCatalog
+    plans: Dict[str, ScoringPlan]
+    default_rule_set: str
+    payloads: CatalogPayloads
+    version: int
+    checksum: str
+    loaded_at: float
+    load_seconds: float
+    store: Optional[str] = None
+    source_path: Optional[str] = None
+    source_mtime_ns: Optional[int] = None
+    source_size: Optional[int] = None
+    # Agent text embeddings, only built when the engine runs with semantic mode
+    semantic: Optional[SemanticIndex] = None
+
+    def plan(self, name: Optional[str] = None) -> ScoringPlan:
+        """Compiled scoring plan of a rule set (the default one if None)"""
+        try:
+            return self.plans[name or self.default_rule_set]
+        except KeyError:
+            raise ValueError(f"Unknown rule set: {name}")
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'checksum': self.checksum,
+            'agent_count': len(self.agents),
+            'loaded_at': self.loaded_at,
+            'load_seconds': round(self.load_seconds, 6),
+            'store': self.store,
+            'source_path': self.source_path,
+            'source_mtime_ns': self.source_mtime_ns,
+            'source_size': self.source_size,
+            'rule_sets': list(self.plans),
+            'default_rule_set': self.default_rule_set,
+            'semantic': self.semantic.info() if self.semantic is not None else None
+        }
+
+
+class CatalogReloader:
+    """Polls agents_db.json and the scoring rules file and hot-swaps them when they change.
+
+    Changes are detected from each file's mtime and size. Parsing and index
+    building run on the polling thread, never on the request path. A file
+    that fails to parse or validate is logged and skipped until it changes
+    again; the live catalog is left untouched.
+    """
+
+    def __init__(self, engine, interval: float = 2.0):
+        self.engine = engine
+        self.interval = interval
+        self.last_error: Optional[str] = None
+        self.last_checked_at: Optional[float] = None
+        self._rejected: Optional[Tuple[int, int]] = None
+        self._rejected_rules: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Reload the catalog or scoring rules if a file changed; returns True if a new version was installed"""
+        with self._lock:
+            self.last_checked_at = time.time()
+            return self._check_catalog() | self._check_rules()
+
+    def _check_catalog(self) -> bool:
+        snapshot = self.engine.snapshot
+        path = snapshot.source_path
+        if path is None:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            self.last_error = f"Cannot stat {path}: {e}"
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == (snapshot.source_mtime_ns, snapshot.source_size) or signature == self._rejected:
+            return False
+
+        try:
+            new_snapshot = self.engine.load_agents_file(path)
+        except Exception as e:
+            self._rejected = signature
+            self.last_error = f"Rejected catalog update: {e}"
+            logger.error(self.last_error)
+            return False
+
+        self._rejected = None
+        self.last_error = None
+        logger.info(f"Reloaded agent catalog version {new_snapshot.version} "
+                    f"({len(new_snapshot.agents)} agents) in {new_snapshot.load_seconds:.3f}s")
+        return True
+
+    def _check_rules(self) -> bool:
+        rules = self.engine.scoring_rules
+        if rules.path is None:
+            return False
+        try:
+            stat = os.stat(rules.path)
+        except OSError as e:
+            self.last_error = f"Cannot stat {rules.path}: {e}"
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == rules.signature or signature == self._rejected_rules:
+            return False
+
+        try:
+            new_snapshot = self.engine.load_scoring_rules(rules.path)
+        except Exception as e:
+            self._rejected_rules = signature
+            self.last_error = f"Rejected scoring rules update: {e}"
+            logger.error(self.last_error)
+            return False
+
+        self._rejected_rules = None
+        self.last_error = None
+        logger.info(f"Reloaded scoring rules {list(new_snapshot.plans)} as catalog version "
+                    f"{new_snapshot.version}")
+        return True
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='catalog-reloader', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Catalog reload check failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'auto_reload': self._thread is not None and self._thread.is_alive(),
+            'interval_seconds': self.interval,
+            'last_checked_at': self.last_checked_at,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,370 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from agent_catalog import AgentCatalog, AgentRecord
+
+
+@dataclass
+class LoadedCatalog:
+    """What a store hands to the engine: records plus, optionally, prebuilt columns"""
+    agents: Sequence
+    index: Mapping
+    checksum: str
+    catalog: Optional[AgentCatalog] = None
+    # Compiled scoring plans and agent embeddings, from a precompiled snapshot
+    plans: Optional[Dict[str, Any]] = None
+    semantic: Optional[Any] = None
+
+
+class CatalogStore:
+    """Storage backend for the agent catalog.
+
+    Subclasses read one on-disk format; ``open_store`` picks the backend from
+    the file extension so ``RecommendationEngine("agents.db")`` just works.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> LoadedCatalog:
+        raise NotImplementedError
+
+    @staticmethod
+    def _validate(agents: Sequence[AgentRecord]) -> Dict[str, AgentRecord]:
+        index = {agent.id: agent for agent in agents}
+        if len(index) != len(agents):
+            raise ValueError('Catalog contains duplicate agent IDs')
+        return index
+
+
+class JsonCatalogStore(CatalogStore):
+    """The original agents_db.json format (default)"""
+
+    def load(self) -> LoadedCatalog:
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        agents_data = json.loads(raw)
+        if not isinstance(agents_data, dict) or not isinstance(agents_data.get('agents'), list):
+            raise ValueError("Catalog must be an object with an 'agents' list")
+        agents = tuple(AgentRecord.from_dict(agent) for agent in agents_data['agents'])
+        return LoadedCatalog(agents=agents, index=self._validate(agents),
+                             checksum=hashlib.sha256(raw).hexdigest())
+
+    @staticmethod
+    def write(agents: Sequence[AgentRecord], path: str, checksum: str = None):
+        with open(path, 'w') as f:
+            json.dump({'agents': [agent.to_dict() for agent in agents]}, f, indent=2)
+
+
+class SqliteCatalogStore(CatalogStore):
+    """SQLite-backed catalog with indexes on id, language, price tier and ideal_for.
+
+    Besides loading the full catalog, ``find_agent_ids`` answers attribute
+    queries straight from the indexes without materializing any records.
+    """
+
+    LIST_FIELDS = ('capabilities', 'strengths', 'supported_languages', 'use_cases', 'ideal_for')
+
+    SCHEMA = """
+        CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE agents (
+            row INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            capabilities TEXT NOT NULL,
+            strengths TEXT NOT NULL,
+            supported_languages TEXT NOT NULL,
+            use_cases TEXT NOT NULL,
+            ideal_for TEXT NOT NULL,
+            collaboration INTEGER NOT NULL,
+            deployment INTEGER NOT NULL,
+            learning_curve TEXT NOT NULL,
+            price_tier TEXT NOT NULL,
+            detail_keys TEXT NOT NULL,
+            details BLOB NOT NULL
+        );
+        CREATE INDEX idx_agents_price_tier ON agents (price_tier);
+        CREATE TABLE agent_languages (language TEXT NOT NULL, agent_id TEXT NOT NULL);
+        CREATE INDEX idx_agent_languages_language ON agent_languages (language);
+        CREATE TABLE agent_ideal_for (ideal_for TEXT NOT NULL, agent_id TEXT NOT NULL);
+        CREATE INDEX idx_agent_ideal_for_ideal_for ON agent_ideal_for (ideal_for);
+    """
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def load(self) -> LoadedCatalog:
+        with self._connect() as conn:
+            checksum = conn.execute("SELECT value FROM metadata WHERE key = 'checksum'").fetchone()[0]
+            rows = conn.execute(
+                "SELECT id, name, description, capabilities, strengths, supported_languages, use_cases, "
+                "ideal_for, collaboration, deployment, learning_curve, price_tier, detail_keys, details "
+                "FROM agents ORDER BY row"
+            ).fetchall()
+        agents = tuple(
+            AgentRecord.from_dict({
+                'id': row[0], 'name': row[1], 'description': row[2],
+                **{field: json.loads(value) for field, value in zip(self.LIST_FIELDS, row[3:8])},
+                'collaboration': bool(row[8]), 'deployment': bool(row[9]),
+                'learning_curve': row[10], 'price_tier': row[11]
+            }).with_details(tuple(json.loads(row[12])), row[13])
+            for row in rows
+        )
+        return LoadedCatalog(agents=agents, index=self._validate(agents), checksum=checksum)
+
+    def find_agent_ids(self, language: str = None, price_tier: str = None, ideal_for: str = None) -> List[str]:
+        """IDs of agents matching every given attribute, answered from the indexes"""
+        clauses, params = [], []
+        if language is not None:
+            clauses.append("id IN (SELECT agent_id FROM agent_languages WHERE language = ?)")
+            params.append(language)
+        if price_tier is not None:
+            clauses.append("price_tier = ?")
+            params.append(price_tier)
+        if ideal_for is not None:
+            clauses.append("id IN (SELECT agent_id FROM agent_ideal_for WHERE ideal_for = ?)")
+            params.append(ideal_for)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(f"SELECT id FROM agents {where} ORDER BY row", params)]
+
+    @classmethod
+    def write(cls, agents: Sequence[AgentRecord], path: str, checksum: str):
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(cls.SCHEMA)
+            conn.execute("INSERT INTO metadata VALUES ('checksum', ?)", (checksum,))
+            conn.executemany(
+                "INSERT INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (row, agent.id, agent.name, agent.description,
+                     *[json.dumps(list(getattr(agent, field))) for field in cls.LIST_FIELDS],
+                     int(agent.collaboration), int(agent.deployment), agent.learning_curve, agent.price_tier,
+                     json.dumps(list(agent._detail_keys)), agent._details)
+                    for row, agent in enumerate(agents)
+                ]
+            )
+            conn.executemany("INSERT INTO agent_languages VALUES (?, ?)",
+                             [(lang, agent.id) for agent in agents for lang in agent.supported_languages])
+            conn.executemany("INSERT INTO agent_ideal_for VALUES (?, ?)",
+                             [(value, agent.id) for agent in agents for value in agent.ideal_for])
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+
+
+class _MappedAgents(Sequence):
+    """Agent records decoded on demand from a memory-mapped snapshot"""
+
+    def __init__(self, buffer: mmap.mmap, offsets: np.ndarray):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return pickle.loads(self._buffer[start:end])
+
+
+class _MappedIndex(Mapping):
+    """id -> record lookup over _MappedAgents"""
+
+    def __init__(self, agents: _MappedAgents, rows: Dict[str, int]):
+        self._agents = agents
+        self._rows = rows
+
+    def __getitem__(self, agent_id: str) -> AgentRecord:
+        return self._agents[self._rows[agent_id]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class MmapCatalogStore(CatalogStore):
+    """Binary catalog snapshot read through mmap.
+
+    The file holds the precomputed AgentCatalog arrays and the pickled
+    records. Arrays are used as read-only NumPy views over the mapping and
+    records are only unpickled when accessed, so gunicorn workers that open
+    the same file share its pages through the OS page cache instead of each
+    keeping a private copy of the catalog.
+
+    Layout: MAGIC, a little-endian uint64 header length, a JSON header, then
+    8-byte aligned array and record sections addressed by absolute offsets,
+    then any named opaque sections (see precompiled_snapshot).
+    """
+
+    MAGIC = b'AGENTCAT'
+    FORMAT_VERSION = 1
+    ALIGNMENT = 8
+
+    def load(self) -> LoadedCatalog:
+        return self._load_mapped(*self._map())
+
+    def _map(self) -> Tuple[mmap.mmap, Dict[str, Any]]:
+        """Map the file and parse its header"""
+        with open(self.path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f"{self.path} is not an agent catalog snapshot")
+        (header_length,) = struct.unpack_from('<Q', buffer, len(self.MAGIC))
+        header_start = len(self.MAGIC) + 8
+        header = json.loads(buffer[header_start:header_start + header_length])
+        if header['format_version'] != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {header['format_version']}")
+        return buffer, header
+
+    @staticmethod
+    def _section(buffer: mmap.mmap, header: Dict[str, Any], name: str) -> bytes:
+        spec = header.get('sections', {}).get(name)
+        if spec is None:
+            raise ValueError(f"Snapshot has no {name} section")
+        return buffer[spec['offset']:spec['offset'] + spec['length']]
+
+    def _load_mapped(self, buffer: mmap.mmap, header: Dict[str, Any]) -> LoadedCatalog:
+        arrays = {
+            name: np.frombuffer(buffer, dtype=spec['dtype'], count=int(np.prod(spec['shape'])),
+                                offset=spec['offset']).reshape(spec['shape'])
+            for name, spec in header['arrays'].items()
+        }
+        ids = header['ids']
+        catalog = AgentCatalog.from_arrays(ids, header['vocabularies'], arrays)
+        agents = _MappedAgents(buffer, arrays['record_offsets'])
+        if len(set(ids)) != len(ids):
+            raise ValueError('Catalog contains duplicate agent IDs')
+        return LoadedCatalog(agents=agents, index=_MappedIndex(agents, catalog._rows),
+                             checksum=header['checksum'], catalog=catalog)
+
+    @classmethod
+    def write(cls, agents: Sequence[AgentRecord], path: str, checksum: str, catalog: AgentCatalog = None,
+              sections: Dict[str, bytes] = None, metadata: Dict[str, Any] = None):
+        vocabularies, arrays = (catalog or AgentCatalog(agents)).to_arrays()
+        records = [pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL) for agent in agents]
+        sections = sections or {}
+
+        # Lay out every section first so the header can carry absolute offsets
+        header = {
+            'format_version': cls.FORMAT_VERSION,
+            'checksum': checksum,
+            'ids': [agent.id for agent in agents],
+            'vocabularies': vocabularies,
+            'arrays': {},
+            'sections': {},
+            'metadata': metadata or {}
+        }
+        record_offsets = np.zeros(len(records) + 1, dtype='<u8')
+        arrays['record_offsets'] = record_offsets
+
+        def layout(data_start: int) -> int:
+            position = data_start
+            for name, array in arrays.items():
+                position = cls._align(position)
+                header['arrays'][name] = {'offset': position, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+                position += array.nbytes
+            for row, record in enumerate(records):
+                record_offsets[row] = position
+                position += len(record)
+            record_offsets[len(records)] = position
+            for name, section in sections.items():
+                position = cls._align(position)
+                header['sections'][name] = {'offset': position, 'length': len(section)}
+                position += len(section)
+            return position
+
+        # The header length depends on the offsets it contains; iterate until stable
+        header_bytes = b''
+        while True:
+            data_start = cls._align(len(cls.MAGIC) + 8 + len(header_bytes))
+            layout(data_start)
+            encoded = json.dumps(header).encode('utf-8')
+            if cls._align(len(cls.MAGIC) + 8 + len(encoded)) == data_start:
+                header_bytes = encoded
+                break
+            header_bytes = encoded
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.write(b'\0' * (header['arrays'][name]['offset'] - f.tell()))
+                f.write(np.ascontiguousarray(array).tobytes())
+            for record in records:
+                f.write(record)
+            for name, section in sections.items():
+                f.write(b'\0' * (header['sections'][name]['offset'] - f.tell()))
+                f.write(section)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _align(cls, position: int) -> int:
+        return -(-position // cls.ALIGNMENT) * cls.ALIGNMENT
+
+
+# File extension -> storage backend
+STORES = {
+    '.json': JsonCatalogStore,
+    '.db': SqliteCatalogStore,
+    '.sqlite': SqliteCatalogStore,
+    '.bin': MmapCatalogStore
+}
+
+
+def open_store(path: str) -> CatalogStore:
+    """Pick the storage backend for ``path`` from its extension (JSON by default)"""
+    extension = os.path.splitext(path)[1].lower()
+    return STORES.get(extension, JsonCatalogStore)(path)
+
+
+def convert(source_path: str, output_path: str) -> Tuple[int, str]:
+    """Convert a catalog between formats, keeping the source checksum"""
+    loaded = open_store(source_path).load()
+    agents = list(loaded.agents)
+    open_store(output_path).write(agents, output_path, loaded.checksum)
+    return len(agents), loaded.checksum
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Convert an agent catalog between storage formats '
+                    '(.json, .db/.sqlite for SQLite, .bin for the memory-mapped snapshot).'
+    )
+    parser.add_argument('source', help='Catalog to read, e.g. agents_db.json')
+    parser.add_argument('outputs', nargs='+', help='Catalog files to write, e.g. agents.db agents.bin')
+    args = parser.parse_args(argv)
+
+    for output in args.outputs:
+        count, checksum = convert(args.source, output)
+        print(f"Wrote {count} agents to {output} ({type(open_store(output)).__name__}, source sha256 {checksum[:12]})")
+
+
+if __name__ == '__main__':
+    main()
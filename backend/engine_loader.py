@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How the engine is initialized: before the app is returned, on a background thread, or on first use
+INIT_MODES = ('eager', 'background', 'lazy')
+
+
+class EngineLoader:
+    """Builds the recommendation engine once and reports how far along it is.
+
+    ``eager`` builds it in ``start`` (the app factory blocks until it is
+    ready), ``background`` builds it on a thread so the server can answer
+    liveness and readiness checks meanwhile, and ``lazy`` builds it on the
+    first ``get``, with concurrent callers waiting for that one build.
+
+    A build that raises leaves the loader in the ``failed`` state with the
+    error recorded; it is not retried, so the process reports itself
+    unhealthy instead of silently serving without an engine.
+    """
+
+    def __init__(self, build: Callable[[], Any], mode: str = 'eager', on_ready: Callable[[Any], None] = None,
+                 engine=None):
+        if mode not in INIT_MODES:
+            raise ValueError(f"Unknown engine init mode: {mode}")
+        self.build = build
+        self.mode = mode
+        self.on_ready = on_ready
+        self.engine = None
+        self.state = 'pending'
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        if engine is not None:  # built by the caller
+            self.engine = engine
+            self.state = 'ready'
+
+    def start(self):
+        if self.state != 'pending':
+            return
+        if self.mode == 'eager':
+            self._load()
+        elif self.mode == 'background':
+            self.state = 'loading'
+            self._thread = threading.Thread(target=self._load, name='engine-loader', daemon=True)
+            self._thread.start()
+
+    def get(self):
+        """The engine, or None while it is loading in the background or if it failed"""
+        if self.engine is None and self.mode == 'lazy' and self.state != 'failed':
+            self._load()
+        return self.engine
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until a background build finishes; True if the engine is ready"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.engine is not None
+
+    def _load(self):
+        with self._lock:
+            if self.state in ('ready', 'failed'):
+                return
+            self.state = 'loading'
+            self.started_at = time.time()
+            started = time.perf_counter()
+            try:
+                engine = self.build()
+                if self.on_ready is not None:
+                    self.on_ready(engine)
+            except Exception as e:
+                self.load_seconds = time.perf_counter() - started
+                self.error = f"{type(e).__name__}: {e}"
+                self.state = 'failed'
+                logger.error(f"Failed to initialize recommendation engine: {self.error}")
+                return
+            self.engine = engine
+            self.load_seconds = time.perf_counter() - started
+            self.state = 'ready'
+            logger.info(f"Recommendation engine ready in {self.load_seconds:.3f}s")
+
+    @property
+    def serving(self) -> bool:
+        """Whether requests can be sent here now: the engine is ready, or lazy and not yet built"""
+        return self.state == 'ready' or (self.mode == 'lazy' and self.state == 'pending')
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.engine.snapshot if self.engine is not None else None
+        return {
+            'state': self.state,
+            'mode': self.mode,
+            'error': self.error,
+            'started_at': self.started_at,
+            'load_seconds': round(self.load_seconds, 6) if self.load_seconds is not None else None,
+            'catalog_version': snapshot.version if snapshot is not None else None,
+            'store': snapshot.store if snapshot is not None else None
+        }
@@ -0,0 +1,22 @@
+"""Gunicorn configuration for the production API server.
+
+Run from the backend directory with ``gunicorn`` (this file is picked up
+automatically). Every value comes from Settings, so the same environment
+variables configure gunicorn, the ASGI entry point and ``python app.py``.
+"""
+from settings import Settings
+
+settings = Settings.from_env()
+
+# Each worker imports the app factory itself, so the engine (and its catalog
+# reload thread) is built once per worker rather than inherited across fork
+wsgi_app = 'app:create_app()'
+preload_app = False
+
+bind = f'{settings.host}:{settings.port}'
+workers = settings.workers
+worker_class = 'gthread'
+threads = settings.threads
+timeout = settings.worker_timeout
+graceful_timeout = settings.worker_timeout
+accesslog = '-'
@@ -0,0 +1,89 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from agent_catalog import AgentCatalog
+from scoring_rules import table_keys
+
+
+class InvertedIndex:
+    """Inverted indexes from task attributes to the agents they can boost.
+
+    For every scoring criterion an agent either sits at the criterion's floor
+    (the lowest value any agent can get for it) or appears in a posting list:
+    language -> agents supporting it, requirement -> agents with the matching
+    feature flag, and task type / complexity / context -> agents whose
+    precomputed score for that value is above the floor. An agent that is in
+    none of a task's posting lists therefore scores exactly the floor total,
+    and for the others the postings give a cheap upper bound, which is what
+    candidate pruning in RecommendationEngine.rank_agents relies on.
+    """
+
+    def __init__(self, catalog: AgentCatalog, plan):
+        """Index ``catalog`` for one compiled rule set (a scoring_rules.ScoringPlan)"""
+        self.size = catalog.size
+        self.plan = plan
+        self.postings: Dict[Tuple[str, str], np.ndarray] = {}
+        self._gains: Dict[Tuple[str, str], np.ndarray] = {}
+        self._floors: Dict[Tuple[str, str], float] = {}
+
+        languages = catalog.matrix('languages_lower')
+        for column, language in enumerate(catalog.values('languages_lower')):
+            self.postings['language', language] = np.flatnonzero(languages[:, column])
+
+        # Table scores are already weighted
+        for name, table in plan.tables.items():
+            for key, scaled in table.items():
+                floor = scaled.min() if self.size else 0.0
+                self.postings[name, key] = np.flatnonzero(scaled > floor)
+                self._gains[name, key] = scaled - floor
+                self._floors[name, key] = floor
+
+        for row, requirement in enumerate(plan.requirement_names):
+            self.postings['requirement', requirement] = np.flatnonzero(plan.requirements[row])
+
+    def bounds(self, task_analysis) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate rows (sorted) for a task and an upper bound on each candidate's score.
+
+        Rows not returned all score exactly the same floor total.
+        """
+        floor = 0.0
+        parts: List[Tuple[np.ndarray, object]] = []
+        # Criteria that depend on how many of a task's posting lists an agent is in
+        counted: List[Tuple[List[np.ndarray], float, float]] = []
+
+        weights = self.plan.weights
+        if task_analysis.languages:
+            required_langs = set(lang.lower() for lang in task_analysis.languages)
+            postings = [self.postings['language', lang] for lang in required_langs if ('language', lang) in self.postings]
+            counted.append((postings, len(required_langs), weights['language_support']))
+        else:
+            floor += self.plan.no_language_score
+
+        for name, key in zip(self.plan.tables, table_keys(task_analysis)):
+            if (name, key) in self.postings:
+                rows = self.postings[name, key]
+                floor += self._floors[name, key]
+                parts.append((rows, self._gains[name, key][rows]))
+            else:
+                floor += self.plan.defaults[name]
+
+        postings = [self.postings['requirement', req] for req in task_analysis.requirements
+                    if ('requirement', req) in self.postings]
+        counted.append((postings, len(task_analysis.requirements) or 1, weights['feature_match']))
+
+        upper_bounds = np.full(self.size, floor)
+        is_candidate = np.zeros(self.size, dtype=bool)
+        for rows, gain in parts:
+            upper_bounds[rows] += gain
+            is_candidate[rows] = True
+        for postings, total, weight in counted:
+            if postings:
+                rows = np.concatenate(postings)
+                counts = np.bincount(rows, minlength=self.size)
+                upper_bounds += np.minimum(counts / total, 1.0) * weight
+                is_candidate[rows] = True
+
+        candidates = np.flatnonzero(is_candidate)
+        # The epsilon keeps the bound safe against float rounding in the exact sum
+        return candidates, upper_bounds[candidates] + 1e-9
@@ -0,0 +1,151 @@
+import re
+from typing import Iterable, Set
+
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _is_word_char(char: str) -> bool:
+    return _WORD_CHAR.match(char) is not None
+
+
+def _has_space(keyword: str) -> bool:
+    return any(char.isspace() for char in keyword)
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher compiled from a fixed vocabulary.
+
+    A keyword without whitespace never spans whitespace, so it occurs in a
+    text exactly when it occurs in the text's distinct whitespace-separated
+    tokens joined by single spaces. Long descriptions repeat most of their
+    words, so the matcher splits the text once and looks for each keyword
+    in that much shorter string with ``str.find``, CPython's fast substring
+    search; keywords with whitespace ('side project') are looked for in the
+    text itself. The split is one pass over the text and the searches cover
+    only its vocabulary, so repeated words cost almost nothing. Texts under
+    SHORT_TEXT_LENGTH are searched directly, which is quicker than splitting
+    them.
+
+    With ``word_boundaries=False`` the result is identical to testing
+    ``keyword in text`` for every keyword. With ``word_boundaries=True`` a
+    keyword only matches at the start of a word, and keywords of three
+    characters or fewer ('go', 'py', 'ts', 'ml', ...) must also end at a word
+    boundary, which removes hits such as 'go' in "good" or 'ts' in "requests"
+    while still letting 'deploy' match "deployment". Keywords with boundary
+    rules are compiled into regular expressions that search for the keyword
+    as a literal and check the boundaries around each hit.
+    """
+
+    SHORT_KEYWORD_LENGTH = 3
+    SHORT_TEXT_LENGTH = 1024
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = False):
+        self.word_boundaries = word_boundaries
+        self.keywords = sorted(set(keywords), key=lambda k: (-len(k), k))
+        self.max_length = len(self.keywords[0]) if self.keywords else 0
+        # Keywords without boundary rules are plain substring tests; the others get a compiled search.
+        # Both are kept for all keywords, for keywords without whitespace and for those with it.
+        self._plain = {'all': [], 'words': [], 'phrases': []}
+        self._bounded = {'all': [], 'words': [], 'phrases': []}
+        for keyword in self.keywords:
+            pattern = re.escape(keyword)
+            # Checked after the keyword, so the regex engine can look for it as a literal prefix
+            if self._needs_left_boundary(keyword):
+                pattern += r'(?<!\w' + '.' * len(keyword) + ')'
+            if self._needs_right_boundary(keyword):
+                pattern += r'(?!\w)'
+            group = 'phrases' if _has_space(keyword) else 'words'
+            if pattern == re.escape(keyword):
+                self._plain['all'].append(keyword)
+                self._plain[group].append(keyword)
+            else:
+                compiled = re.compile(pattern, re.DOTALL)
+                self._bounded['all'].append((keyword, compiled))
+                self._bounded[group].append((keyword, compiled))
+
+    def _needs_left_boundary(self, keyword: str) -> bool:
+        return self.word_boundaries and _is_word_char(keyword[0])
+
+    def _needs_right_boundary(self, keyword: str) -> bool:
+        return (self.word_boundaries
+                and len(keyword) <= self.SHORT_KEYWORD_LENGTH
+                and _is_word_char(keyword[-1]))
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of vocabulary keywords present in ``text``"""
+        found = set()
+        self.scan(text, 0, len(text), found)
+        return found
+
+    def scan(self, text: str, start: int, stop: int, found: Set[str]):
+        """Add keywords whose hit starts in ``text[start:stop]`` to ``found``.
+
+        Characters outside the range still serve as context for the boundary
+        checks and for hits that run past ``stop``.
+        """
+        if stop - start < self.SHORT_TEXT_LENGTH:
+            self._search(text, start, stop, 'all', found)
+            return
+        segment = text[start:stop]
+        tokens = segment.split()
+        # Tokens cut by the range are searched in place, with the text around them as context
+        if tokens and start > 0 and not segment[0].isspace() and not text[start - 1].isspace():
+            self._search(text, start, start + len(tokens.pop(0)), 'words', found)
+        if tokens and stop < len(text) and not segment[-1].isspace() and not text[stop].isspace():
+            self._search(text, stop - len(tokens.pop()), stop, 'words', found)
+        distinct = ' '.join(set(tokens))
+        self._search(distinct, 0, len(distinct), 'words', found)
+        self._search(text, start, stop, 'phrases', found)
+
+    def _search(self, text: str, start: int, stop: int, group: str, found: Set[str]):
+        """Add the keywords of ``group`` that have a hit starting in ``text[start:stop]`` to ``found``"""
+        if start == 0 and stop == len(text):
+            found.update([keyword for keyword in self._plain[group] if keyword in text])
+            found.update([keyword for keyword, pattern in self._bounded[group]
+                          if keyword in text and pattern.search(text)])
+            return
+        # A hit starting before ``stop`` ends before stop + len(keyword), and the character
+        # checked after it is before that position too
+        found.update([keyword for keyword in self._plain[group]
+                      if text.find(keyword, start, stop + len(keyword) - 1) != -1])
+        for keyword, pattern in self._bounded[group]:
+            if text.find(keyword, start, stop + len(keyword) - 1) != -1:
+                match = pattern.search(text, start, stop + len(keyword))
+                if match is not None and match.start() < stop:
+                    found.add(keyword)
+
+
+class StreamScanner:
+    """Incremental ``KeywordMatcher.find`` over text that arrives in chunks.
+
+    A hit is only resolved once the text after its start is long enough to
+    hold the longest keyword plus the character after it, so the result is
+    the same as scanning the concatenated text in one go. Only that short
+    unresolved tail is kept between chunks.
+    """
+
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.found: Set[str] = set()
+        self._overlap = matcher.max_length + 1
+        self._tail = ''
+        self._start = 0
+
+    def feed(self, text: str):
+        buffer = self._tail + text
+        stop = len(buffer) - self._overlap
+        if stop <= self._start:
+            self._tail = buffer
+            return
+        self.matcher.scan(buffer, self._start, stop, self.found)
+        # Keep one resolved character as look-behind context for the next chunk
+        self._tail = buffer[stop - 1:]
+        self._start = 1
+
+    def close(self) -> Set[str]:
+        """Resolve the remaining tail; returns every keyword found"""
+        self.matcher.scan(self._tail, self._start, len(self._tail), self.found)
+        self._tail = ''
+        self._start = 0
+        return self.found
@@ -0,0 +1,255 @@
+import cProfile
+import itertools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from sub-millisecond stages up to slow batch requests
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (metric name, type, help, [(labels, value)]) as produced by a collector
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, labels: Tuple[str, ...] = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(dict(zip(self.labelnames, labels)))} '
+                             f'{_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bucket] += 1
+            series[1] += value
+
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**label_dict, 'le': _format_value(float(bound))})
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(label_dict)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(label_dict)} {cumulative}')
+        return lines
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+        return False
+
+
+class Metrics:
+    """In-process metrics registry rendered in the Prometheus text format.
+
+    Hot-path hooks (``time`` and ``count_scored``) check ``enabled`` first;
+    a disabled registry hands out a shared no-op timer, so instrumented code
+    costs one attribute check per stage. Values that already live elsewhere,
+    such as cache statistics, are read by collectors only when ``render`` is
+    called. Each process keeps its own registry.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List = []
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self.stage_seconds = self.histogram(
+            'engine_stage_seconds', 'Time spent in each request processing stage', ('stage',))
+        self.request_seconds = self.histogram(
+            'http_request_duration_seconds', 'HTTP request latency by endpoint',
+            ('endpoint', 'method', 'status'))
+        self.agents_scored = self.counter(
+            'engine_agents_scored_total', 'Agents scored while ranking tasks')
+        self.rule_set_requests = self.counter(
+            'engine_rule_set_requests_total', 'Requests scored with each scoring rule set', ('rule_set',))
+        self.semantic_fallbacks = self.counter(
+            'engine_semantic_fallbacks_total', 'Semantic requests answered with rule scoring to meet the latency budget')
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, name: str, collector: Callable[[], Iterable[Family]]):
+        """Register a callable that yields metric families at render time.
+
+        A collector registered again under the same ``name`` replaces the
+        previous one, so building several apps on one registry (tests, or
+        the WSGI and ASGI entry points) does not render a family twice.
+        """
+        self._collectors[name] = collector
+
+    def time(self, stage: str):
+        """Context manager recording the duration of one engine stage"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.stage_seconds, (stage,))
+
+    def count_scored(self, agents: int):
+        if self.enabled:
+            self.agents_scored.inc(agents)
+
+    def count_rule_set(self, rule_set: str):
+        if self.enabled:
+            self.rule_set_requests.inc(1, (rule_set,))
+
+    def count_semantic_fallback(self):
+        if self.enabled:
+            self.semantic_fallbacks.inc()
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float):
+        if self.enabled:
+            self.request_seconds.observe(seconds, (endpoint, method, str(status)))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in list(self._collectors.values()):
+            for name, kind, help, samples in collector():
+                lines.append(f'# HELP {name} {help}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """Profiles one request in every ``every`` with cProfile.
+
+    Stats are written to ``output_dir`` as ``.prof`` files that can be read
+    with ``python -m pstats`` or snakeviz. Only one request is profiled at a
+    time; a sampled request that arrives while another is being profiled is
+    skipped.
+    """
+
+    def __init__(self, every: int, output_dir: str):
+        if every < 1:
+            raise ValueError('Profiler sampling interval must be at least 1')
+        self.every = every
+        self.output_dir = output_dir
+        self._requests = itertools.count(1)
+        self._active = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Start profiling if this request is sampled; returns the running profiler"""
+        if next(self._requests) % self.every:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+        except Exception:
+            self._active.release()
+            raise
+        return profile
+
+    def stop(self, profile: cProfile.Profile, name: str) -> str:
+        """Stop ``profile`` and dump its stats; returns the file path"""
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name).strip('_') or 'request'
+        path = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+                                             f"{time.perf_counter_ns()}-{safe_name}.prof")
+        profile.dump_stats(path)
+        return path
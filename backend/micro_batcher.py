@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Batch:
+    """Distinct requests collected during one window, all for the same rule set"""
+
+    __slots__ = ('rule_set', 'items', 'full')
+
+    def __init__(self, rule_set: str):
+        self.rule_set = rule_set
+        self.items: List[Tuple[tuple, str, int, frozenset, Future]] = []
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """Coalesces concurrent recommendation requests in front of the engine.
+
+    Identical requests (same normalized description, top_n, include and
+    rule set) that arrive while one is in flight share its result. Distinct
+    requests that arrive within ``window`` seconds of the first one of a
+    batch are answered together by ``engine.get_recommendations_many``, so
+    a burst is analyzed and scored as one task x agent computation. A batch
+    is dispatched early once it holds ``max_batch_size`` requests.
+
+    The first request of a batch waits out the window on its own thread
+    (only when other requests are in flight; a lone request on an idle
+    server is dispatched at once) and then hands the batch to a pool of
+    ``workers`` threads. Every request, including that first one, waits for
+    its result for at most its own timeout. A timed-out request stops
+    waiting, but the batch still runs to completion for the others.
+    """
+
+    def __init__(self, engine, window: float = 0.002, max_batch_size: int = 64, workers: int = 2):
+        if max_batch_size < 1:
+            raise ValueError('Micro-batch size must be at least 1')
+        self.engine = engine
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._executor = ThreadPoolExecutor(max(workers, 1), thread_name_prefix='micro-batch')
+        self._lock = threading.Lock()
+        self._in_flight: Dict[tuple, Future] = {}
+        self._open: Dict[str, _Batch] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_requests = 0
+
+    def recommend(self, task_description: str, top_n: int = 3, include=None, rule_set: str = None,
+                  timeout: Optional[float] = None) -> Dict:
+        """Recommendations for one request, shared or batched with concurrent ones.
+
+        Raises concurrent.futures.TimeoutError if no result is ready within
+        ``timeout`` seconds, and whatever the engine raised otherwise.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        include = self.engine.resolve_include(include)
+        rule_set = self.engine.snapshot.plan(rule_set).name
+        key = (self.engine._cache_key(task_description), top_n, include, rule_set)
+
+        leader = None
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = self._in_flight[key] = Future()
+                batch = self._open.get(rule_set)
+                if batch is None:
+                    batch = leader = self._open[rule_set] = _Batch(rule_set)
+                    if len(self._in_flight) == 1:
+                        batch.full.set()  # nothing else in flight, so nothing to wait for
+                batch.items.append((key, task_description, top_n, include, future))
+                if len(batch.items) >= self.max_batch_size:
+                    del self._open[rule_set]
+                    batch.full.set()
+
+        if leader is not None:
+            # Collect more requests until the window closes or the batch fills up
+            leader.full.wait(self.window)
+            with self._lock:
+                if self._open.get(rule_set) is leader:
+                    del self._open[rule_set]
+            self._executor.submit(self._run, leader)
+
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        return future.result(remaining)
+
+    def _run(self, batch: _Batch):
+        results, error = None, None
+        try:
+            results = self.engine.get_recommendations_many(
+                [(description, top_n, include) for _, description, top_n, include, _ in batch.items],
+                batch.rule_set)
+        except BaseException as e:
+            error = e
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += len(batch.items)
+            for key, *_ in batch.items:
+                del self._in_flight[key]
+        for position, (*_, future) in enumerate(batch.items):
+            if results is None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[position])
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'window_ms': self.window * 1000,
+                'max_batch_size': self.max_batch_size,
+                'in_flight': len(self._in_flight),
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'batches': self.batches,
+                'batched_requests': self.batched_requests
+            }
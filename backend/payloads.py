@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+def _unserializable(value):
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# json.dumps builds a new encoder on every call; reuse one C encoder instead
+# (c_make_encoder is None on interpreters without the _json accelerator)
+_c_encoder = json.encoder.c_make_encoder and json.encoder.c_make_encoder(
+    None, _unserializable, json.encoder.encode_basestring, None, ':', ',', False, False, True)
+_py_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), check_circular=False)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    if _c_encoder is not None:
+        return ''.join(_c_encoder(value, 0)).encode('utf-8')
+    return _py_encoder.encode(value).encode('utf-8')
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """A serialized response body with its ETag; the gzip variant is built on first use"""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, value: Any) -> 'CachedBody':
+        body = dumps(value)
+        return cls(body, hashlib.blake2b(body, digest_size=16).hexdigest())
+
+    @property
+    def gzipped(self) -> Optional[bytes]:
+        """Compressed body, or None when the body is too small to bother"""
+        if len(self.body) < GZIP_MIN_BYTES:
+            return None
+        compressed = self.__dict__.get('_gzipped')
+        if compressed is None:
+            compressed = gzip.compress(self.body, compresslevel=6, mtime=0)
+            object.__setattr__(self, '_gzipped', compressed)
+        return compressed
+
+
+class CatalogPayloads:
+    """Response bodies of one catalog version, serialized on first use.
+
+    The catalog endpoints only change when the catalog does, so each body
+    (and its ETag and gzip variant) is built once per version and every
+    later request just writes out the same bytes.
+    """
+
+    def __init__(self, agents: Sequence, index: Dict):
+        self.agents = agents
+        self.index = index
+        self._agents_body: Optional[CachedBody] = None
+        self._agent_bodies: Dict[str, CachedBody] = {}
+        self._lock = threading.Lock()
+
+    def agents_body(self) -> CachedBody:
+        """Body of GET /api/agents"""
+        if self._agents_body is None:
+            with self._lock:
+                if self._agents_body is None:
+                    agents = [agent.to_dict() for agent in self.agents]
+                    self._agents_body = CachedBody.of({
+                        'success': True,
+                        'agents': agents,
+                        'total_count': len(agents)
+                    })
+        return self._agents_body
+
+    def agent_body(self, agent_id: str) -> Optional[CachedBody]:
+        """Body of GET /api/agents/<agent_id>, or None for an unknown agent"""
+        cached = self._agent_bodies.get(agent_id)
+        if cached is None:
+            agent = self.index.get(agent_id)
+            if agent is None:
+                return None
+            cached = self._agent_bodies[agent_id] = CachedBody.of({'success': True, 'agent': agent.to_dict()})
+        return cached
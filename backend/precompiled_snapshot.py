@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from catalog_store import LoadedCatalog, MmapCatalogStore
+
+FORMAT_VERSION = 1
+# Modules whose objects are pickled into a snapshot (or that compile them); editing any of them
+# changes the code fingerprint, so snapshots built by older code are rejected instead of unpickled
+COMPILED_MODULES = ('agent_catalog', 'catalog_store', 'inverted_index', 'scoring_rules', 'semantic_index',
+                    'precompiled_snapshot')
+
+
+class StaleSnapshotError(ValueError):
+    """A precompiled snapshot that does not match the source catalog, the scoring rules or the code"""
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_fingerprint() -> str:
+    """Hash of the modules in COMPILED_MODULES"""
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode('ascii'))
+    for name in COMPILED_MODULES:
+        __import__(name)
+        with open(sys.modules[name].__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class PrecompiledStore(MmapCatalogStore):
+    """Everything an engine builds at startup, precompiled by a build step.
+
+    A memory-mapped catalog snapshot (see MmapCatalogStore) that also holds
+    the compiled scoring plans of every rule set and, if built with
+    semantic mode, the agent embeddings. Loading it skips JSON parsing,
+    record building, column building, rule compilation and embedding.
+
+    The snapshot records the sha256 of the source catalog file and of the
+    scoring rules file, and a fingerprint of the code that compiled it.
+    ``load`` recomputes the first two and rejects the snapshot with
+    StaleSnapshotError if anything differs, so a stale build never serves
+    results that the source catalog would not.
+    """
+
+    def __init__(self, path: str, source_path: str, rules_path: str):
+        super().__init__(path)
+        self.source_path = source_path
+        self.rules_path = rules_path
+
+    def load(self) -> LoadedCatalog:
+        buffer, header = self._map()
+        self.validate(header.get('metadata', {}).get('precompiled'))
+        loaded = self._load_mapped(buffer, header)
+        compiled = pickle.loads(self._section(buffer, header, 'compiled'))
+        return replace(loaded, plans=compiled['plans'], semantic=compiled['semantic'])
+
+    def validate(self, metadata: Optional[Dict[str, Any]]):
+        if metadata is None:
+            raise StaleSnapshotError(f"{self.path} is not a precompiled snapshot")
+        if metadata['format_version'] != FORMAT_VERSION:
+            raise StaleSnapshotError(f"Unsupported precompiled snapshot version {metadata['format_version']}")
+        if metadata['code_fingerprint'] != code_fingerprint():
+            raise StaleSnapshotError('Snapshot was built by a different version of the engine')
+        if metadata['source_sha256'] != file_sha256(self.source_path):
+            raise StaleSnapshotError(f"Snapshot does not match {self.source_path}")
+        if metadata['rules_sha256'] != file_sha256(self.rules_path):
+            raise StaleSnapshotError(f"Snapshot does not match {self.rules_path}")
+
+    @classmethod
+    def write_engine(cls, engine, path: str, source_path: str) -> Dict[str, Any]:
+        """Precompile ``engine``'s live catalog version, loaded from ``source_path``, to ``path``"""
+        snapshot = engine.snapshot
+        compiled = pickle.dumps({'plans': snapshot.plans, 'semantic': snapshot.semantic},
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        metadata = {
+            'format_version': FORMAT_VERSION,
+            'code_fingerprint': code_fingerprint(),
+            'source_sha256': file_sha256(source_path),
+            'rules_sha256': file_sha256(engine.scoring_rules.path),
+            'rule_sets': list(snapshot.plans),
+            'embedding_dim': snapshot.semantic.embedder.dim if snapshot.semantic is not None else None,
+            'built_at': time.time()
+        }
+        cls.write(list(snapshot.agents), path, snapshot.checksum, catalog=snapshot.catalog,
+                  sections={'compiled': compiled}, metadata={'precompiled': metadata})
+        return metadata
+
+
+def build(source_path: str, output_path: str, scoring_rules_path: str = None, semantic: bool = False,
+          embedding_dim: int = 512) -> Dict[str, Any]:
+    """Load ``source_path`` the regular way and write its precompiled snapshot"""
+    from recommendation_engine import RecommendationEngine
+
+    engine = RecommendationEngine(source_path, cache_size=0, scoring_rules_path=scoring_rules_path,
+                                  semantic=semantic, embedding_dim=embedding_dim)
+    return PrecompiledStore.write_engine(engine, output_path, source_path)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Precompile an agent catalog and the scoring rules into a snapshot the API '
+                    'loads at startup (PRECOMPILED_SNAPSHOT_PATH). Rebuild it whenever either file changes.'
+    )
+    parser.add_argument('source', help='Catalog to precompile, e.g. agents_db.json')
+    parser.add_argument('output', help='Snapshot file to write, e.g. agents_db.snapshot')
+    parser.add_argument('--rules', help='Scoring rules file (default: scoring_rules.json next to the engine)')
+    parser.add_argument('--semantic', action='store_true', help='Also precompute agent embeddings for semantic mode')
+    parser.add_argument('--embedding-dim', type=int, default=512)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    metadata = build(args.source, args.output, args.rules, args.semantic, args.embedding_dim)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 2 ** 20:.1f} MB, rule sets "
+          f"{', '.join(metadata['rule_sets'])}, source sha256 {metadata['source_sha256'][:12]}) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,26 @@
+import hashlib
 import json
+import logging
+import os
 import re
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
-from collections import defaultdict
+import time
+from typing import Iterable, List, Dict, Set, Tuple, Iterator, NamedTuple, Optional, Sequence, Union
+from dataclasses import dataclass, replace
+from collections import defaultdict, Counter
+import numpy as np
+from agent_catalog import AgentCatalog, AgentRecord, top_n_indices
+from catalog_snapshot import CatalogSnapshot, CatalogReloader
+from catalog_store import CatalogStore, JsonCatalogStore, LoadedCatalog, open_store
+from keyword_matcher import KeywordMatcher, StreamScanner
+from metrics import Metrics
+from payloads import CatalogPayloads
+from precompiled_snapshot import PrecompiledStore
+from result_cache import ResultCache
+from scoring_rules import DEFAULT_RULES_PATH, ScoringRules, table_keys
+from semantic_index import EmbeddingCache, SemanticIndex
+from task_stream import TaskStreamAnalyzer
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class TaskAnalysis:
@@ -15,11 +33,39 @@ class TaskAnalysis:
     deployment_needed: bool
     learning_focused: bool
 
+class Ranking(NamedTuple):
+    """Top agents for one task: catalog rows best first, their exact scores and breakdowns"""
+    rows: np.ndarray
+    scores: np.ndarray
+    breakdown: Dict[str, np.ndarray]
+    scored: int  # how many agents were actually scored
+
 class RecommendationEngine:
-    def __init__(self, agents_db_path: str = "agents_db.json"):
-        with open(agents_db_path, 'r') as f:
-            self.agents_data = json.load(f)
-        self.agents = self.agents_data['agents']
+    # Catalogs smaller than this are scored exhaustively; pruning only pays off on large ones
+    PRUNING_MIN_AGENTS = 2048
+    PRUNING_BLOCK_SIZE = 256
+    # Most task x agent cells a batch chunk scores as one matrix; larger chunks are split
+    BATCH_SCORE_BUDGET = 1 << 19
+    # Longer descriptions are lowercased and scanned in chunks of this many characters
+    ANALYZE_CHUNK_SIZE = 65536
+    # Semantic mode: how similar (and how much closer than the runner-up) a task type description must
+    # be to assign it when no keyword matched, and how many agents the nearest-neighbour search and
+    # the rule ranking nominate for blending on large catalogs
+    TASK_TYPE_MIN_SIMILARITY = 0.25
+    TASK_TYPE_MIN_MARGIN = 0.05
+    SEMANTIC_CANDIDATES = 1000
+    RULE_CANDIDATES = 100
+    
+    def __init__(self, agents_db_path: str = "agents_db.json", word_boundaries: bool = False,
+                 cache_size: int = 1024, cache_max_bytes: int = None, cache_ttl: float = 300.0,
+                 pruning: bool = True, metrics: Metrics = None, scoring_rules_path: str = None,
+                 semantic: bool = False, semantic_weight: float = 0.3, semantic_budget: float = 0.05,
+                 embedding_dim: int = 512, precompiled_path: str = None):
+        self.pruning = pruning
+        # Stage timers and counters; a disabled registry makes them no-ops
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        # Cache for analyses and recommendations, keyed on the normalized description
+        self.cache = ResultCache(max_entries=cache_size, max_bytes=cache_max_bytes, ttl=cache_ttl)
         
         # Task type keywords mapping
         self.task_keywords = {
@@ -55,54 +101,307 @@ class RecommendationEngine:
             'Swift': ['swift', 'ios'],
             'Kotlin': ['kotlin', 'android']
         }
+        
+        # Requirement keywords, in the order requirements are reported
+        self.requirement_keywords = {
+            'collaboration': ['collaborate', 'team', 'share', 'together'],
+            'deployment': ['deploy', 'production', 'host', 'publish'],
+            'security': ['secure', 'security', 'enterprise', 'compliance'],
+            'budget_conscious': ['free', 'budget', 'cost', 'cheap'],
+            'rapid_development': ['fast', 'quick', 'rapid', 'prototype']
+        }
+        
+        # Context keywords, in order of precedence
+        self.context_keywords = {
+            'learning': ['learn', 'study', 'practice', 'beginner'],
+            'enterprise': ['enterprise', 'company', 'business'],
+            'personal': ['personal', 'hobby', 'side project']
+        }
+        
+        # Task type descriptions matched by similarity in semantic mode, for paraphrases no keyword catches
+        self.task_type_descriptions = {
+            'web_development': 'website or web application, frontend pages and backend server, browser user interface, html css javascript, responsive site',
+            'mobile_development': 'mobile app for phones and tablets, smartphone application, cross-platform iphone and android app, handheld device, app store',
+            'data_science': 'data analysis and statistics, machine learning models, datasets, notebooks, charts, predictions, analytics, neural networks',
+            'cloud_development': 'cloud infrastructure, hosting and servers, containers, serverless functions, scaling, devops, kubernetes, aws azure gcp',
+            'game_development': 'video game, gameplay, 2d and 3d graphics, physics, players and levels, multiplayer, game engine',
+            'api_development': 'api endpoints, rest or graphql web service, microservices, http requests and json responses, integrations',
+            'automation': 'automate repetitive tasks, scripts and bots, scheduled jobs, automated testing, ci/cd pipelines, scraping',
+            'learning': 'learn to program, tutorials and courses, lessons, homework and exercises, student, teaching, education'
+        }
+        
+        self._compile_keyword_matcher(word_boundaries)
+        
+        # Semantic mode: agent texts are embedded once per catalog version, shared across rule reloads
+        self.semantic_weight = semantic_weight
+        self.semantic_budget = semantic_budget
+        self.embedding_dim = embedding_dim
+        self.embeddings = EmbeddingCache(
+            lambda agents: SemanticIndex(agents, self.task_type_descriptions, embedding_dim)) if semantic else None
+        
+        # Declarative scoring rules, compiled against every catalog version as it is installed
+        self.scoring_rules = ScoringRules.load(scoring_rules_path or DEFAULT_RULES_PATH)
+        
+        self._snapshot = None
+        # Start from a precompiled snapshot when one matches the catalog and rules, else build everything
+        if precompiled_path is not None:
+            try:
+                self.load_precompiled(precompiled_path, agents_db_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Not using precompiled snapshot {precompiled_path}: {e}")
+        if self._snapshot is None:
+            self.load_agents_file(agents_db_path)
+        self.reloader = CatalogReloader(self)
+    
+    def load_agents_file(self, path: str) -> CatalogSnapshot:
+        """Load a catalog file and install it as the new catalog version.
+        
+        The storage backend is picked from the file extension (see
+        catalog_store.open_store). The file is fully loaded and indexed
+        before the swap; if anything fails the exception propagates and the
+        live catalog is unchanged.
+        """
+        return self.load_store(open_store(path))
+    
+    def load_store(self, store: CatalogStore) -> CatalogSnapshot:
+        """Load a catalog from a storage backend and install it"""
+        started = time.perf_counter()
+        stat = os.stat(store.path)
+        return self._install(store.load(), started, store=type(store).__name__, source_path=store.path,
+                             source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size)
+    
+    def load_precompiled(self, path: str, source_path: str) -> CatalogSnapshot:
+        """Install a precompiled snapshot of ``source_path`` (see precompiled_snapshot).
+        
+        Raises StaleSnapshotError if the snapshot was built from another
+        version of the catalog, the scoring rules or the engine. The catalog
+        is still watched at ``source_path``, so later edits to it are
+        hot-reloaded the regular way.
+        """
+        started = time.perf_counter()
+        stat = os.stat(source_path)
+        store = PrecompiledStore(path, source_path, self.scoring_rules.path)
+        loaded = store.load()
+        semantic = loaded.semantic
+        if self.embeddings is not None and semantic is not None and semantic.embedder.dim == self.embedding_dim:
+            self.embeddings.put(loaded.checksum, semantic)
+        return self._install(loaded, started, store=type(store).__name__, source_path=source_path,
+                             source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size)
+    
+    def load_agents(self, agents_data: Dict) -> CatalogSnapshot:
+        """Install a new agent catalog from already-parsed data"""
+        raw = json.dumps(agents_data, sort_keys=True).encode('utf-8')
+        agents = tuple(AgentRecord.from_dict(agent) for agent in agents_data['agents'])
+        loaded = LoadedCatalog(agents=agents, index=JsonCatalogStore._validate(agents),
+                               checksum=hashlib.sha256(raw).hexdigest())
+        return self._install(loaded)
+    
+    def load_scoring_rules(self, path: str = None) -> CatalogSnapshot:
+        """Load a scoring rules file and install it, recompiled against the live catalog.
+        
+        The result is a new catalog version, so cached results computed under
+        the old rules are not served. If the file is invalid the exception
+        propagates and the live rules are unchanged.
+        """
+        started = time.perf_counter()
+        rules = ScoringRules.load(path or self.scoring_rules.path)
+        snapshot = self._snapshot
+        loaded = LoadedCatalog(agents=snapshot.agents, index=snapshot.index, checksum=snapshot.checksum,
+                               catalog=snapshot.catalog)
+        return self._install(loaded, started, rules, store=snapshot.store, source_path=snapshot.source_path,
+                             source_mtime_ns=snapshot.source_mtime_ns, source_size=snapshot.source_size)
+    
+    def _install(self, loaded: LoadedCatalog, started: float = None, rules: ScoringRules = None,
+                 **source) -> CatalogSnapshot:
+        """Build every index for a new catalog, then atomically swap it in"""
+        started = started or time.perf_counter()
+        rules = rules or self.scoring_rules
+        catalog = loaded.catalog or AgentCatalog(loaded.agents)
+        snapshot = CatalogSnapshot(
+            agents=loaded.agents,
+            index=loaded.index,
+            catalog=catalog,
+            plans=loaded.plans if loaded.plans is not None else rules.compile(catalog),
+            default_rule_set=rules.default,
+            payloads=CatalogPayloads(loaded.agents, loaded.index),
+            semantic=self.embeddings.get(loaded.checksum, loaded.agents) if self.embeddings else None,
+            version=self._snapshot.version + 1 if self._snapshot else 1,
+            checksum=loaded.checksum,
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - started,
+            **source
+        )
+        self.scoring_rules = rules
+        self._snapshot = snapshot
+        self.cache.clear()
+        return snapshot
+    
+    def start_auto_reload(self, interval: float = 2.0):
+        """Poll the catalog file in the background and hot-swap it when it changes"""
+        self.reloader.interval = interval
+        self.reloader.start()
+    
+    def stop_auto_reload(self):
+        self.reloader.stop()
+    
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current catalog version; hold on to it for a consistent view"""
+        return self._snapshot
+    
+    @property
+    def catalog(self) -> AgentCatalog:
+        return self._snapshot.catalog
+    
+    @property
+    def agents(self) -> Sequence[AgentRecord]:
+        """Read-only view of the catalog, in catalog order"""
+        return self._snapshot.agents
+    
+    @property
+    def agents_data(self) -> Dict:
+        """The catalog as plain dicts, in the agents_db.json layout"""
+        return {'agents': [agent.to_dict() for agent in self._snapshot.agents]}
+    
+    def get_agent(self, agent_id: str) -> Optional[AgentRecord]:
+        """Look up an agent by id in O(1)"""
+        return self._snapshot.index.get(agent_id)
+    
+    def get_agents(self, agent_ids: List[str]) -> List[Optional[AgentRecord]]:
+        """Look up several agents against a single catalog version"""
+        index = self._snapshot.index
+        return [index.get(agent_id) for agent_id in agent_ids]
+    
+    def _compile_keyword_matcher(self, word_boundaries: bool = False):
+        """Compile every keyword table into a single matcher and a keyword -> category index.
+        
+        word_boundaries=False keeps the historical raw substring behaviour
+        ('go' matches "good"); True only accepts whole-word hits for short
+        keywords and word-start hits for the rest.
+        """
+        self._keyword_tables = {
+            'task_type': self.task_keywords,
+            'complexity': self.complexity_indicators,
+            'language': self.language_keywords,
+            'requirement': self.requirement_keywords,
+            'context': self.context_keywords
+        }
+        self._keyword_index = defaultdict(list)
+        # table -> [(category, its distinct keywords)], for deciding when a stream is settled
+        self._category_keywords = {
+            table_name: [(category, frozenset(keywords)) for category, keywords in table.items()]
+            for table_name, table in self._keyword_tables.items()
+        }
+        for table_name, table in self._keyword_tables.items():
+            for category, keywords in table.items():
+                for keyword in keywords:
+                    self._keyword_index[keyword].append((table_name, category))
+        self.keyword_matcher = KeywordMatcher(self._keyword_index, word_boundaries=word_boundaries)
+    
+    @staticmethod
+    def _cache_key(task_description: str) -> str:
+        # Analysis runs on the lowercased text and no keyword has outer whitespace
+        return task_description.strip().lower()
     
     def analyze_task(self, task_description: str) -> TaskAnalysis:
         """Analyze the task description to extract key information"""
-        task_lower = task_description.lower()
+        cache_key = ('analysis', self._cache_key(task_description))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        with self.metrics.time('analyze'):
+            task_analysis = self._analyze_task(task_description)
+        self.cache.put(cache_key, task_analysis)
+        return task_analysis
+    
+    def _analyze_task(self, task_description: str) -> TaskAnalysis:
+        if len(task_description) <= self.ANALYZE_CHUNK_SIZE:
+            return self._analysis_from_keywords(self.keyword_matcher.find(task_description.lower()))
+        
+        # Avoid a lowercased copy of the whole text for very large inputs
+        scanner = StreamScanner(self.keyword_matcher)
+        for start in range(0, len(task_description), self.ANALYZE_CHUNK_SIZE):
+            scanner.feed(task_description[start:start + self.ANALYZE_CHUNK_SIZE].lower())
+        return self._analysis_from_keywords(scanner.close())
+    
+    def analyze_stream(self, chunks: Iterable[Union[str, bytes]], max_bytes: int = None,
+                       early_exit: bool = False) -> TaskAnalysis:
+        """Analyze a description that arrives as str or UTF-8 bytes chunks, in constant memory.
+        
+        Gives the same result as analyze_task on the joined text; see
+        TaskStreamAnalyzer for ``max_bytes`` and ``early_exit``. Results are
+        not cached since the text is never held in full.
+        """
+        analyzer = TaskStreamAnalyzer(self, max_bytes=max_bytes, early_exit=early_exit)
+        with self.metrics.time('analyze_stream'):
+            return analyzer.consume(chunks)
+    
+    def analyze_file(self, file, chunk_size: int = 65536, max_bytes: int = None,
+                     early_exit: bool = False) -> TaskAnalysis:
+        """Analyze a description read from a text or binary file-like object"""
+        def chunks():
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        return self.analyze_stream(chunks(), max_bytes=max_bytes, early_exit=early_exit)
+    
+    def _classification_settled(self, found: Set[str]) -> bool:
+        """True once more text can no longer change the task type, complexity or context"""
+        # Complexity and context take the first category with a hit, so only a hit
+        # on the first category is final
+        for table_name in ('complexity', 'context'):
+            if not found & self._category_keywords[table_name][0][1]:
+                return False
+        
+        # The leading task type is final once no other category could overtake it,
+        # even if every one of its remaining keywords turned up
+        counts = [(len(found & keywords), len(keywords)) for _, keywords in self._category_keywords['task_type']]
+        best = max(count for count, _ in counts)
+        if best == 0:
+            return False
+        leader = next(i for i, (count, _) in enumerate(counts) if count == best)
+        return all(reachable < best or (reachable == best and i > leader)
+                   for i, (_, reachable) in enumerate(counts) if i != leader)
+    
+    def _analysis_from_keywords(self, found: Set[str]) -> TaskAnalysis:
+        """Build the TaskAnalysis for the set of keywords found in a description"""
+        # Count distinct keyword hits per category
+        hits = defaultdict(int)
+        for keyword in found:
+            for table_name, category in self._keyword_index[keyword]:
+                hits[table_name, category] += 1
         
         # Determine task type
         task_type = 'general_programming'
         max_matches = 0
-        for task_cat, keywords in self.task_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in task_lower)
+        for task_cat in self.task_keywords:
+            matches = hits['task_type', task_cat]
             if matches > max_matches:
                 max_matches = matches
                 task_type = task_cat
         
         # Determine complexity
         complexity = 'intermediate'  # default
-        for comp_level, indicators in self.complexity_indicators.items():
-            if any(indicator in task_lower for indicator in indicators):
+        for comp_level in self.complexity_indicators:
+            if hits['complexity', comp_level]:
                 complexity = comp_level
                 break
         
         # Identify programming languages
-        languages = []
-        for lang, keywords in self.language_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                languages.append(lang)
+        languages = [lang for lang in self.language_keywords if hits['language', lang]]
         
         # Check for specific requirements
-        requirements = []
-        if any(word in task_lower for word in ['collaborate', 'team', 'share', 'together']):
-            requirements.append('collaboration')
-        if any(word in task_lower for word in ['deploy', 'production', 'host', 'publish']):
-            requirements.append('deployment')
-        if any(word in task_lower for word in ['secure', 'security', 'enterprise', 'compliance']):
-            requirements.append('security')
-        if any(word in task_lower for word in ['free', 'budget', 'cost', 'cheap']):
-            requirements.append('budget_conscious')
-        if any(word in task_lower for word in ['fast', 'quick', 'rapid', 'prototype']):
-            requirements.append('rapid_development')
+        requirements = [req for req in self.requirement_keywords if hits['requirement', req]]
         
         # Determine context
         context = 'professional'
-        if any(word in task_lower for word in ['learn', 'study', 'practice', 'beginner']):
-            context = 'learning'
-        elif any(word in task_lower for word in ['enterprise', 'company', 'business']):
-            context = 'enterprise'
-        elif any(word in task_lower for word in ['personal', 'hobby', 'side project']):
-            context = 'personal'
+        for context_name in self.context_keywords:
+            if hits['context', context_name]:
+                context = context_name
+                break
         
         return TaskAnalysis(
             task_type=task_type,
@@ -115,88 +414,177 @@ class RecommendationEngine:
             learning_focused=context == 'learning'
         )
     
-    def calculate_agent_score(self, agent: Dict, task_analysis: TaskAnalysis) -> Tuple[float, Dict[str, float]]:
-        """Calculate a score for how well an agent matches the task"""
-        scores = {
-            'language_support': 0.0,
-            'task_alignment': 0.0,
-            'complexity_match': 0.0,
-            'feature_match': 0.0,
-            'context_fit': 0.0
+    def calculate_agent_score(self, agent: Dict, task_analysis: TaskAnalysis,
+                              rule_set: str = None) -> Tuple[float, Dict[str, float]]:
+        """Calculate a score for how well an agent matches the task.
+        
+        Evaluates the rules of ``rule_set`` (the default rule set if None)
+        for one agent; score_agents_batch gives the same scores from the
+        compiled tables.
+        """
+        return self._snapshot.plan(rule_set).rule_set.score_agent(agent, task_analysis)
+    
+    def score_agents_batch(self, task_analyses: List[TaskAnalysis], snapshot: CatalogSnapshot = None,
+                           rows: np.ndarray = None, rule_set: str = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score every agent for every task in one pass.
+        
+        Vectorized equivalent of calculate_agent_score over the whole
+        task x agent matrix: returns a (tasks, agents) array of total scores
+        and the per-criterion breakdown arrays of the same shape. Pass
+        ``rows`` to score only those catalog rows (columns follow ``rows``).
+        The rule set's compiled plan supplies weighted per-agent tables, so
+        most criteria are plain row lookups.
+        """
+        snapshot = snapshot or self._snapshot
+        catalog = snapshot.catalog
+        plan = snapshot.plan(rule_set)
+        weights = plan.weights
+        num_tasks = len(task_analyses)
+        num_agents = catalog.size if rows is None else len(rows)
+        select = (lambda values: values) if rows is None else (lambda values: values[..., rows])
+        
+        # Language support scoring
+        required = np.zeros((num_tasks, catalog.vocabulary_size('languages_lower')))
+        required_counts = np.ones(num_tasks)
+        has_languages = np.zeros(num_tasks, dtype=bool)
+        for row, task_analysis in enumerate(task_analyses):
+            if task_analysis.languages:
+                required_langs = set(lang.lower() for lang in task_analysis.languages)
+                required[row] = catalog.encode('languages_lower', required_langs)
+                required_counts[row] = len(required_langs)
+                has_languages[row] = True
+        language_matrix = catalog.matrix('languages_lower')
+        language_overlap = required @ (language_matrix if rows is None else language_matrix[rows]).T
+        language_support = np.where(
+            has_languages[:, None],
+            np.minimum(language_overlap / required_counts[:, None], 1.0) * weights['language_support'],
+            plan.no_language_score  # Default bonus for good language support
+        )
+        
+        # Task type alignment, complexity match and context fit: one weighted table row per task
+        keys = [table_keys(task_analysis) for task_analysis in task_analyses]
+        
+        def lookup(criterion, position):
+            return np.array([select(plan.table(criterion, task_keys[position]))
+                             for task_keys in keys]).reshape(num_tasks, num_agents)
+        
+        task_alignment = lookup('task_alignment', 0)
+        complexity_match = lookup('complexity_match', 1)
+        context_fit = lookup('context_fit', 2)
+        
+        # Feature requirements match
+        requirement_names = plan.requirement_names
+        requirement_counts = np.zeros((num_tasks, len(requirement_names)))
+        total_requirements = np.ones(num_tasks)
+        for row, task_analysis in enumerate(task_analyses):
+            for req in task_analysis.requirements:
+                if req in requirement_names:
+                    requirement_counts[row, requirement_names.index(req)] += 1
+            total_requirements[row] = len(task_analysis.requirements) or 1
+        feature_score = requirement_counts @ select(plan.requirements)
+        feature_match = np.minimum(feature_score / total_requirements[:, None], 1.0) * weights['feature_match']
+        
+        breakdown = {
+            'language_support': language_support,
+            'task_alignment': task_alignment,
+            'complexity_match': complexity_match,
+            'feature_match': feature_match,
+            'context_fit': context_fit
         }
+        total_scores = language_support + task_alignment + complexity_match + feature_match + context_fit
+        return total_scores, breakdown
+    
+    def score_agents(self, task_analysis: TaskAnalysis, snapshot: CatalogSnapshot = None,
+                     rows: np.ndarray = None, rule_set: str = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score every agent in the catalog (or only ``rows``) for a single task"""
+        total_scores, breakdown = self.score_agents_batch([task_analysis], snapshot, rows, rule_set)
+        return total_scores[0], {k: v[0] for k, v in breakdown.items()}
+    
+    def rank_agents(self, task_analysis: TaskAnalysis, top_n: int, snapshot: CatalogSnapshot = None,
+                    rule_set: str = None) -> Ranking:
+        """Find the top N agents for a task, with the same result as scoring every agent.
         
-        # Language support scoring (25% weight)
-        if task_analysis.languages:
-            supported_langs = set(lang.lower() for lang in agent['supported_languages'])
-            required_langs = set(lang.lower() for lang in task_analysis.languages)
-            language_overlap = len(supported_langs.intersection(required_langs))
-            scores['language_support'] = min(language_overlap / len(required_langs), 1.0) * 0.25
-        else:
-            scores['language_support'] = 0.15  # Default bonus for good language support
-        
-        # Task type alignment (25% weight)
-        task_score = 0.0
-        if task_analysis.task_type == 'web_development':
-            if 'React' in agent['supported_languages'] or 'HTML' in agent['supported_languages']:
-                task_score = 0.8
-        elif task_analysis.task_type == 'cloud_development':
-            if agent['id'] == 'aws_codewhisperer':
-                task_score = 1.0
-            elif agent['deployment']:
-                task_score = 0.6
-        elif task_analysis.task_type == 'learning':
-            if 'educational' in [uc.lower() for uc in agent['use_cases']] or agent['learning_curve'] == 'low':
-                task_score = 0.8
-        elif task_analysis.task_type == 'data_science':
-            if 'Python' in agent['supported_languages']:
-                task_score = 0.7
+        Small catalogs are scored exhaustively. Larger ones go through the
+        inverted index: agents in none of the task's posting lists all share
+        the floor score, so only the earliest top_n of them are scored. Of
+        the candidates, the block with the highest upper bounds is scored
+        first; its Nth best score then rules out every remaining candidate
+        whose upper bound falls below it (MaxScore-style pruning).
+        """
+        snapshot = snapshot or self._snapshot
+        size = snapshot.catalog.size
+        if not self.pruning or size < self.PRUNING_MIN_AGENTS:
+            total_scores, breakdown = self.score_agents(task_analysis, snapshot, rule_set=rule_set)
+            rows = top_n_indices(total_scores, top_n)
+            return Ranking(rows, total_scores[rows], {k: v[rows] for k, v in breakdown.items()}, size)
+        
+        candidates, upper_bounds = snapshot.plan(rule_set).inverted_index.bounds(task_analysis)
+        non_candidates = np.ones(size, dtype=bool)
+        non_candidates[candidates] = False
+        pool = [np.flatnonzero(non_candidates)[:top_n]]
+        pool_scores = [self.score_agents(task_analysis, snapshot, pool[0], rule_set=rule_set)[0]]
+        
+        # Score the candidates with the best bounds first to get a score to beat,
+        # then only the remaining candidates whose bound can still reach it
+        block_size = max(self.PRUNING_BLOCK_SIZE, 4 * top_n)
+        if len(candidates) <= block_size:
+            first = np.arange(len(candidates))
         else:
-            task_score = 0.5  # Default for general programming
-        
-        scores['task_alignment'] = task_score * 0.25
-        
-        # Complexity match (20% weight)
-        complexity_match = 0.5  # default
-        if task_analysis.complexity == 'beginner':
-            if agent['learning_curve'] == 'low' or 'beginners' in agent['ideal_for']:
-                complexity_match = 1.0
-        elif task_analysis.complexity == 'advanced':
-            if 'enterprise' in agent['ideal_for'] or 'experienced_developers' in agent['ideal_for']:
-                complexity_match = 1.0
-        
-        scores['complexity_match'] = complexity_match * 0.20
-        
-        # Feature requirements match (20% weight)
-        feature_score = 0.0
-        total_requirements = len(task_analysis.requirements) or 1
-        
-        for req in task_analysis.requirements:
-            if req == 'collaboration' and agent['collaboration']:
-                feature_score += 1.0
-            elif req == 'deployment' and agent['deployment']:
-                feature_score += 1.0
-            elif req == 'budget_conscious' and agent['price_tier'] == 'free':
-                feature_score += 1.0
-            elif req == 'security' and 'security' in agent['strengths'][0].lower():
-                feature_score += 1.0
-            elif req == 'rapid_development' and ('prototyping' in agent['ideal_for'] or 'zero setup' in agent['strengths'][0].lower()):
-                feature_score += 1.0
-        
-        scores['feature_match'] = min(feature_score / total_requirements, 1.0) * 0.20
-        
-        # Context fit (10% weight)
-        context_score = 0.5  # default
-        if task_analysis.learning_focused and 'students' in agent['ideal_for']:
-            context_score = 1.0
-        elif task_analysis.context == 'enterprise' and 'enterprise' in agent['ideal_for']:
-            context_score = 1.0
-        elif task_analysis.context == 'personal' and agent['price_tier'] in ['free', 'freemium']:
-            context_score = 0.8
+            first = np.argpartition(-upper_bounds, block_size)[:block_size]
+        pool.append(candidates[first])
+        pool_scores.append(self.score_agents(task_analysis, snapshot, candidates[first], rule_set=rule_set)[0])
         
-        scores['context_fit'] = context_score * 0.10
+        if len(first) < len(candidates):
+            # The first block alone holds at least top_n scores
+            scores = np.concatenate(pool_scores)
+            threshold = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+            remaining = np.ones(len(candidates), dtype=bool)
+            remaining[first] = False
+            rows = candidates[remaining & (upper_bounds >= threshold)]
+            pool.append(rows)
+            pool_scores.append(self.score_agents(task_analysis, snapshot, rows, rule_set=rule_set)[0])
         
-        total_score = sum(scores.values())
-        return total_score, scores
+        pool_rows = np.concatenate(pool)
+        pool_scores = np.concatenate(pool_scores)
+        in_catalog_order = np.argsort(pool_rows, kind='stable')
+        pool_rows, pool_scores = pool_rows[in_catalog_order], pool_scores[in_catalog_order]
+        rows = pool_rows[top_n_indices(pool_scores, top_n)]
+        total_scores, breakdown = self.score_agents(task_analysis, snapshot, rows, rule_set=rule_set)
+        return Ranking(rows, total_scores, breakdown, len(pool_rows))
+    
+    def rank_agents_semantic(self, task_analysis: TaskAnalysis, query: np.ndarray, top_n: int,
+                             snapshot: CatalogSnapshot = None, rule_set: str = None,
+                             deadline: float = None) -> Optional[Ranking]:
+        """Find the top N agents by rule score blended with text similarity to the task.
+        
+        The total is (1 - semantic_weight) * rule score + semantic_weight *
+        cosine similarity of the embedded task (``query``) and agent texts.
+        Small catalogs blend every agent. On catalogs with an ANN index only
+        the union of the nearest neighbours and the rule-based top agents is
+        blended, so the result is approximate. Returns None as soon as
+        ``deadline`` (a time.perf_counter() value) has passed.
+        """
+        snapshot = snapshot or self._snapshot
+        index = snapshot.semantic
+        rows = None
+        if index.ann is None:
+            total_scores, breakdown = self.score_agents(task_analysis, snapshot, rule_set=rule_set)
+        else:
+            nearest = index.nearest(query, max(top_n, self.SEMANTIC_CANDIDATES))
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            rule_top = self.rank_agents(task_analysis, max(top_n, self.RULE_CANDIDATES), snapshot, rule_set)
+            rows = np.union1d(nearest, rule_top.rows)
+            total_scores, breakdown = self.score_agents(task_analysis, snapshot, rows, rule_set=rule_set)
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        
+        similarity = index.similarity(query, rows)
+        blended = (1 - self.semantic_weight) * total_scores + self.semantic_weight * similarity
+        top = top_n_indices(blended, top_n)
+        breakdown = {k: v[top] for k, v in breakdown.items()}
+        breakdown['semantic_match'] = similarity[top]
+        return Ranking(top if rows is None else rows[top], blended[top], breakdown, len(blended))
     
     def generate_explanation(self, agent: Dict, task_analysis: TaskAnalysis, scores: Dict[str, float]) -> str:
         """Generate explanation for why this agent was recommended"""
@@ -228,28 +616,185 @@ class RecommendationEngine:
         
         return ". ".join(explanations) + "."
     
-    def get_recommendations(self, task_description: str, top_n: int = 3) -> Dict:
-        """Get top N agent recommendations for a given task"""
+    # Response fields clients can skip with the `include` option
+    OPTIONAL_FIELDS = ('explanation', 'strengths', 'capabilities', 'supported_languages', 'score_breakdown')
+    
+    @classmethod
+    def resolve_include(cls, include=None) -> frozenset:
+        """Normalize an `include` option to the set of optional fields to build"""
+        if include is None:
+            return frozenset(cls.OPTIONAL_FIELDS)
+        include = frozenset(include)
+        unknown = include.difference(cls.OPTIONAL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown include fields: {', '.join(sorted(unknown))}")
+        return include
+    
+    def get_recommendations(self, task_description: str, top_n: int = 3, include=None,
+                            rule_set: str = None, semantic: bool = False, budget: float = None) -> Dict:
+        """Get top N agent recommendations for a given task, scored with ``rule_set`` (default if None).
+        
+        ``semantic=True`` blends in text similarity (see rank_agents_semantic)
+        unless that takes longer than ``budget`` seconds (semantic_budget if
+        None), in which case the result falls back to pure rule scoring.
+        The result then has 'mode': 'rule' and is not cached.
+        """
+        started = time.perf_counter()
+        include = self.resolve_include(include)
+        snapshot = self._snapshot
+        rule_set = snapshot.plan(rule_set).name
+        if semantic and snapshot.semantic is None:
+            raise ValueError('Semantic mode is not enabled')
+        cache_key = self._recommendations_key(snapshot, task_description, top_n, include, rule_set, semantic)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Analyze the task
-        task_analysis = self.analyze_task(task_description)
+        with self.metrics.time('analyze'):
+            task_analysis = self._analyze_task(task_description)
         
-        # Score all agents
-        agent_scores = []
-        for agent in self.agents:
-            total_score, score_breakdown = self.calculate_agent_score(agent, task_analysis)
-            explanation = self.generate_explanation(agent, task_analysis, score_breakdown)
-            
-            agent_scores.append({
-                'agent': agent,
-                'score': total_score,
-                'score_breakdown': score_breakdown,
-                'explanation': explanation,
-                'confidence': min(total_score * 100, 95)  # Convert to percentage, cap at 95%
-            })
+        if semantic:
+            deadline = started + (self.semantic_budget if budget is None else budget)
+            recommendations = self._recommend_semantic(snapshot, task_description, task_analysis, top_n,
+                                                       include, rule_set, deadline)
+            if recommendations['mode'] != 'semantic':
+                return recommendations
+        else:
+            recommendations = self._recommend(snapshot, task_analysis, top_n, include, rule_set)
+        self.cache.put(cache_key, recommendations)
+        return recommendations
+    
+    def _recommendations_key(self, snapshot: CatalogSnapshot, task_description: str, top_n: int,
+                             include: frozenset, rule_set: str, semantic: bool = False) -> tuple:
+        return ('recommendations', self._cache_key(task_description), top_n, include, rule_set, semantic,
+                snapshot.version)
+    
+    def get_recommendations_many(self, requests: Sequence[Tuple[str, int, Optional[Iterable[str]]]],
+                                 rule_set: str = None) -> List[Dict]:
+        """Answer several independent (description, top_n, include) requests at once.
+        
+        Each result equals what get_recommendations would return for that
+        request, and is cached under the same key. Cache misses are analyzed
+        once per distinct description and, on catalogs too small for
+        candidate pruning, scored together as one task x agent matrix.
+        """
+        snapshot = self._snapshot
+        rule_set = snapshot.plan(rule_set).name
+        results = [None] * len(requests)
+        misses = []
+        for position, (task_description, top_n, include) in enumerate(requests):
+            include = self.resolve_include(include)
+            cache_key = self._recommendations_key(snapshot, task_description, top_n, include, rule_set)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                results[position] = cached
+            else:
+                misses.append((position, cache_key, self._cache_key(task_description), top_n, include))
+        if not misses:
+            return results
+        
+        with self.metrics.time('analyze_batch'):
+            analyses = {}
+            for _, _, key, _, _ in misses:
+                if key not in analyses:
+                    analyses[key] = self._analyze_task(key)
+        
+        if self.pruning and snapshot.catalog.size >= self.PRUNING_MIN_AGENTS:
+            # Pruned ranking scores far fewer agents than one full row of the batch matrix
+            for position, cache_key, key, top_n, include in misses:
+                results[position] = self._recommend(snapshot, analyses[key], top_n, include, rule_set)
+                self.cache.put(cache_key, results[position])
+            return results
+        
+        keys = list(analyses)
+        with self.metrics.time('rank_batch'):
+            total_scores, breakdown = self.score_agents_batch([analyses[key] for key in keys], snapshot,
+                                                              rule_set=rule_set)
+        self.metrics.count_scored(len(keys) * snapshot.catalog.size)
+        rows = {key: row for row, key in enumerate(keys)}
+        with self.metrics.time('present_batch'):
+            for position, cache_key, key, top_n, include in misses:
+                row = rows[key]
+                top_rows = top_n_indices(total_scores[row], top_n)
+                ranking = Ranking(top_rows, total_scores[row][top_rows],
+                                  {k: v[row][top_rows] for k, v in breakdown.items()}, len(top_rows))
+                results[position] = self._build_recommendations(snapshot, analyses[key], ranking, include)
+                self.cache.put(cache_key, results[position])
+        return results
+    
+    def _embed_task(self, snapshot: CatalogSnapshot, task_description: str) -> np.ndarray:
+        cache_key = ('embedding', self._cache_key(task_description), snapshot.version)
+        query = self.cache.get(cache_key)
+        if query is None:
+            query = snapshot.semantic.embed(task_description)
+            self.cache.put(cache_key, query)
+        return query
+    
+    def _recommend_semantic(self, snapshot: CatalogSnapshot, task_description: str, task_analysis: TaskAnalysis,
+                            top_n: int, include: frozenset, rule_set: str, deadline: float) -> Dict:
+        ranking = None
+        with self.metrics.time('embed'):
+            query = self._embed_task(snapshot, task_description)
+        if time.perf_counter() < deadline:
+            semantic_analysis = task_analysis
+            if task_analysis.task_type == 'general_programming':
+                # No task type keyword matched; take the closest task type description instead
+                task_type = snapshot.semantic.classify(query, self.TASK_TYPE_MIN_SIMILARITY,
+                                                       self.TASK_TYPE_MIN_MARGIN)
+                if task_type is not None:
+                    semantic_analysis = replace(task_analysis, task_type=task_type)
+            with self.metrics.time('semantic_rank'):
+                ranking = self.rank_agents_semantic(semantic_analysis, query, top_n, snapshot, rule_set, deadline)
+        
+        if ranking is None:
+            self.metrics.count_semantic_fallback()
+            recommendations = self._recommend(snapshot, task_analysis, top_n, include, rule_set)
+            recommendations.update(mode='rule', fallback_reason='latency_budget')
+            return recommendations
+        
+        self.metrics.count_scored(ranking.scored)
+        with self.metrics.time('present'):
+            recommendations = self._build_recommendations(snapshot, semantic_analysis, ranking, include)
+        recommendations['mode'] = 'semantic'
+        return recommendations
+    
+    def recommend_for_analysis(self, task_analysis: TaskAnalysis, top_n: int = 3, include=None,
+                               rule_set: str = None) -> Dict:
+        """Get top N agent recommendations for an already analyzed task, e.g. from analyze_stream"""
+        include = self.resolve_include(include)
+        snapshot = self._snapshot
+        rule_set = snapshot.plan(rule_set).name
+        cache_key = ('analysis_recommendations', task_analysis.task_type, task_analysis.complexity,
+                     tuple(task_analysis.languages), tuple(task_analysis.requirements), task_analysis.context,
+                     top_n, include, rule_set, snapshot.version)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Sort by score and get top N
-        agent_scores.sort(key=lambda x: x['score'], reverse=True)
-        top_recommendations = agent_scores[:top_n]
+        recommendations = self._recommend(snapshot, task_analysis, top_n, include, rule_set)
+        self.cache.put(cache_key, recommendations)
+        return recommendations
+    
+    def _recommend(self, snapshot: CatalogSnapshot, task_analysis: TaskAnalysis, top_n: int,
+                   include: frozenset, rule_set: str = None) -> Dict:
+        # Rank the agents, then present only the top N
+        with self.metrics.time('rank'):
+            ranking = self.rank_agents(task_analysis, top_n, snapshot, rule_set)
+        self.metrics.count_scored(ranking.scored)
+        with self.metrics.time('present'):
+            return self._build_recommendations(snapshot, task_analysis, ranking, include)
+    
+    def _build_recommendations(self, snapshot: CatalogSnapshot, task_analysis: TaskAnalysis,
+                               ranking: Ranking, include: frozenset) -> Dict:
+        """Build the response payload for the ranked agents of one task"""
+        top_recommendations = []
+        for i, row in enumerate(ranking.rows):
+            score_breakdown = {k: float(v[i]) for k, v in ranking.breakdown.items()}
+            top_recommendations.append({
+                'rank': i + 1,
+                **self.present_agent(snapshot.agents[row], task_analysis, float(ranking.scores[i]), score_breakdown, include)
+            })
         
         return {
             'task_analysis': {
@@ -259,22 +804,103 @@ class RecommendationEngine:
                 'requirements': task_analysis.requirements,
                 'context': task_analysis.context
             },
-            'recommendations': [
-                {
-                    'rank': i + 1,
-                    'agent_id': rec['agent']['id'],
-                    'agent_name': rec['agent']['name'],
-                    'description': rec['agent']['description'],
-                    'score': round(rec['score'], 3),
-                    'confidence': round(rec['confidence'], 1),
-                    'explanation': rec['explanation'],
-                    'strengths': rec['agent']['strengths'],
-                    'capabilities': rec['agent']['capabilities'],
-                    'supported_languages': rec['agent']['supported_languages'],
-                    'price_tier': rec['agent']['price_tier'],
-                    'learning_curve': rec['agent']['learning_curve'],
-                    'score_breakdown': {k: round(v, 3) for k, v in rec['score_breakdown'].items()}
-                }
-                for i, rec in enumerate(top_recommendations)
-            ]
-        } 
\ No newline at end of file
+            'recommendations': top_recommendations
+        }
+    
+    def present_agent(self, agent: Dict, task_analysis: TaskAnalysis, total_score: float,
+                      score_breakdown: Dict[str, float], include=None) -> Dict:
+        """Build the response entry for one scored agent.
+        
+        Explanations and the other optional fields are only computed when
+        requested, so callers should present agents after selecting them.
+        """
+        include = self.resolve_include(include)
+        entry = {
+            'agent_id': agent['id'],
+            'agent_name': agent['name'],
+            'description': agent['description'],
+            'score': round(total_score, 3),
+            'confidence': round(min(total_score * 100, 95), 1)  # Convert to percentage, cap at 95%
+        }
+        if 'explanation' in include:
+            with self.metrics.time('explain'):
+                entry['explanation'] = self.generate_explanation(agent, task_analysis, score_breakdown)
+        for field in ('strengths', 'capabilities', 'supported_languages'):
+            if field in include:
+                entry[field] = agent[field]
+        entry['price_tier'] = agent['price_tier']
+        entry['learning_curve'] = agent['learning_curve']
+        if 'score_breakdown' in include:
+            entry['score_breakdown'] = {k: round(v, 3) for k, v in score_breakdown.items()}
+        return entry
+    
+    def get_recommendations_batch(self, task_descriptions: List[str], top_n: int = 3,
+                                  include=None, rule_set: str = None) -> List[Dict]:
+        """Get top N agent recommendations for many tasks, in input order.
+        
+        Invalid items produce {'error': ...} entries instead of failing the batch.
+        """
+        return list(self.iter_recommendations_batch(task_descriptions, top_n, include, rule_set=rule_set))
+    
+    def iter_recommendations_batch(self, task_descriptions: List[str], top_n: int = 3,
+                                   include=None, chunk_size: int = 256, rule_set: str = None) -> Iterator[Dict]:
+        """Yield recommendations for each description in input order.
+        
+        Descriptions are analyzed chunk by chunk. On catalogs large enough
+        for candidate pruning each task is ranked on its own, as in
+        get_recommendations_many; smaller catalogs are scored as one
+        task x agent matrix per chunk, with chunks cut to BATCH_SCORE_BUDGET
+        cells, and only the top N rows of each breakdown are kept. Identical
+        descriptions are computed once and share the same result object; a
+        result is kept only until its last duplicate has been yielded, so
+        memory stays bounded by the chunk size plus the number of pending
+        duplicates.
+        """
+        include = self.resolve_include(include)
+        snapshot = self._snapshot
+        rule_set = snapshot.plan(rule_set).name
+        size = snapshot.catalog.size
+        pruned = self.pruning and size >= self.PRUNING_MIN_AGENTS
+        if not pruned:
+            chunk_size = max(1, min(chunk_size, self.BATCH_SCORE_BUDGET // max(size, 1)))
+        keys = [d.strip() if isinstance(d, str) else None for d in task_descriptions]
+        remaining = Counter(key for key in keys if key)
+        results = {}
+        
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            
+            pending = list(dict.fromkeys(key for key in chunk if key and key not in results))
+            if pending:
+                with self.metrics.time('analyze_batch'):
+                    task_analyses = [self._analyze_task(key) for key in pending]
+            if pending and pruned:
+                # Pruned ranking scores far fewer agents than one full row of the batch matrix
+                for key, task_analysis in zip(pending, task_analyses):
+                    results[key] = self._recommend(snapshot, task_analysis, top_n, include, rule_set)
+            elif pending:
+                with self.metrics.time('rank_batch'):
+                    total_scores, breakdown = self.score_agents_batch(task_analyses, snapshot, rule_set=rule_set)
+                    rankings = []
+                    for row in range(len(pending)):
+                        top_rows = top_n_indices(total_scores[row], top_n)
+                        rankings.append(Ranking(top_rows, total_scores[row][top_rows],
+                                                {k: v[row][top_rows] for k, v in breakdown.items()}, len(top_rows)))
+                    del total_scores, breakdown
+                self.metrics.count_scored(len(pending) * size)
+                with self.metrics.time('present_batch'):
+                    for key, task_analysis, ranking in zip(pending, task_analyses, rankings):
+                        results[key] = self._build_recommendations(snapshot, task_analysis, ranking, include)
+            
+            for key in chunk:
+                if key is None:
+                    yield {'error': 'Task description must be a string'}
+                    continue
+                if not key:
+                    yield {'error': 'Task description cannot be empty'}
+                    continue
+                result = results[key]
+                remaining[key] -= 1
+                if remaining[key] == 0:
+                    del results[key]
+                yield result
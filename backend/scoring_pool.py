@@ -0,0 +1,122 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Engine owned by a process-pool worker, built once by _init_worker
+_worker_engine = None
+
+
+class PoolBusy(Exception):
+    """Raised when every pool worker is busy and the wait queue is full"""
+
+
+def _init_worker(engine_kwargs: Dict[str, Any]):
+    global _worker_engine
+    from recommendation_engine import RecommendationEngine
+    _worker_engine = RecommendationEngine(**engine_kwargs)
+
+
+def _call_worker(method: str, args: tuple):
+    # Pick up catalog file changes the serving process may already have reloaded
+    _worker_engine.reloader.check()
+    return getattr(_worker_engine, method)(*args)
+
+
+class ScoringPool:
+    """Bounded executor for CPU-heavy engine calls such as batch scoring.
+
+    In ``thread`` mode calls run against the serving process's engine on a
+    small thread pool, so a large batch occupies a pool thread instead of
+    every request thread. In ``process`` mode each pool process builds its
+    own engine once and calls are shipped to it, which also keeps the work
+    off the serving process's GIL. At most ``size + queue_size`` calls are
+    admitted at a time; beyond that ``call`` fails fast with PoolBusy so the
+    caller can shed load instead of queueing without limit.
+    """
+
+    KINDS = ('thread', 'process')
+
+    def __init__(self, engine, size: int = 2, queue_size: int = 8, kind: str = 'thread',
+                 engine_kwargs: Optional[Dict[str, Any]] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown scoring pool kind: {kind!r}")
+        if size < 1:
+            raise ValueError('Scoring pool size must be at least 1')
+        self.engine = engine
+        self.kind = kind
+        self.size = size
+        self.queue_size = max(queue_size, 0)
+        self._slots = threading.BoundedSemaphore(self.size + self.queue_size)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        if kind == 'process':
+            self._executor = ProcessPoolExecutor(
+                size, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker, initargs=(engine_kwargs or {},)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(size, thread_name_prefix='scoring')
+
+    def call(self, method: str, *args, timeout: Optional[float] = None, block: bool = False):
+        """Run ``engine.<method>(*args)`` on the pool and wait for its result.
+
+        Raises PoolBusy when the pool is saturated (with ``block=True``, only
+        after waiting up to ``timeout`` for a slot, which suits follow-up
+        chunks of work that was already admitted), and
+        concurrent.futures.TimeoutError if the call takes longer than
+        ``timeout``; a timed-out call keeps its slot until it finishes.
+        """
+        return self.submit(method, *args, timeout=timeout, block=block).result(timeout)
+
+    def submit(self, method: str, *args, timeout: Optional[float] = None, block: bool = False) -> Future:
+        """Admit ``engine.<method>(*args)`` to the pool and return its future.
+
+        Admission works as in ``call`` (PoolBusy is raised here), so a
+        caller can find out whether the pool takes the work before it
+        commits to a response.
+        """
+        acquired = self._slots.acquire(timeout=timeout) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+            raise PoolBusy('Scoring pool is at capacity')
+        with self._lock:
+            self.in_flight += 1
+        try:
+            if self.kind == 'process':
+                future = self._executor.submit(_call_worker, method, args)
+            else:
+                future = self._executor.submit(getattr(self.engine, method), *args)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'size': self.size,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from agent_catalog import AgentCatalog, agent_flag
+
+if TYPE_CHECKING:
+    from inverted_index import InvertedIndex
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_rules.json')
+
+# Scoring criteria, in the order their scores are summed
+CRITERIA = ('language_support', 'task_alignment', 'complexity_match', 'feature_match', 'context_fit')
+# Criteria looked up by one categorical task attribute, and the config key listing their cases
+TABLE_CRITERIA = {
+    'task_alignment': 'task_types',
+    'complexity_match': 'complexities',
+    'context_fit': 'contexts'
+}
+
+
+def table_keys(task_analysis) -> Tuple[str, str, str]:
+    """Keys into the task_alignment, complexity_match and context_fit tables for one task"""
+    context = 'learning' if task_analysis.learning_focused else task_analysis.context
+    return task_analysis.task_type, task_analysis.complexity, context
+
+
+class Condition:
+    """Agent attribute test of one rule, e.g. ``{"any": {"ideal_for": ["beginners"], "deployment": true}}``.
+
+    ``any`` matches agents with at least one of the listed attribute values,
+    ``all`` only agents matching every listed attribute; a rule with neither
+    matches every agent. List attributes (supported_languages, ideal_for,
+    price_tier, learning_curve, id) take a list of values, flag attributes
+    (AgentCatalog.FLAG_FIELDS) take true or false.
+    """
+
+    def __init__(self, config: Mapping, where: str):
+        unknown = set(config).difference(('any', 'all', 'score'))
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+        self.any = self._parse(config.get('any', {}), where)
+        self.all = self._parse(config.get('all', {}), where)
+
+    @staticmethod
+    def _parse(tests: Mapping, where: str) -> Tuple[Tuple[str, Any], ...]:
+        parsed = []
+        for attribute, expected in tests.items():
+            if attribute in AgentCatalog.FLAG_FIELDS:
+                if not isinstance(expected, bool):
+                    raise ValueError(f"{where}: {attribute} must be true or false")
+            elif attribute in AgentCatalog.ONE_HOT_FIELDS or attribute == 'id':
+                if not isinstance(expected, list) or not all(isinstance(value, str) for value in expected):
+                    raise ValueError(f"{where}: {attribute} must be a list of strings")
+                expected = tuple(expected)
+            else:
+                raise ValueError(f"{where}: unknown agent attribute {attribute!r}")
+            parsed.append((attribute, expected))
+        return tuple(parsed)
+
+    @staticmethod
+    def _attribute_mask(catalog: AgentCatalog, attribute: str, expected) -> np.ndarray:
+        if attribute in AgentCatalog.FLAG_FIELDS:
+            flags = getattr(catalog, attribute)
+            return flags if expected else ~flags
+        mask = np.zeros(catalog.size, dtype=bool)
+        for value in expected:
+            mask |= catalog.id_mask(value) if attribute == 'id' else catalog.has(attribute, value)
+        return mask
+
+    @staticmethod
+    def _attribute_matches(agent, attribute: str, expected) -> bool:
+        if attribute in AgentCatalog.FLAG_FIELDS:
+            return agent_flag(agent, attribute) == expected
+        values = agent[attribute]
+        if isinstance(values, str):
+            return values in expected
+        return any(value in values for value in expected)
+
+    def mask(self, catalog: AgentCatalog) -> np.ndarray:
+        """Boolean mask of the catalog agents this condition matches"""
+        mask = np.ones(catalog.size, dtype=bool)
+        if self.any:
+            mask = np.zeros(catalog.size, dtype=bool)
+            for attribute, expected in self.any:
+                mask |= self._attribute_mask(catalog, attribute, expected)
+        for attribute, expected in self.all:
+            mask &= self._attribute_mask(catalog, attribute, expected)
+        return mask
+
+    def matches(self, agent) -> bool:
+        """Whether one agent record or dict matches; the scalar twin of ``mask``"""
+        if self.any and not any(self._attribute_matches(agent, a, e) for a, e in self.any):
+            return False
+        return all(self._attribute_matches(agent, a, e) for a, e in self.all)
+
+
+class CaseRules:
+    """Score of one case (e.g. task type ``web_development``): the first matching rule wins"""
+
+    def __init__(self, config: Mapping, where: str):
+        self.default = float(config.get('default', 0.0))
+        self.rules: List[Tuple[Condition, float]] = []
+        for i, rule in enumerate(config.get('rules', [])):
+            if 'score' not in rule:
+                raise ValueError(f"{where}.rules[{i}]: score is required")
+            self.rules.append((Condition(rule, f"{where}.rules[{i}]"), float(rule['score'])))
+
+    def vector(self, catalog: AgentCatalog) -> np.ndarray:
+        values = np.full(catalog.size, self.default)
+        # Apply rules last to first so earlier rules take precedence
+        for condition, score in reversed(self.rules):
+            values = np.where(condition.mask(catalog), score, values)
+        return values
+
+    def value(self, agent) -> float:
+        for condition, score in self.rules:
+            if condition.matches(agent):
+                return score
+        return self.default
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """A rule set compiled against one catalog version.
+
+    Every table holds per-agent scores already multiplied by the criterion
+    weight, so scoring a task is a few row lookups, one language overlap
+    product and one requirement product (see
+    RecommendationEngine.score_agents_batch).
+    """
+    name: str
+    rule_set: 'RuleSet'
+    # criterion -> {case: (agents,) weighted scores}, plus the weighted score of unlisted cases
+    tables: Dict[str, Dict[str, np.ndarray]]
+    defaults: Dict[str, float]
+    default_vectors: Dict[str, np.ndarray]
+    requirement_names: List[str]
+    requirements: np.ndarray  # (requirements, agents) feature matches, 0 or 1
+    inverted_index: 'InvertedIndex'
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        return self.rule_set.weights
+
+    @property
+    def no_language_score(self) -> float:
+        return self.rule_set.no_language_score
+
+    def table(self, criterion: str, key: str) -> np.ndarray:
+        """Weighted scores of every agent for one case of a table criterion"""
+        return self.tables[criterion].get(key, self.default_vectors[criterion])
+
+
+class RuleSet:
+    """One named set of scoring rules: criterion weights and the rules behind each criterion"""
+
+    def __init__(self, name: str, config: Mapping):
+        self.name = name
+        where = f"rule set {name!r}"
+        unknown = set(config).difference(CRITERIA + ('weights',))
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+
+        weights = config.get('weights', {})
+        missing = set(CRITERIA).difference(weights)
+        if missing:
+            raise ValueError(f"{where}: missing weights for {sorted(missing)}")
+        self.weights = {criterion: float(weights[criterion]) for criterion in CRITERIA}
+
+        language = config.get('language_support', {})
+        # Score of a task that names no languages, as a fraction of the criterion weight
+        self.no_language_score = float(language.get('no_languages', 0.0)) * self.weights['language_support']
+
+        self.cases: Dict[str, Tuple[float, Dict[str, CaseRules]]] = {}
+        for criterion, cases_key in TABLE_CRITERIA.items():
+            section = config.get(criterion, {})
+            cases = {
+                case: CaseRules(rules, f"{where}.{criterion}.{cases_key}.{case}")
+                for case, rules in section.get(cases_key, {}).items()
+            }
+            self.cases[criterion] = (float(section.get('default', 0.0)), cases)
+
+        self.requirements = {
+            requirement: Condition(condition, f"{where}.feature_match.requirements.{requirement}")
+            for requirement, condition in config.get('feature_match', {}).get('requirements', {}).items()
+        }
+
+    def compile(self, catalog: AgentCatalog) -> ScoringPlan:
+        """Evaluate every rule against the catalog once and build the weighted score tables"""
+        from inverted_index import InvertedIndex  # it needs table_keys from this module
+        tables, defaults, default_vectors = {}, {}, {}
+        for criterion, (default, cases) in self.cases.items():
+            weight = self.weights[criterion]
+            tables[criterion] = {case: rules.vector(catalog) * weight for case, rules in cases.items()}
+            defaults[criterion] = default * weight
+            default_vectors[criterion] = np.full(catalog.size, default * weight)
+        requirement_names = list(self.requirements)
+        requirements = np.array(
+            [self.requirements[name].mask(catalog) for name in requirement_names], dtype=float
+        ).reshape(len(requirement_names), catalog.size)
+
+        plan = ScoringPlan(self.name, self, tables, defaults, default_vectors, requirement_names, requirements, None)
+        return replace(plan, inverted_index=InvertedIndex(catalog, plan))
+
+    def score_agent(self, agent, task_analysis) -> Tuple[float, Dict[str, float]]:
+        """Score one agent by evaluating the rules directly; matches the compiled plan exactly"""
+        scores = {}
+        if task_analysis.languages:
+            supported_langs = set(lang.lower() for lang in agent['supported_languages'])
+            required_langs = set(lang.lower() for lang in task_analysis.languages)
+            language_overlap = len(supported_langs.intersection(required_langs))
+            scores['language_support'] = min(language_overlap / len(required_langs), 1.0) * self.weights['language_support']
+        else:
+            scores['language_support'] = self.no_language_score
+
+        keys = dict(zip(TABLE_CRITERIA, table_keys(task_analysis)))
+        for criterion in ('task_alignment', 'complexity_match'):
+            default, cases = self.cases[criterion]
+            value = cases[keys[criterion]].value(agent) if keys[criterion] in cases else default
+            scores[criterion] = value * self.weights[criterion]
+
+        feature_score = 0.0
+        for requirement in task_analysis.requirements:
+            condition = self.requirements.get(requirement)
+            if condition is not None and condition.matches(agent):
+                feature_score += 1.0
+        total_requirements = len(task_analysis.requirements) or 1
+        scores['feature_match'] = min(feature_score / total_requirements, 1.0) * self.weights['feature_match']
+
+        default, cases = self.cases['context_fit']
+        value = cases[keys['context_fit']].value(agent) if keys['context_fit'] in cases else default
+        scores['context_fit'] = value * self.weights['context_fit']
+
+        return sum(scores.values()), scores
+
+
+class ScoringRules:
+    """All configured rule sets, the default one and the A/B traffic split.
+
+    Loaded from a JSON file (see scoring_rules.json)::
+
+        {"default": "baseline",
+         "experiment": {"salt": "2026-10", "split": {"baseline": 90, "candidate": 10}},
+         "rule_sets": {"baseline": {...}, "candidate": {...}}}
+
+    Rule sets are compiled against each catalog version when it is
+    installed, so serving any of them costs the same as serving one.
+    """
+
+    def __init__(self, config: Mapping, path: Optional[str] = None):
+        self.path = path
+        # (mtime_ns, size) of the file when it was read, for change detection
+        self.signature: Optional[Tuple[int, int]] = None
+        rule_sets = config.get('rule_sets')
+        if not isinstance(rule_sets, dict) or not rule_sets:
+            raise ValueError("Scoring rules need a non-empty 'rule_sets' object")
+        self.rule_sets = {name: RuleSet(name, rules) for name, rules in rule_sets.items()}
+        self.default = config.get('default', next(iter(self.rule_sets)))
+        if self.default not in self.rule_sets:
+            raise ValueError(f"Default rule set {self.default!r} is not defined")
+
+        experiment = config.get('experiment') or {}
+        self.salt = str(experiment.get('salt', ''))
+        split = experiment.get('split') or {}
+        unknown = set(split).difference(self.rule_sets)
+        if unknown:
+            raise ValueError(f"Experiment split names unknown rule sets {sorted(unknown)}")
+        total = sum(split.values())
+        if split and (total <= 0 or any(share < 0 for share in split.values())):
+            raise ValueError('Experiment split shares must be non-negative and not all zero')
+        # Cumulative share boundaries in [0, 1]
+        self.split: List[Tuple[float, str]] = []
+        cumulative = 0.0
+        for name, share in split.items():
+            cumulative += share / total
+            self.split.append((cumulative, name))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_RULES_PATH) -> 'ScoringRules':
+        stat = os.stat(path)
+        with open(path) as f:
+            rules = cls(json.load(f), path)
+        rules.signature = (stat.st_mtime_ns, stat.st_size)
+        return rules
+
+    def compile(self, catalog: AgentCatalog) -> Dict[str, ScoringPlan]:
+        return {name: rule_set.compile(catalog) for name, rule_set in self.rule_sets.items()}
+
+    def assign(self, key: Optional[str] = None) -> str:
+        """Rule set for one request under the experiment split.
+
+        Requests with the same ``key`` (e.g. a user or session id) always get
+        the same rule set; requests without one are assigned at random.
+        Without an experiment every request gets the default rule set.
+        """
+        if not self.split:
+            return self.default
+        if key is None:
+            point = random.random()
+        else:
+            digest = hashlib.blake2b(f'{self.salt}:{key}'.encode('utf-8'), digest_size=8).digest()
+            point = int.from_bytes(digest, 'big') / 2 ** 64
+        for boundary, name in self.split:
+            if point < boundary:
+                return name
+        return self.split[-1][1]
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'default': self.default,
+            'rule_sets': list(self.rule_sets),
+            'split': {name: round(boundary - previous, 6) for (boundary, name), previous
+                      in zip(self.split, [0.0] + [boundary for boundary, _ in self.split])}
+        }
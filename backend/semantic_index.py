@@ -0,0 +1,219 @@
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent_catalog import top_n_indices
+
+_TOKEN = re.compile(r'[a-z0-9+#]+')
+
+# Agent fields whose text is embedded
+TEXT_FIELDS = ('description', 'capabilities', 'use_cases')
+
+
+def agent_text(agent) -> str:
+    parts = []
+    for field in TEXT_FIELDS:
+        value = agent[field]
+        parts.extend(value if isinstance(value, (list, tuple)) else [value])
+    return '. '.join(parts)
+
+
+class HashingEmbedder:
+    """Hashed TF-IDF embeddings of words, word bigrams and character n-grams.
+
+    Every feature is hashed (CRC32) into one of ``dim`` buckets, so there is
+    no vocabulary to store and nothing to download. Character n-grams of each
+    word ('<deploy>' -> '<de', 'dep', ...) let inflections and compounds such
+    as "deployment" or "cross-platform" share features with their stems.
+    Counts are damped with log(1 + tf), weighted by IDF fitted on the agent
+    texts and L2-normalized, so a dot product is the cosine similarity.
+    """
+
+    # Bound on the per-word feature cache
+    MAX_CACHED_WORDS = 100_000
+
+    def __init__(self, dim: int = 512, char_ngrams: Tuple[int, int] = (3, 4)):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.idf = np.ones(dim, dtype=np.float32)
+        self._word_buckets: Dict[str, np.ndarray] = {}
+
+    def _bucket(self, feature: str) -> int:
+        return zlib.crc32(feature.encode('utf-8')) % self.dim
+
+    def _word_features(self, word: str) -> np.ndarray:
+        buckets = self._word_buckets.get(word)
+        if buckets is None:
+            marked = f'<{word}>'
+            low, high = self.char_ngrams
+            features = [word] + [marked[i:i + n] for n in range(low, high + 1)
+                                 for i in range(len(marked) - n + 1)]
+            buckets = np.array([self._bucket(feature) for feature in features], dtype=np.int64)
+            if len(self._word_buckets) < self.MAX_CACHED_WORDS:
+                self._word_buckets[word] = buckets
+        return buckets
+
+    def _buckets(self, text: str) -> np.ndarray:
+        words = _TOKEN.findall(text.lower())
+        parts = [self._word_features(word) for word in words]
+        parts.append(np.array([self._bucket(f'{a} {b}') for a, b in zip(words, words[1:])], dtype=np.int64))
+        return np.concatenate(parts)
+
+    def counts(self, texts: Sequence[str]) -> np.ndarray:
+        """Raw feature counts, one row per text"""
+        buckets = [self._buckets(text) for text in texts]
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), [len(b) for b in buckets])
+        flat = rows * self.dim + np.concatenate(buckets) if buckets else np.empty(0, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(texts) * self.dim)
+        return counts.reshape(len(texts), self.dim).astype(np.float32)
+
+    def fit(self, texts: Sequence[str]) -> np.ndarray:
+        """Fit the IDF weights on ``texts`` and return their embeddings"""
+        counts = self.counts(texts)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self._weight(counts)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self._weight(self.counts(texts))
+
+    def _weight(self, counts: np.ndarray) -> np.ndarray:
+        vectors = np.log1p(counts, out=counts)
+        vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors /= norms
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+class ProjectionIndex:
+    """Approximate nearest-neighbour search by a low-dimensional first pass.
+
+    The vectors are projected onto their top ``components`` principal
+    directions (fitted on a sample). A query is first compared with every
+    projected vector, which reads a fraction of the full matrix, and only
+    the ``candidates`` best of those are re-scored against the full
+    vectors. Similarity search over large catalogs is bound by memory
+    bandwidth, so this cuts it roughly by dim / components.
+    """
+
+    def __init__(self, vectors: np.ndarray, components: int = 128, candidates: int = 2000,
+                 sample_size: int = 16384, seed: int = 0):
+        self.vectors = vectors
+        self.candidates = candidates
+        rng = np.random.default_rng(seed)
+        size = len(vectors)
+        sample = vectors[rng.choice(size, sample_size, replace=False)] if size > sample_size else vectors
+        # Eigenvectors of the (uncentered) second-moment matrix, largest first
+        _, eigenvectors = np.linalg.eigh(sample.T @ sample)
+        self.projection = np.ascontiguousarray(eigenvectors[:, ::-1][:, :components], dtype=np.float32)
+        self.projected = np.concatenate([vectors[start:start + 65536] @ self.projection
+                                         for start in range(0, size, 65536)])
+
+    @property
+    def components(self) -> int:
+        return self.projection.shape[1]
+
+    def search(self, query: np.ndarray, k: int) -> np.ndarray:
+        """Rows of (approximately) the ``k`` vectors closest to ``query``, best first"""
+        coarse = self.projected @ (query @ self.projection)
+        count = max(k, self.candidates)
+        rows = np.argpartition(-coarse, count)[:count] if count < len(coarse) else np.arange(len(coarse))
+        rows.sort()  # keep catalog order among equal similarities
+        return rows[top_n_indices(self.vectors[rows] @ query, k)]
+
+
+class SemanticIndex:
+    """Embeddings of one catalog version's agent texts and of the task-type prototypes.
+
+    Agent texts are embedded once into a contiguous float32 matrix (identical
+    texts are embedded once and shared). Catalogs of ``ANN_MIN_AGENTS`` or
+    more also get a ProjectionIndex so nearest neighbours are found without
+    reading every agent's full vector.
+    """
+
+    ANN_MIN_AGENTS = 16384
+
+    def __init__(self, agents: Sequence, prototypes: Dict[str, str], dim: int = 512):
+        started = time.perf_counter()
+        self.embedder = HashingEmbedder(dim)
+        texts = [agent_text(agent) for agent in agents]
+        unique = {text: row for row, text in enumerate(dict.fromkeys(texts))}
+        vectors = self.embedder.fit(list(unique))
+        self.vectors = np.ascontiguousarray(vectors[[unique[text] for text in texts]])
+        self.prototype_names: List[str] = list(prototypes)
+        self.prototype_vectors = self.embedder.embed(list(prototypes.values()))
+        self.ann = ProjectionIndex(self.vectors) if len(texts) >= self.ANN_MIN_AGENTS else None
+        self.build_seconds = time.perf_counter() - started
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embedder.embed([text])[0]
+
+    def similarity(self, query: np.ndarray, rows: np.ndarray = None) -> np.ndarray:
+        """Cosine similarity of every agent (or only ``rows``) to an embedded query"""
+        return (self.vectors if rows is None else self.vectors[rows]) @ query
+
+    def nearest(self, query: np.ndarray, k: int) -> np.ndarray:
+        """Rows of the ``k`` agents most similar to ``query``; approximate on large catalogs"""
+        if self.ann is None:
+            return top_n_indices(self.similarity(query), k)
+        return self.ann.search(query, k)
+
+    def classify(self, query: np.ndarray, min_similarity: float, min_margin: float = 0.0) -> Optional[str]:
+        """Name of the closest prototype, or None if it is not similar enough or not clearly the closest"""
+        similarities = self.prototype_vectors @ query
+        order = np.argsort(-similarities)
+        best = similarities[order[0]]
+        runner_up = similarities[order[1]] if len(order) > 1 else 0.0
+        if best < min_similarity or best - runner_up < min_margin:
+            return None
+        return self.prototype_names[order[0]]
+
+    def info(self):
+        return {
+            'dimensions': self.embedder.dim,
+            'agents': len(self.vectors),
+            'matrix_bytes': self.vectors.nbytes,
+            'ann_components': self.ann.components if self.ann is not None else None,
+            'build_seconds': round(self.build_seconds, 6)
+        }
+
+
+class EmbeddingCache:
+    """Semantic indexes of the most recent catalog versions, keyed by catalog checksum.
+
+    Reloading the scoring rules, or a catalog file rewritten with the same
+    agents, keeps the checksum, so the embeddings are reused instead of
+    being computed again.
+    """
+
+    def __init__(self, build: Callable[[Sequence], SemanticIndex], max_versions: int = 2):
+        self.build = build
+        self.max_versions = max_versions
+        self._indexes: 'OrderedDict[str, SemanticIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, checksum: str, agents: Sequence) -> SemanticIndex:
+        with self._lock:
+            index = self._indexes.get(checksum)
+            if index is None:
+                index = self._indexes[checksum] = self.build(agents)
+                self.builds += 1
+                while len(self._indexes) > self.max_versions:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(checksum)
+            return index
+
+    def put(self, checksum: str, index: SemanticIndex):
+        """Add an index built elsewhere, e.g. loaded from a precompiled snapshot"""
+        with self._lock:
+            self._indexes[checksum] = index
+            self._indexes.move_to_end(checksum)
+            while len(self._indexes) > self.max_versions:
+                self._indexes.popitem(last=False)
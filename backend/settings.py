@@ -0,0 +1,108 @@
+import os
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+
+def _env(environ: Mapping[str, str], name: str, default, cast):
+    value = environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value!r}")
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Server configuration, read from environment variables.
+
+    The same settings drive the development server (``python app.py``),
+    gunicorn (``gunicorn.conf.py``) and the ASGI entry point (``asgi.py``).
+    """
+    agents_db_path: str = 'agents_db.json'
+    # Scoring rule sets and A/B split (None: scoring_rules.json next to the engine)
+    scoring_rules_path: Optional[str] = None
+    # Output of precompiled_snapshot.py, used at startup when it matches the catalog and rules files
+    precompiled_snapshot_path: Optional[str] = None
+    # Engine initialization: 'eager' (before serving), 'background' (serve health checks while loading) or 'lazy'
+    engine_init: str = 'eager'
+    # Keyword matching: False keeps raw substring hits ('go' in "good"), True requires word boundaries
+    word_boundaries: bool = False
+    # Seconds between catalog file checks (0 disables hot reload)
+    catalog_reload_interval: float = 5.0
+    # Bounded pool for batch scoring; size 0 runs batches on the request thread
+    scoring_pool_kind: str = 'thread'
+    scoring_pool_size: int = 2
+    scoring_queue_size: int = 8
+    scoring_timeout: float = 30.0
+    batch_chunk_size: int = 256
+    # Micro-batching of /api/recommend: identical in-flight requests share one result and distinct ones
+    # arriving within the window are scored together (window in ms, at most max_size per batch)
+    micro_batching: bool = True
+    micro_batch_window_ms: float = 2.0
+    micro_batch_max_size: int = 64
+    micro_batch_workers: int = 2
+    # Seconds a batched /api/recommend request waits for its result before answering 504
+    recommend_timeout: float = 10.0
+    # Semantic mode: blend text similarity into /api/recommend within a per-request latency budget
+    semantic_enabled: bool = False
+    semantic_weight: float = 0.3
+    semantic_budget_ms: float = 50.0
+    # Largest accepted request body (0 disables the limit)
+    max_body_bytes: int = 8 * 1024 * 1024
+    # Instrumentation; profile_every=N dumps cProfile stats for 1 request in N (0 disables)
+    metrics_enabled: bool = True
+    profile_every: int = 0
+    profile_dir: str = 'profiles'
+    # HTTP server
+    host: str = '0.0.0.0'
+    port: int = 5001
+    workers: int = 1
+    threads: int = 4
+    worker_timeout: int = 60
+    debug: bool = False
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = None) -> 'Settings':
+        environ = os.environ if environ is None else environ
+        return cls(
+            agents_db_path=_env(environ, 'AGENTS_DB_PATH', cls.agents_db_path, str),
+            scoring_rules_path=_env(environ, 'SCORING_RULES_PATH', cls.scoring_rules_path, str),
+            precompiled_snapshot_path=_env(environ, 'PRECOMPILED_SNAPSHOT_PATH', cls.precompiled_snapshot_path, str),
+            engine_init=_env(environ, 'ENGINE_INIT', cls.engine_init, str),
+            word_boundaries=_env(environ, 'WORD_BOUNDARIES', cls.word_boundaries, _env_bool),
+            catalog_reload_interval=_env(environ, 'CATALOG_RELOAD_INTERVAL', cls.catalog_reload_interval, float),
+            scoring_pool_kind=_env(environ, 'SCORING_POOL_KIND', cls.scoring_pool_kind, str),
+            scoring_pool_size=_env(environ, 'SCORING_POOL_SIZE', cls.scoring_pool_size, int),
+            scoring_queue_size=_env(environ, 'SCORING_QUEUE_SIZE', cls.scoring_queue_size, int),
+            scoring_timeout=_env(environ, 'SCORING_TIMEOUT', cls.scoring_timeout, float),
+            batch_chunk_size=_env(environ, 'BATCH_CHUNK_SIZE', cls.batch_chunk_size, int),
+            micro_batching=_env(environ, 'MICRO_BATCHING', cls.micro_batching, _env_bool),
+            micro_batch_window_ms=_env(environ, 'MICRO_BATCH_WINDOW_MS', cls.micro_batch_window_ms, float),
+            micro_batch_max_size=_env(environ, 'MICRO_BATCH_MAX_SIZE', cls.micro_batch_max_size, int),
+            micro_batch_workers=_env(environ, 'MICRO_BATCH_WORKERS', cls.micro_batch_workers, int),
+            recommend_timeout=_env(environ, 'RECOMMEND_TIMEOUT', cls.recommend_timeout, float),
+            semantic_enabled=_env(environ, 'SEMANTIC_ENABLED', cls.semantic_enabled, _env_bool),
+            semantic_weight=_env(environ, 'SEMANTIC_WEIGHT', cls.semantic_weight, float),
+            semantic_budget_ms=_env(environ, 'SEMANTIC_BUDGET_MS', cls.semantic_budget_ms, float),
+            max_body_bytes=_env(environ, 'MAX_BODY_BYTES', cls.max_body_bytes, int),
+            metrics_enabled=_env(environ, 'METRICS_ENABLED', cls.metrics_enabled, _env_bool),
+            profile_every=_env(environ, 'PROFILE_EVERY', cls.profile_every, int),
+            profile_dir=_env(environ, 'PROFILE_DIR', cls.profile_dir, str),
+            host=_env(environ, 'HOST', cls.host, str),
+            port=_env(environ, 'PORT', cls.port, int),
+            workers=_env(environ, 'WEB_WORKERS', os.cpu_count() or cls.workers, int),
+            threads=_env(environ, 'WEB_THREADS', cls.threads, int),
+            worker_timeout=_env(environ, 'WEB_TIMEOUT', cls.worker_timeout, int),
+            debug=_env(environ, 'FLASK_DEBUG', cls.debug, _env_bool)
+        )
+
+    def engine_kwargs(self) -> dict:
+        """Keyword arguments for RecommendationEngine"""
+        return {'agents_db_path': self.agents_db_path, 'scoring_rules_path': self.scoring_rules_path,
+                'precompiled_path': self.precompiled_snapshot_path, 'word_boundaries': self.word_boundaries}
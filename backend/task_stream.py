@@ -0,0 +1,66 @@
+import codecs
+from typing import Iterable, Optional, Union
+
+from keyword_matcher import StreamScanner
+
+
+class InputTooLarge(ValueError):
+    """Raised when streamed input goes over the analyzer's size limit"""
+
+
+class TaskStreamAnalyzer:
+    """Analyze a task description that arrives in chunks, in constant memory.
+
+    Chunks (text, or bytes decoded incrementally) are lowercased and fed to a
+    StreamScanner, which carries keyword hits across chunk boundaries, so
+    ``finish`` returns the same TaskAnalysis as ``analyze_task`` on the whole
+    text. Only the current chunk, a short unresolved tail and the set of
+    keywords seen are held at any time.
+
+    With ``early_exit`` the analyzer stops asking for input (``feed`` returns
+    False) once the task type, complexity and context can no longer change;
+    languages and requirements then only reflect the text read up to that
+    point.
+    """
+
+    def __init__(self, engine, max_bytes: Optional[int] = None, early_exit: bool = False,
+                 encoding: str = 'utf-8'):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.early_exit = early_exit
+        self.bytes_read = 0
+        self.has_content = False  # seen anything besides whitespace
+        self.stopped_early = False
+        self._scanner = StreamScanner(engine.keyword_matcher)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    def feed(self, chunk: Union[str, bytes]) -> bool:
+        """Consume one chunk; returns False once no more input is needed.
+
+        ``max_bytes`` counts bytes for bytes chunks and characters for text.
+        """
+        if self.stopped_early:
+            return False
+        self.bytes_read += len(chunk)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise InputTooLarge(f"Task description is larger than {self.max_bytes} bytes")
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        if not self.has_content and chunk and not chunk.isspace():
+            self.has_content = True
+        self._scanner.feed(chunk.lower())
+        if self.early_exit and self.engine._classification_settled(self._scanner.found):
+            self.stopped_early = True
+        return not self.stopped_early
+
+    def consume(self, chunks: Iterable[Union[str, bytes]]):
+        """Feed chunks until they run out or the analysis is settled; returns the TaskAnalysis"""
+        for chunk in chunks:
+            if not self.feed(chunk):
+                break
+        return self.finish()
+
+    def finish(self):
+        """TaskAnalysis of everything fed so far"""
+        self._scanner.feed(self._decoder.decode(b'', final=True).lower())
+        return self.engine._analysis_from_keywords(self._scanner.close())